@@ -0,0 +1,187 @@
+"""
+Feature Prioritizer - Scoring
+RICE and ICE scoring for single features and for whole backlogs in columnar form
+"""
+
+from typing import Dict, List, Any, Optional, Sequence
+from array import array
+import heapq
+
+try:  # NumPy is optional; large backlogs are much faster with it
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+
+def calculate_rice(reach: int, impact: float, confidence: float, effort: float) -> float:
+    """
+    Calculate RICE prioritization score.
+    
+    Args:
+        reach: Number of users/customers affected per quarter
+        impact: Degree of impact (0.25=minimal, 0.5=low, 1.0=medium, 2.0=high, 3.0=massive)
+        confidence: Confidence level in estimates (0.0-1.0)
+        effort: Estimated person-months of work
+    
+    Returns:
+        RICE score (higher is better); 0.0 when effort is 0
+    """
+    if effort == 0:
+        return 0.0
+    return (reach * impact * confidence) / effort
+
+
+def calculate_ice(impact: float, confidence: float, ease: float) -> float:
+    """
+    Calculate ICE prioritization score.
+    
+    Args:
+        impact: Degree of impact
+        confidence: Confidence level in estimates
+        ease: How easy the feature is to build
+    
+    Returns:
+        ICE score (higher is better)
+    """
+    return (impact + confidence + ease) / 3
+
+
+def ease_from_effort(effort: float) -> float:
+    """
+    Derive an ease value from effort when no explicit ease is given.
+    
+    Ease is the inverse of effort (features per person-month). Zero effort
+    means the estimate is missing, so it scores 0 just like RICE does.
+    """
+    if effort == 0:
+        return 0.0
+    return 1.0 / effort
+
+
+def score_batch(
+    reach: Sequence[float],
+    impact: Sequence[float],
+    confidence: Sequence[float],
+    effort: Sequence[float],
+    ease: Optional[Sequence[float]] = None,
+) -> Dict[str, Any]:
+    """
+    Score a whole backlog given as columns, computing RICE and ICE in one pass.
+    
+    With NumPy installed every column is converted once to a float64 array and
+    both scores are computed with vectorized arithmetic; rows with
+    ``effort == 0`` are masked out of the division instead of being branched on.
+    Without NumPy the same formulas run in a single loop over the columns.
+    
+    Args:
+        reach: Users affected per quarter, one value per feature
+        impact: Impact values (0.25-3.0 scale)
+        confidence: Confidence values (0.0-1.0 scale)
+        effort: Person-months of work
+        ease: Optional ease values; derived with ease_from_effort when omitted
+    
+    Returns:
+        Dictionary with "rice" and "ice" score columns (NumPy arrays when
+        NumPy is available, otherwise ``array('d')``)
+    """
+    length = len(reach)
+    columns = [impact, confidence, effort] + ([ease] if ease is not None else [])
+    if any(len(column) != length for column in columns):
+        raise ValueError("All score columns must have the same length")
+    
+    if np is not None:
+        reach_col = np.asarray(reach, dtype=np.float64)
+        impact_col = np.asarray(impact, dtype=np.float64)
+        confidence_col = np.asarray(confidence, dtype=np.float64)
+        effort_col = np.asarray(effort, dtype=np.float64)
+        has_effort = effort_col != 0
+        
+        rice = np.zeros(length, dtype=np.float64)
+        np.divide(reach_col * impact_col * confidence_col, effort_col, out=rice, where=has_effort)
+        
+        if ease is None:
+            ease_col = np.zeros(length, dtype=np.float64)
+            np.divide(1.0, effort_col, out=ease_col, where=has_effort)
+        else:
+            ease_col = np.asarray(ease, dtype=np.float64)
+        ice = (impact_col + confidence_col + ease_col) / 3
+        return {"rice": rice, "ice": ice}
+    
+    rice = array("d", bytes(8 * length))
+    ice = array("d", bytes(8 * length))
+    for row in range(length):
+        row_effort = effort[row]
+        row_ease = ease[row] if ease is not None else ease_from_effort(row_effort)
+        rice[row] = calculate_rice(reach[row], impact[row], confidence[row], row_effort)
+        ice[row] = calculate_ice(impact[row], confidence[row], row_ease)
+    return {"rice": rice, "ice": ice}
+
+
+def top_k(scores: Sequence[float], k: int) -> List[int]:
+    """
+    Return the indices of the k highest scores, best first.
+    
+    Uses partial selection (``numpy.argpartition`` or ``heapq.nlargest``) so
+    only the k winners are ever sorted. Ties among the selected scores are
+    broken by lower index.
+    
+    Args:
+        scores: Score column
+        k: Number of indices to return
+    
+    Returns:
+        Indices into ``scores`` ordered by descending score
+    """
+    length = len(scores)
+    k = min(max(k, 0), length)
+    if k == 0:
+        return []
+    
+    if np is not None:
+        values = np.asarray(scores, dtype=np.float64)
+        if k < length:
+            candidates = np.argpartition(-values, k - 1)[:k]
+        else:
+            candidates = np.arange(length)
+        # lexsort sorts by the last key first: score descending, then index
+        order = np.lexsort((candidates, -values[candidates]))
+        return candidates[order].tolist()
+    
+    return heapq.nlargest(k, range(length), key=lambda index: (scores[index], -index))
+
+
+def rank_features(features: List[Dict[str, Any]], k: int = 10, by: str = "rice") -> List[Dict[str, Any]]:
+    """
+    Score a backlog in the documented ``features`` format and return the top k.
+    
+    Args:
+        features: Feature dictionaries with reach, impact, confidence, effort
+            and optionally ease
+        k: Number of features to return
+        by: Score to rank by ("rice" or "ice")
+    
+    Returns:
+        Top features, best first, each with "rank", "name", "rice_score" and
+        "ice_score" keys
+    """
+    if by not in ("rice", "ice"):
+        raise ValueError(f"Unknown score '{by}', expected 'rice' or 'ice'")
+    
+    has_ease = all("ease" in feature for feature in features)
+    scores = score_batch(
+        [feature.get("reach", 0) for feature in features],
+        [feature.get("impact", 0) for feature in features],
+        [feature.get("confidence", 0) for feature in features],
+        [feature.get("effort", 0) for feature in features],
+        [feature["ease"] for feature in features] if has_ease and features else None,
+    )
+    
+    ranked = []
+    for rank, index in enumerate(top_k(scores[by], k), start=1):
+        ranked.append({
+            "rank": rank,
+            "name": features[index].get("name"),
+            "rice_score": float(scores["rice"][index]),
+            "ice_score": float(scores["ice"][index]),
+        })
+    return ranked
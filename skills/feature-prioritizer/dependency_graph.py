@@ -0,0 +1,273 @@
+"""
+Feature Prioritizer - Dependency Mapping
+Indexes feature dependencies as a graph, suggests a build order, reports
+cycles and computes the effort-weighted critical path
+"""
+
+from typing import Dict, List, Any, Optional
+from collections import deque
+
+
+class DependencyGraph:
+    """
+    Directed graph of features where an edge A -> B means "B depends on A".
+    
+    Features are indexed by name once and every edge is stored as an integer
+    adjacency list, so ordering, cycle detection and critical-path analysis
+    each run in O(V + E).
+    """
+    
+    def __init__(self, features: List[Dict[str, Any]]):
+        """
+        Build the graph from features in the documented prioritizer format.
+        
+        Args:
+            features: Feature dictionaries with "name" and optionally
+                "effort" and "dependencies" (list of feature names)
+        """
+        self.names: List[str] = []
+        self.efforts: List[float] = []
+        self.index: Dict[str, int] = {}
+        self.duplicates: List[str] = []
+        self.missing: Dict[str, List[str]] = {}
+        
+        kept = []
+        for feature in features:
+            name = feature.get("name")
+            if name in self.index:
+                self.duplicates.append(name)
+                continue
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.efforts.append(float(feature.get("effort") or 0))
+            kept.append(feature)
+        
+        count = len(self.names)
+        self.requires: List[List[int]] = [[] for _ in range(count)]     # node -> its dependencies
+        self.dependents: List[List[int]] = [[] for _ in range(count)]   # node -> nodes depending on it
+        lookup = self.index.get
+        dependents = self.dependents
+        for node, feature in enumerate(kept):
+            dependencies = feature.get("dependencies")
+            if not dependencies:
+                continue
+            targets = list(map(lookup, dependencies))
+            if None in targets:
+                self.missing[self.names[node]] = [
+                    dependency for dependency, target in zip(dependencies, targets) if target is None
+                ]
+                targets = [target for target in targets if target is not None]
+            if len(set(targets)) != len(targets):
+                targets = list(dict.fromkeys(targets))
+            self.requires[node] = targets
+            for target in targets:
+                dependents[target].append(node)
+        
+        self._order: Optional[List[int]] = None
+    
+    def topological_order(self) -> List[int]:
+        """
+        Order nodes so every feature comes after its dependencies (Kahn's algorithm).
+        
+        Ties keep the input order. Nodes on or downstream of a cycle cannot be
+        ordered and are left out; use find_cycles to report them.
+        
+        Returns:
+            Node indices in build order
+        """
+        if self._order is not None:
+            return self._order
+        
+        indegree = [len(deps) for deps in self.requires]
+        ready = deque(node for node, degree in enumerate(indegree) if degree == 0)
+        order = []
+        dependents = self.dependents
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for dependent in dependents[node]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        
+        self._order = order
+        return order
+    
+    def find_cycles(self) -> List[List[str]]:
+        """
+        Report one dependency cycle per strongly connected component.
+        
+        Uses an iterative Tarjan SCC pass restricted to the nodes Kahn's
+        algorithm could not order, then walks each component to extract a
+        concrete path.
+        
+        Returns:
+            Cycles as name paths following "depends on" edges, with the first
+            name repeated at the end (e.g. ["A", "B", "A"])
+        """
+        ordered = set(self.topological_order())
+        if len(ordered) == len(self.names):
+            return []
+        
+        requires = self.requires
+        blocked = [node for node in range(len(self.names)) if node not in ordered]
+        lowlink: Dict[int, int] = {}
+        number: Dict[int, int] = {}
+        on_stack = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        
+        for root in blocked:
+            if root in number:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    number[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack.add(node)
+                deps = requires[node]
+                while edge < len(deps):
+                    target = deps[edge]
+                    edge += 1
+                    if target in ordered:
+                        continue
+                    if target not in number:
+                        work.append((node, edge))
+                        work.append((target, 0))
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], number[target])
+                else:
+                    if lowlink[node] == number[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+        
+        cycles = []
+        for component in components:
+            members = set(component)
+            start = component[-1]
+            if len(component) == 1 and start not in requires[start]:
+                continue
+            # Every node in a non-trivial SCC has an edge inside it, so
+            # following such edges must eventually revisit a node.
+            position: Dict[int, int] = {}
+            path = []
+            node = start
+            while node not in position:
+                position[node] = len(path)
+                path.append(node)
+                node = next(dep for dep in requires[node] if dep in members)
+            loop = path[position[node]:] + [node]
+            cycles.append([self.names[member] for member in loop])
+        return cycles
+    
+    def critical_path(self) -> Dict[str, Any]:
+        """
+        Find the longest chain of dependent features weighted by effort.
+        
+        Computed with one pass over the topological order, so only orderable
+        (acyclic) features are considered.
+        
+        Returns:
+            Dictionary with "path" (feature names, first to build first) and
+            "effort" (total person-months along the path)
+        """
+        order = self.topological_order()
+        if not order:
+            return {"path": [], "effort": 0.0}
+        
+        finish = [0.0] * len(self.names)
+        previous = [-1] * len(self.names)
+        efforts = self.efforts
+        requires = self.requires
+        for node in order:
+            best, best_dep = 0.0, -1
+            for dep in requires[node]:
+                if finish[dep] > best:
+                    best, best_dep = finish[dep], dep
+            finish[node] = best + efforts[node]
+            previous[node] = best_dep
+        
+        end = max(order, key=finish.__getitem__)
+        path = []
+        node = end
+        while node != -1:
+            path.append(self.names[node])
+            node = previous[node]
+        path.reverse()
+        return {"path": path, "effort": finish[end]}
+    
+    def build_phases(self) -> List[List[str]]:
+        """
+        Group orderable features into phases that can be built in parallel.
+        
+        A feature's phase is one more than the latest phase of its dependencies.
+        
+        Returns:
+            Lists of feature names, one list per phase
+        """
+        level = [0] * len(self.names)
+        phases: List[List[str]] = []
+        requires = self.requires
+        for node in self.topological_order():
+            depth = 0
+            for dep in requires[node]:
+                if level[dep] + 1 > depth:
+                    depth = level[dep] + 1
+            level[node] = depth
+            if depth == len(phases):
+                phases.append([])
+            phases[depth].append(self.names[node])
+        return phases
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the dependency analysis.
+        
+        Returns:
+            Dictionary with build_order, build_phases, dependency_map, cycles,
+            unordered_features, missing_dependencies, duplicate_features and
+            critical_path
+        """
+        names = self.names
+        order = self.topological_order()
+        ordered = set(order)
+        return {
+            "build_order": [names[node] for node in order],
+            "build_phases": self.build_phases(),
+            "dependency_map": {
+                names[node]: list(map(names.__getitem__, deps))
+                for node, deps in enumerate(self.requires) if deps
+            },
+            "cycles": self.find_cycles(),
+            "unordered_features": [name for node, name in enumerate(names) if node not in ordered],
+            "missing_dependencies": self.missing,
+            "duplicate_features": self.duplicates,
+            "critical_path": self.critical_path(),
+        }
+
+
+def identify_dependencies(features: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Map feature dependencies and suggest a build order.
+    
+    Args:
+        features: Feature dictionaries with "name", "effort" and "dependencies"
+    
+    Returns:
+        Dependency analysis (see DependencyGraph.to_dict)
+    """
+    return DependencyGraph(features).to_dict()
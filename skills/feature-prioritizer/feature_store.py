@@ -0,0 +1,637 @@
+"""
+Feature Prioritizer - Feature Store
+Compact in-memory and on-disk representations of large backlogs: slotted
+records for small sets, struct-of-arrays columns for large ones
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Mapping, Sequence, Union
+from array import array
+import csv
+import json
+import math
+import mmap
+import os
+import sys
+
+from calculate_scores import score_batch, top_k
+
+try:  # NumPy is optional; large backlogs are much faster with it
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+# Backlogs at least this long are stored as columns by compact()
+COLUMNAR_THRESHOLD = 10_000
+
+NUMERIC_FIELDS = ("reach", "impact", "confidence", "effort", "ease", "strategic_alignment")
+STRING_FIELDS = ("name", "description", "risk_level")
+
+# Numeric fields that stay absent (NaN in a store) rather than defaulting to 0
+OPTIONAL_NUMERIC_FIELDS = ("ease", "strategic_alignment")
+
+RECORD_FIELDS = ("name", "description", "reach", "impact", "confidence", "effort", "ease",
+                 "strategic_alignment", "strategic_scores", "dependencies", "risk_level")
+
+# Separator between dependency names in a CSV "dependencies" cell
+CSV_DEPENDENCY_SEPARATOR = ";"
+
+FILE_MAGIC = b"FEATSTR1"
+_MISSING = -1
+
+
+class FeatureRecord(Mapping):
+    """
+    One feature in the documented prioritizer format, without a per-instance dict.
+    
+    Records are read-only mappings over the schema fields (``get``, ``[]``,
+    ``in``, ``keys``, ``dict(record)``), so they can be passed to
+    rank_features, DependencyGraph, StrategicRanker or apply_strategic_weights
+    in place of the feature dictionaries they replace. Numeric fields default
+    to 0; optional fields are absent (None as attributes) when not given.
+    """
+    
+    __slots__ = RECORD_FIELDS
+    
+    def __init__(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        reach: float = 0.0,
+        impact: float = 0.0,
+        confidence: float = 0.0,
+        effort: float = 0.0,
+        strategic_alignment: Optional[float] = None,
+        dependencies: Sequence[str] = (),
+        risk_level: Optional[str] = None,
+        ease: Optional[float] = None,
+        strategic_scores: Optional[Dict[str, float]] = None,
+    ):
+        self.name = sys.intern(name) if isinstance(name, str) else name
+        self.description = description
+        self.reach = reach
+        self.impact = impact
+        self.confidence = confidence
+        self.effort = effort
+        self.ease = ease
+        self.strategic_alignment = strategic_alignment
+        self.strategic_scores = (
+            {sys.intern(str(dimension)): float(score) for dimension, score in strategic_scores.items()}
+            if strategic_scores is not None else None
+        )
+        self.dependencies = tuple(sys.intern(dependency) for dependency in dependencies)
+        self.risk_level = sys.intern(risk_level) if isinstance(risk_level, str) else risk_level
+    
+    @classmethod
+    def from_dict(cls, feature: Dict[str, Any]) -> "FeatureRecord":
+        """Build a record from a feature dictionary; unknown keys are dropped."""
+        return cls(
+            feature.get("name"),
+            feature.get("description"),
+            feature.get("reach") or 0,
+            feature.get("impact") or 0,
+            feature.get("confidence") or 0,
+            feature.get("effort") or 0,
+            feature.get("strategic_alignment"),
+            feature.get("dependencies") or (),
+            feature.get("risk_level"),
+            feature.get("ease"),
+            feature.get("strategic_scores"),
+        )
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dictionary-style access to a field; missing optional fields give ``default``."""
+        value = getattr(self, key, None) if key in RECORD_FIELDS else None
+        if value is None or (key == "dependencies" and not value):
+            return default
+        if key == "dependencies":
+            return list(value)
+        return dict(value) if key == "strategic_scores" else value
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key) is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in RECORD_FIELDS if self.get(key) is not None)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the feature as a dictionary in the documented format."""
+        return dict(self)
+    
+    def __repr__(self) -> str:
+        return f"FeatureRecord({self.name!r}, reach={self.reach}, effort={self.effort})"
+
+
+class _StringPool:
+    """
+    Interned strings addressed by integer code.
+    
+    Built pools hold a list plus a reverse index; pools read from a store file
+    decode each string lazily from the mapped UTF-8 blob.
+    """
+    
+    def __init__(self, blob: Optional[memoryview] = None, offsets: Optional[Sequence[int]] = None):
+        self._blob = blob
+        self._offsets = offsets
+        self._strings: List[Optional[str]] = [None] * (len(offsets) - 1) if offsets is not None else []
+        self._codes: Optional[Dict[str, int]] = None if blob is not None else {}
+    
+    def __len__(self) -> int:
+        return len(self._strings)
+    
+    def intern(self, value: str) -> int:
+        """Return the code of ``value``, adding it to the pool when new."""
+        codes = self._codes_index()
+        code = codes.get(value)
+        if code is None:
+            if self._blob is not None:
+                raise TypeError("Feature stores opened from a file are read-only")
+            code = codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+    
+    def __getitem__(self, code: int) -> Optional[str]:
+        if code == _MISSING:
+            return None
+        value = self._strings[code]
+        if value is None:
+            value = self._strings[code] = str(self._blob[self._offsets[code]:self._offsets[code + 1]], "utf-8")
+        return value
+    
+    def code(self, value: str) -> Optional[int]:
+        """Return the code of ``value`` without adding it, or None."""
+        return self._codes_index().get(value)
+    
+    def _codes_index(self) -> Dict[str, int]:
+        if self._codes is None:
+            self._codes = {self[code]: code for code in range(len(self._strings))}
+        return self._codes
+    
+    def encode(self) -> tuple:
+        """Return the pool as (UTF-8 blob, array('q') of offsets)."""
+        pieces = [self[code].encode("utf-8") for code in range(len(self._strings))]
+        offsets = array("q", [0])
+        position = 0
+        for piece in pieces:
+            position += len(piece)
+            offsets.append(position)
+        return b"".join(pieces), offsets
+
+
+class FeatureStore:
+    """
+    A backlog held as struct-of-arrays columns.
+    
+    Numeric fields are ``array('d')`` columns (NaN marks a missing ease or
+    strategic_alignment), string fields are ``array('i')`` codes into one
+    interned string pool, and dependencies are integer adjacency in CSR form:
+    the dependencies of feature ``i`` are
+    ``dependency_targets[dependency_offsets[i]:dependency_offsets[i + 1]]``.
+    ``strategic_scores`` are kept the same way, as dimension codes in
+    ``strategic_dimensions`` and scores in ``strategic_values`` delimited by
+    ``strategic_offsets``.
+    Per feature this is a few dozen bytes of columns plus the pooled strings,
+    a fraction of what the equivalent dictionaries take.
+    
+    Stores save to a flat binary file whose columns are 8-byte aligned, so
+    ``FeatureStore.open`` maps them back without parsing or copying.
+    
+    Example:
+        store = FeatureStore.load("backlog.csv")
+        store.save("backlog.features")
+        store = FeatureStore.open("backlog.features")
+        scores = store.scores()
+    """
+    
+    COLUMNS = NUMERIC_FIELDS + STRING_FIELDS + ("dependency_offsets", "dependency_targets",
+                                                "strategic_offsets", "strategic_dimensions", "strategic_values")
+    
+    def __init__(self):
+        """Create an empty store; use from_features, load or open to fill it."""
+        self._columns: Dict[str, Any] = {field: array("d") for field in NUMERIC_FIELDS}
+        self._columns.update({field: array("i") for field in STRING_FIELDS})
+        self._columns["dependency_offsets"] = array("q", [0])
+        self._columns["dependency_targets"] = array("i")
+        # The end offset of a feature without strategic_scores is stored as
+        # -1 - offset, telling it apart from one with an empty mapping
+        self._columns["strategic_offsets"] = array("q", [0])
+        self._columns["strategic_dimensions"] = array("i")
+        self._columns["strategic_values"] = array("d")
+        self.strings = _StringPool()
+        self.missing: Dict[str, List[str]] = {}
+        self.duplicates: List[str] = []
+        self._index: Optional[Dict[str, int]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._resolved = True
+    
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    
+    @classmethod
+    def from_features(cls, features: Iterable[Union[Dict[str, Any], FeatureRecord]]) -> "FeatureStore":
+        """
+        Build a store from feature dictionaries or records.
+        
+        Only the documented schema fields are kept. Dependencies are resolved
+        to feature positions once every feature is in; names that match no
+        feature are reported in ``missing`` and, as in DependencyGraph, a
+        repeated name resolves to its first occurrence.
+        """
+        store = cls()
+        for feature in features:
+            store.append(feature)
+        store._resolve()
+        return store
+    
+    @classmethod
+    def from_jsonl(cls, path: str) -> "FeatureStore":
+        """Load features from a JSON Lines file, one feature object per line."""
+        with open(path, "r", encoding="utf-8") as fp:
+            return cls.from_features(json.loads(line) for line in fp if line.strip())
+    
+    @classmethod
+    def from_csv(cls, path: str) -> "FeatureStore":
+        """
+        Load features from a CSV file with a header row of schema field names.
+        
+        Empty cells are missing values, the "dependencies" cell lists
+        feature names separated by CSV_DEPENDENCY_SEPARATOR and a
+        "strategic_scores" cell holds a JSON object.
+        """
+        store = cls()
+        with open(path, "r", encoding="utf-8", newline="") as fp:
+            for row in csv.DictReader(fp):
+                feature: Dict[str, Any] = {key: value for key, value in row.items() if value}
+                for field in NUMERIC_FIELDS:
+                    if field in feature:
+                        feature[field] = float(feature[field])
+                if "dependencies" in feature:
+                    feature["dependencies"] = [
+                        name.strip() for name in feature["dependencies"].split(CSV_DEPENDENCY_SEPARATOR) if name.strip()
+                    ]
+                if "strategic_scores" in feature:
+                    feature["strategic_scores"] = json.loads(feature["strategic_scores"])
+                store.append(feature)
+        store._resolve()
+        return store
+    
+    @classmethod
+    def load(cls, path: str) -> "FeatureStore":
+        """Load a store from .csv, .jsonl/.ndjson, .json (features list or input document) or a saved store."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return cls.from_csv(path)
+        if extension in (".jsonl", ".ndjson"):
+            return cls.from_jsonl(path)
+        if extension == ".json":
+            with open(path, "r", encoding="utf-8") as fp:
+                data = json.load(fp)
+            return cls.from_features(data["features"] if isinstance(data, dict) else data)
+        return cls.open(path)
+    
+    def append(self, feature: Union[Dict[str, Any], FeatureRecord]) -> int:
+        """
+        Add one feature and return its position.
+        
+        Dependencies added this way stay unresolved until the next read that
+        needs them, so bulk appends cost O(1) each.
+        """
+        if self._mmap is not None:
+            raise TypeError("Feature stores opened from a file are read-only")
+        columns = self._columns
+        get = feature.get
+        for field in NUMERIC_FIELDS:
+            value = get(field)
+            if value is None:
+                value = math.nan if field in OPTIONAL_NUMERIC_FIELDS else 0.0
+            columns[field].append(float(value))
+        intern = self.strings.intern
+        for field in STRING_FIELDS:
+            value = get(field)
+            columns[field].append(_MISSING if value is None else intern(str(value)))
+        scores = get("strategic_scores")
+        if scores is None:
+            columns["strategic_offsets"].append(-1 - len(columns["strategic_values"]))
+        else:
+            for dimension, score in scores.items():
+                columns["strategic_dimensions"].append(intern(str(dimension)))
+                columns["strategic_values"].append(float(score))
+            columns["strategic_offsets"].append(len(columns["strategic_values"]))
+        # Targets hold string codes until _resolve maps them to positions
+        targets = columns["dependency_targets"]
+        targets.extend(intern(str(name)) for name in get("dependencies") or ())
+        columns["dependency_offsets"].append(len(targets))
+        self._resolved = False
+        self._index = None
+        return len(self) - 1
+    
+    def _resolve(self) -> None:
+        """Map pending dependency string codes to feature positions."""
+        if self._resolved:
+            return
+        columns = self._columns
+        names = columns["name"]
+        offsets = columns["dependency_offsets"]
+        targets = columns["dependency_targets"]
+        
+        # Position of the first feature carrying each string code
+        position_of = array("i", [_MISSING]) * len(self.strings)
+        duplicates = []
+        for position, code in enumerate(names):
+            if code == _MISSING:
+                continue
+            if position_of[code] == _MISSING:
+                position_of[code] = position
+            else:
+                duplicates.append(self.strings[code])
+        
+        resolved = array("i")
+        resolved_offsets = array("q", [0])
+        missing: Dict[str, List[str]] = {}
+        for position in range(len(names)):
+            start, end = offsets[position], offsets[position + 1]
+            seen = set()
+            for code in targets[start:end]:
+                target = position_of[code]
+                if target == _MISSING:
+                    missing.setdefault(self.strings[names[position]], []).append(self.strings[code])
+                elif target not in seen:
+                    seen.add(target)
+                    resolved.append(target)
+            resolved_offsets.append(len(resolved))
+        
+        columns["dependency_targets"] = resolved
+        columns["dependency_offsets"] = resolved_offsets
+        self.duplicates = duplicates
+        self.missing = missing
+        self._resolved = True
+    
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    
+    def __len__(self) -> int:
+        return len(self._columns["reach"])
+    
+    def column(self, field: str) -> Any:
+        """
+        Return one column without copying it.
+        
+        NumPy arrays when NumPy is installed, otherwise ``array`` objects (built
+        stores) or typed memoryviews (stores opened from a file).
+        """
+        if field not in self.COLUMNS:
+            raise KeyError(f"Unknown column '{field}', expected one of: {', '.join(self.COLUMNS)}")
+        if field.startswith("dependency"):
+            self._resolve()
+        values = self._columns[field]
+        if np is not None and not isinstance(values, np.ndarray):
+            return np.frombuffer(values, dtype=values.typecode if isinstance(values, array) else values.format)
+        return values
+    
+    def __getitem__(self, position: int) -> FeatureRecord:
+        """Materialize one feature as a FeatureRecord."""
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("feature position out of range")
+        columns = self._columns
+        ease = columns["ease"][position]
+        alignment = columns["strategic_alignment"][position]
+        return FeatureRecord(
+            self.strings[columns["name"][position]],
+            self.strings[columns["description"][position]],
+            columns["reach"][position],
+            columns["impact"][position],
+            columns["confidence"][position],
+            columns["effort"][position],
+            None if math.isnan(alignment) else alignment,
+            [self.strings[columns["name"][target]] for target in self.dependency_indices(position)],
+            self.strings[columns["risk_level"][position]],
+            None if math.isnan(ease) else ease,
+            self.strategic_scores(position),
+        )
+    
+    def __iter__(self) -> Iterator[FeatureRecord]:
+        for position in range(len(self)):
+            yield self[position]
+    
+    def name(self, position: int) -> str:
+        """Name of the feature at ``position``."""
+        return self.strings[self._columns["name"][position]]
+    
+    def index_of(self, name: str) -> Optional[int]:
+        """Position of the first feature called ``name``, or None."""
+        if self._index is None:
+            index: Dict[str, int] = {}
+            for position, code in enumerate(self._columns["name"]):
+                if code != _MISSING:
+                    index.setdefault(self.strings[code], position)
+            self._index = index
+        return self._index.get(name)
+    
+    def dependency_indices(self, position: int) -> Sequence[int]:
+        """Positions of the features that the feature at ``position`` depends on."""
+        self._resolve()
+        offsets = self._columns["dependency_offsets"]
+        return self._columns["dependency_targets"][offsets[position]:offsets[position + 1]]
+    
+    def strategic_scores(self, position: int) -> Optional[Dict[str, float]]:
+        """The strategic_scores of the feature at ``position``, or None if it has none."""
+        offsets = self._columns["strategic_offsets"]
+        end = offsets[position + 1]
+        if end < 0:
+            return None
+        start = offsets[position]
+        if start < 0:
+            start = -1 - start
+        dimensions = self._columns["strategic_dimensions"]
+        values = self._columns["strategic_values"]
+        return {self.strings[dimensions[index]]: values[index] for index in range(start, end)}
+    
+    def to_records(self) -> List[FeatureRecord]:
+        """Materialize every feature as a FeatureRecord."""
+        return list(self)
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize every feature as a dictionary in the documented format."""
+        return [record.to_dict() for record in self]
+    
+    def scores(self) -> Dict[str, Any]:
+        """
+        RICE and ICE scores for every feature, straight from the columns.
+        
+        Uses the same formula as calculate_rice (and
+        PRDGenerator.calculate_rice_score) via score_batch, without building
+        any per-feature objects. As in rank_features, explicit ease is used
+        only when every feature has one.
+        """
+        ease = self.column("ease")
+        if np is not None:
+            has_ease = len(ease) > 0 and not np.isnan(ease).any()
+        else:
+            has_ease = len(ease) > 0 and not any(math.isnan(value) for value in ease)
+        return score_batch(self.column("reach"), self.column("impact"),
+                           self.column("confidence"), self.column("effort"),
+                           ease if has_ease else None)
+    
+    def rank(self, k: int = 10, by: str = "rice") -> List[Dict[str, Any]]:
+        """
+        Return the top k features in the same format as rank_features.
+        
+        Args:
+            k: Number of features to return
+            by: Score to rank by ("rice" or "ice")
+        """
+        if by not in ("rice", "ice"):
+            raise ValueError(f"Unknown score '{by}', expected 'rice' or 'ice'")
+        scores = self.scores()
+        return [
+            {
+                "rank": rank,
+                "name": self.name(position),
+                "rice_score": float(scores["rice"][position]),
+                "ice_score": float(scores["ice"][position]),
+            }
+            for rank, position in enumerate(top_k(scores[by], k), start=1)
+        ]
+    
+    def nbytes(self) -> int:
+        """Approximate size of the columns in bytes (string pool excluded)."""
+        return sum(len(values) * values.itemsize for values in self._columns.values())
+    
+    # ------------------------------------------------------------------
+    # Binary file
+    # ------------------------------------------------------------------
+    
+    def save(self, path: str) -> None:
+        """
+        Write the store to ``path`` in a memory-mappable binary layout.
+        
+        The file holds FILE_MAGIC, a length-prefixed JSON header describing
+        each block, then the column and string-pool blocks, each 8-byte
+        aligned. The file is written next to ``path`` and renamed into place.
+        """
+        self._resolve()
+        blob, string_offsets = self.strings.encode()
+        blocks = [(field, self._columns[field]) for field in self.COLUMNS]
+        blocks += [("string_offsets", string_offsets), ("string_data", array("B", blob))]
+        
+        layout: Dict[str, Dict[str, Any]] = {}
+        position = 0
+        for field, values in blocks:
+            typecode = values.typecode if isinstance(values, array) else values.format
+            layout[field] = {"typecode": typecode, "offset": position, "length": len(values)}
+            position += _aligned(len(values) * values.itemsize)
+        header = json.dumps({
+            "count": len(self),
+            "byteorder": sys.byteorder,
+            "blocks": layout,
+            "missing": self.missing,
+            "duplicates": self.duplicates,
+        }).encode("utf-8")
+        data_start = _aligned(len(FILE_MAGIC) + 8 + len(header))
+        
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as fp:
+            fp.write(FILE_MAGIC)
+            fp.write(len(header).to_bytes(8, "little"))
+            fp.write(header)
+            fp.write(bytes(data_start - fp.tell()))
+            for field, values in blocks:
+                size = len(values) * values.itemsize
+                fp.write(memoryview(values).cast("B"))
+                fp.write(bytes(_aligned(size) - size))
+        os.replace(temporary, path)
+    
+    @classmethod
+    def open(cls, path: str) -> "FeatureStore":
+        """
+        Map a file written by save without reading or copying its columns.
+        
+        The returned store is read-only. Columns (and arrays returned by
+        column) are views of the mapping, so the file should not be rewritten
+        while they are in use.
+        
+        Raises:
+            ValueError: If the file is not a feature store or was written on a
+                machine with a different byte order
+        """
+        with open(path, "rb") as fp:
+            mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapping[:len(FILE_MAGIC)] != FILE_MAGIC:
+            mapping.close()
+            raise ValueError(f"{path} is not a feature store file")
+        header_length = int.from_bytes(mapping[len(FILE_MAGIC):len(FILE_MAGIC) + 8], "little")
+        header_start = len(FILE_MAGIC) + 8
+        header = json.loads(bytes(mapping[header_start:header_start + header_length]))
+        if header["byteorder"] != sys.byteorder:
+            mapping.close()
+            raise ValueError(f"{path} was written with {header['byteorder']}-endian byte order")
+        data_start = _aligned(header_start + header_length)
+        
+        view = memoryview(mapping)
+        blocks = {}
+        for field, block in header["blocks"].items():
+            start = data_start + block["offset"]
+            itemsize = array(block["typecode"]).itemsize
+            blocks[field] = view[start:start + block["length"] * itemsize].cast(block["typecode"])
+        
+        store = cls()
+        store._columns = {field: blocks[field] for field in cls.COLUMNS}
+        store.strings = _StringPool(blocks["string_data"], blocks["string_offsets"])
+        store.missing = header["missing"]
+        store.duplicates = header["duplicates"]
+        store._mmap = mapping
+        return store
+    
+    def close(self) -> None:
+        """Release the file mapping of a store returned by open."""
+        if self._mmap is None:
+            return
+        self._columns = {}
+        self.strings = _StringPool()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Arrays handed out by column() still reference the mapping; it
+            # is released once they are garbage collected
+            pass
+        self._mmap = None
+    
+    def __enter__(self) -> "FeatureStore":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _aligned(size: int) -> int:
+    """Round ``size`` up to a multiple of 8 bytes."""
+    return (size + 7) & ~7
+
+
+def compact(
+    features: Iterable[Dict[str, Any]],
+    columnar_threshold: int = COLUMNAR_THRESHOLD,
+) -> Union[List[FeatureRecord], FeatureStore]:
+    """
+    Convert feature dictionaries to the cheapest representation for their count.
+    
+    Backlogs shorter than ``columnar_threshold`` become a list of
+    FeatureRecord; longer ones become a FeatureStore. Both iterate as
+    records that answer ``get`` like the original dictionaries.
+    """
+    features = features if isinstance(features, list) else list(features)
+    if len(features) < columnar_threshold:
+        return [FeatureRecord.from_dict(feature) for feature in features]
+    return FeatureStore.from_features(features)
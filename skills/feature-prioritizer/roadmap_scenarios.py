@@ -0,0 +1,292 @@
+"""
+Feature Prioritizer - Roadmap Scenarios
+Selects the feature set with the highest total score that fits an effort
+budget, honoring required features and dependency precedence
+"""
+
+from typing import Dict, List, Any, Optional, Set
+import time
+
+from calculate_scores import calculate_rice
+from dependency_graph import DependencyGraph
+
+# Share of the effort budget used for each scenario, from leanest to fullest
+SCENARIO_BUDGETS = [("Lean", 0.5), ("Balanced", 0.75), ("Full Capacity", 1.0)]
+
+
+class RoadmapOptimizer:
+    """
+    Capacity-constrained roadmap optimizer.
+    
+    Small candidate sets are solved exactly with branch-and-bound (features
+    decided in dependency order, bounded by the fractional-knapsack
+    relaxation). Larger sets, or searches that exceed their node budget, use a
+    time-bounded greedy that adds each feature together with any dependencies
+    it still needs.
+    """
+    
+    def __init__(
+        self,
+        features: List[Dict[str, Any]],
+        exact_limit: int = 40,
+        node_limit: int = 500000,
+        time_limit: float = 2.0,
+    ):
+        """
+        Prepare the optimizer for a backlog.
+        
+        Args:
+            features: Feature dictionaries in the prioritizer format. A
+                feature's value is its "score" if given, otherwise its RICE score.
+            exact_limit: Largest number of optional features solved exactly
+            node_limit: Branch-and-bound nodes explored before falling back
+            time_limit: Seconds allowed per optimization run
+        """
+        self.graph = DependencyGraph(features)
+        self.exact_limit = exact_limit
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        
+        by_name = {}
+        for feature in features:
+            by_name.setdefault(feature.get("name"), feature)
+        self.values: List[float] = []
+        for name in self.graph.names:
+            feature = by_name[name]
+            if "score" in feature:
+                value = float(feature["score"])
+            else:
+                value = calculate_rice(
+                    feature.get("reach", 0),
+                    feature.get("impact", 0),
+                    feature.get("confidence", 0),
+                    feature.get("effort", 0),
+                )
+            self.values.append(value)
+        
+        # Features on or behind a dependency cycle can never be scheduled
+        self.order = self.graph.topological_order()
+        self.schedulable = set(self.order)
+    
+    def optimize(self, budget: float, required: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Find the highest-value feature set that fits the budget.
+        
+        Args:
+            budget: Maximum total effort (person-months)
+            required: Feature names that must be included
+        
+        Returns:
+            Scenario dictionary with features (in build order), total_effort,
+            total_score, optimal, method, and stats (elapsed_ms, nodes)
+        """
+        started = time.perf_counter()
+        graph = self.graph
+        efforts = graph.efforts
+        
+        unknown = [name for name in required or [] if name not in graph.index]
+        blocked = [name for name in required or [] if name in graph.index and graph.index[name] not in self.schedulable]
+        base = self._closure([graph.index[name] for name in required or [] if name in graph.index], set())
+        base_effort = sum(efforts[node] for node in base)
+        
+        result: Dict[str, Any] = {
+            "budget": budget,
+            "unknown_required": unknown,
+            "unschedulable_required": blocked,
+        }
+        if unknown or blocked or base_effort > budget:
+            result.update({
+                "feasible": False,
+                "features": [graph.names[node] for node in self.order if node in base],
+                "total_effort": base_effort,
+                "total_score": sum(self.values[node] for node in base),
+                "optimal": False,
+                "method": "none",
+                "stats": {"elapsed_ms": (time.perf_counter() - started) * 1000, "nodes": 0},
+            })
+            return result
+        
+        candidates = [node for node in self.order if node not in base]
+        deadline = started + self.time_limit
+        chosen, optimal, method, nodes = None, False, "greedy", 0
+        if len(candidates) <= self.exact_limit:
+            chosen, optimal, nodes = self._branch_and_bound(candidates, base, budget - base_effort, deadline)
+            method = "branch_and_bound"
+        if chosen is None or not optimal:
+            greedy = self._greedy(candidates, base, budget - base_effort, deadline)
+            if chosen is None or self._value(greedy) > self._value(chosen):
+                chosen, method = greedy, "greedy"
+        
+        selected = base | chosen
+        result.update({
+            "feasible": True,
+            "features": [graph.names[node] for node in self.order if node in selected],
+            "total_effort": sum(efforts[node] for node in selected),
+            "total_score": self._value(selected),
+            "optimal": optimal,
+            "method": method,
+            "stats": {"elapsed_ms": (time.perf_counter() - started) * 1000, "nodes": nodes},
+        })
+        return result
+    
+    def scenarios(self, constraints: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build Lean, Balanced and Full Capacity scenarios and keep the Pareto front.
+        
+        Args:
+            constraints: Dictionary with optional "max_effort_per_quarter" and
+                "required_features"
+        
+        Returns:
+            Non-dominated scenarios ordered by budget (a scenario is dropped when
+            another one reaches at least its score with no more effort)
+        """
+        max_effort = constraints.get("max_effort_per_quarter")
+        if max_effort is None:
+            max_effort = sum(self.graph.efforts[node] for node in self.order)
+        required = constraints.get("required_features") or []
+        
+        results = []
+        for name, share in SCENARIO_BUDGETS:
+            scenario = self.optimize(max_effort * share, required)
+            scenario["name"] = name
+            results.append(scenario)
+        
+        front = []
+        for scenario in results:
+            if scenario["feasible"]:
+                if any(_dominates(other, scenario) for other in results if other["feasible"]):
+                    continue
+                if any(kept["feasible"] and kept["features"] == scenario["features"] for kept in front):
+                    continue
+            front.append(scenario)
+        return front
+    
+    def _value(self, nodes: Set[int]) -> float:
+        """Total score of a set of nodes."""
+        values = self.values
+        return sum(values[node] for node in nodes)
+    
+    def _closure(self, nodes: List[int], chosen: Set[int]) -> Set[int]:
+        """Return nodes plus every transitive dependency not already chosen."""
+        requires = self.graph.requires
+        closure: Set[int] = set()
+        stack = [node for node in nodes if node not in chosen]
+        while stack:
+            node = stack.pop()
+            if node in closure:
+                continue
+            closure.add(node)
+            stack.extend(dep for dep in requires[node] if dep not in chosen and dep not in closure)
+        return closure
+    
+    def _branch_and_bound(self, candidates: List[int], base: Set[int], capacity: float, deadline: float):
+        """
+        Exact search over candidates in dependency order.
+        
+        Returns:
+            Tuple of (chosen node set or None, proved optimal, nodes explored)
+        """
+        efforts = self.graph.efforts
+        values = self.values
+        requires = self.graph.requires
+        # Features with no value can only help by unlocking others, which the
+        # search handles through precedence, so they never raise the bound.
+        by_density = sorted(
+            (node for node in candidates if values[node] > 0),
+            key=lambda node: values[node] / efforts[node] if efforts[node] else float("inf"),
+            reverse=True,
+        )
+        position = {node: index for index, node in enumerate(candidates)}
+        
+        best_value = -1.0
+        best: Set[int] = set()
+        chosen: Set[int] = set()
+        nodes = 0
+        aborted = False
+        
+        def bound(depth: int, room: float) -> float:
+            total = 0.0
+            for node in by_density:
+                if position[node] < depth:
+                    continue
+                effort = efforts[node]
+                if effort <= room:
+                    room -= effort
+                    total += values[node]
+                else:
+                    return total + values[node] * room / effort
+            return total
+        
+        def search(depth: int, room: float, value: float) -> None:
+            nonlocal best_value, best, nodes, aborted
+            nodes += 1
+            if nodes > self.node_limit or (nodes & 1023 == 0 and time.perf_counter() > deadline):
+                aborted = True
+                return
+            if value > best_value:
+                best_value, best = value, set(chosen)
+            if depth == len(candidates) or value + bound(depth, room) <= best_value:
+                return
+            node = candidates[depth]
+            if efforts[node] <= room and all(dep in chosen or dep in base for dep in requires[node]):
+                chosen.add(node)
+                search(depth + 1, room - efforts[node], value + values[node])
+                chosen.discard(node)
+                if aborted:
+                    return
+            search(depth + 1, room, value)
+        
+        search(0, capacity, 0.0)
+        return best, not aborted, nodes
+    
+    def _greedy(self, candidates: List[int], base: Set[int], capacity: float, deadline: float) -> Set[int]:
+        """
+        Add features by descending score density, each with its missing dependencies.
+        
+        Stops early at the deadline, keeping whatever has been selected so far.
+        """
+        efforts = self.graph.efforts
+        values = self.values
+        by_density = sorted(
+            candidates,
+            key=lambda node: values[node] / efforts[node] if efforts[node] else float("inf"),
+            reverse=True,
+        )
+        chosen = set(base)
+        room = capacity
+        for count, node in enumerate(by_density):
+            if count & 255 == 0 and time.perf_counter() > deadline:
+                break
+            if node in chosen or efforts[node] > room:
+                continue
+            bundle = self._closure([node], chosen)
+            cost = sum(efforts[member] for member in bundle)
+            if cost <= room:
+                chosen |= bundle
+                room -= cost
+        return chosen - base
+
+
+def _dominates(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+    """Whether first scores at least as high for no more effort, and is strictly better in one."""
+    return (
+        first["total_effort"] <= second["total_effort"]
+        and first["total_score"] >= second["total_score"]
+        and (first["total_effort"] < second["total_effort"] or first["total_score"] > second["total_score"])
+    )
+
+
+def generate_roadmap_scenarios(features: List[Dict[str, Any]], constraints: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Create roadmap options that maximize total score under resource constraints.
+    
+    Args:
+        features: Feature dictionaries in the prioritizer format
+        constraints: Dictionary with optional "max_effort_per_quarter" and
+            "required_features"
+    
+    Returns:
+        Pareto-optimal scenarios (see RoadmapOptimizer.scenarios)
+    """
+    return RoadmapOptimizer(features).scenarios(constraints)
@@ -0,0 +1,346 @@
+"""
+Feature Prioritizer - Strategic Weights
+Weighted strategic scoring with incremental re-ranking for what-if sessions,
+and the Value vs. Effort matrix
+"""
+
+from typing import Dict, List, Any, Optional, Sequence
+from array import array
+import statistics
+
+from calculate_scores import score_batch, top_k
+
+try:  # NumPy is optional; large backlogs are much faster with it
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+# Strategic dimensions weighted by company_priorities ("<dimension>_weight")
+DIMENSIONS = ("growth", "retention", "monetization")
+
+QUADRANTS = ("quick_wins", "big_bets", "fill_ins", "time_sinks")
+
+
+def strategic_alignment(feature: Dict[str, Any], dimensions: Sequence[str] = DIMENSIONS) -> List[float]:
+    """
+    Read a feature's alignment (0.0-1.0) with each strategic dimension.
+    
+    Alignment comes from ``strategic_scores`` (e.g. {"growth": 0.8}) when
+    given. Otherwise the 1-5 ``strategic_alignment`` rating applies to every
+    dimension, scaled to 0.0-1.0; features with neither are neutral (0.0).
+    """
+    scores = feature.get("strategic_scores")
+    if isinstance(scores, dict):
+        return [float(scores.get(dimension, 0.0)) for dimension in dimensions]
+    rating = feature.get("strategic_alignment")
+    if rating is None:
+        return [0.0] * len(dimensions)
+    shared = min(max((float(rating) - 1) / 4, 0.0), 1.0)
+    return [shared] * len(dimensions)
+
+
+def weight_vector(weights: Dict[str, float], dimensions: Sequence[str] = DIMENSIONS) -> List[float]:
+    """
+    Turn company_priorities into one weight per dimension.
+    
+    Accepts "growth_weight" style keys as documented, or bare dimension
+    names; missing dimensions weigh 0.
+    
+    Raises:
+        ValueError: If a key names no known dimension
+    """
+    known = set(dimensions)
+    vector = {dimension: 0.0 for dimension in dimensions}
+    for key, value in weights.items():
+        dimension = key[:-len("_weight")] if key.endswith("_weight") else key
+        if dimension not in known:
+            raise ValueError(f"Unknown strategic weight '{key}', expected one of: "
+                             + ", ".join(f"{name}_weight" for name in dimensions))
+        vector[dimension] = float(value)
+    return [vector[dimension] for dimension in dimensions]
+
+
+class StrategicRanker:
+    """
+    Strategic scoring for a backlog whose weights change often.
+    
+    A feature's strategic score is its RICE score scaled by how well it
+    matches the weighted priorities::
+        
+        score = rice * (1 + sum(weight[d] * alignment[d]))
+    
+    which is linear in the weights. The ranker precomputes a features-by-
+    (1 + dimensions) matrix with columns ``rice`` and ``rice * alignment[d]``,
+    so every weight change is one matrix-vector product with ``[1, *weights]``
+    followed by an O(n) partial selection of the top N; the backlog is never
+    fully re-sorted. Editing a single feature updates its row and patches the
+    top N in place unless the feature drops out of it.
+    
+    Example:
+        ranker = StrategicRanker(features, top_n=10)
+        view = ranker.set_weights({"growth_weight": 0.6, "retention_weight": 0.3})
+        view["top"], view["quadrant_counts"]
+    """
+    
+    def __init__(
+        self,
+        features: List[Dict[str, Any]],
+        dimensions: Sequence[str] = DIMENSIONS,
+        top_n: int = 10,
+        value_threshold: Optional[float] = None,
+        effort_threshold: Optional[float] = None,
+    ):
+        """
+        Args:
+            features: Feature dictionaries in the prioritizer format
+            dimensions: Strategic dimensions, in weight-vector order
+            top_n: Size of the maintained ranking
+            value_threshold: Strategic score at or above which a feature is
+                high value (defaults to the median score under the current weights)
+            effort_threshold: Effort at or below which a feature is low effort
+                (defaults to the median effort)
+        """
+        self.features = features
+        self.dimensions = tuple(dimensions)
+        self.top_n = top_n
+        self.value_threshold = value_threshold
+        self.effort_threshold = effort_threshold
+        
+        rice = score_batch(
+            [feature.get("reach", 0) for feature in features],
+            [feature.get("impact", 0) for feature in features],
+            [feature.get("confidence", 0) for feature in features],
+            [feature.get("effort", 0) for feature in features],
+        )["rice"]
+        width = 1 + len(self.dimensions)
+        if np is not None:
+            alignment = np.array(
+                [strategic_alignment(feature, self.dimensions) for feature in features], dtype=np.float64
+            ).reshape(len(features), len(self.dimensions))
+            self._matrix = np.empty((len(features), width), dtype=np.float64)
+            self._matrix[:, 0] = rice
+            self._matrix[:, 1:] = alignment * rice[:, None]
+            self._effort = np.array([feature.get("effort", 0) for feature in features], dtype=np.float64)
+        else:
+            self._matrix = [
+                [value] + [value * share for share in strategic_alignment(feature, self.dimensions)]
+                for value, feature in zip(rice, features)
+            ]
+            self._effort = array("d", (float(feature.get("effort", 0)) for feature in features))
+        
+        self._weights = [1.0] + [0.0] * len(self.dimensions)
+        self._scores = self._multiply()
+        self._top = top_k(self._scores, self.top_n)
+        self._counts: Optional[Dict[str, Any]] = None
+    
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Current weights keyed as in company_priorities."""
+        return {f"{dimension}_weight": weight for dimension, weight in zip(self.dimensions, self._weights[1:])}
+    
+    def set_weights(self, weights: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Re-rank the backlog under new strategic weights.
+        
+        Args:
+            weights: company_priorities dictionary (e.g. {"growth_weight": 0.5});
+                dimensions not mentioned weigh 0
+        
+        Returns:
+            The view after the change (see view)
+        """
+        self._weights = [1.0] + weight_vector(weights, self.dimensions)
+        self._scores = self._multiply()
+        self._top = top_k(self._scores, self.top_n)
+        self._counts = None
+        return self.view()
+    
+    def update_feature(self, index: int, feature: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace one feature and update the ranking without re-scoring the rest.
+        
+        Args:
+            index: Position of the feature in the backlog
+            feature: New feature dictionary
+        
+        Returns:
+            The view after the change (see view)
+        """
+        self.features[index] = feature
+        rice = float(score_batch(
+            [feature.get("reach", 0)], [feature.get("impact", 0)],
+            [feature.get("confidence", 0)], [feature.get("effort", 0)],
+        )["rice"][0])
+        row = [rice] + [rice * share for share in strategic_alignment(feature, self.dimensions)]
+        self._matrix[index] = row
+        self._effort[index] = float(feature.get("effort", 0))
+        old_score = float(self._scores[index])
+        self._scores[index] = sum(value * weight for value, weight in zip(row, self._weights))
+        self._patch_top(index, old_score)
+        self._counts = None
+        return self.view()
+    
+    def top(self) -> List[Dict[str, Any]]:
+        """
+        The current top N, best first.
+        
+        Returns:
+            Dictionaries with rank, name, strategic_score and rice_score
+        """
+        return [
+            {
+                "rank": rank,
+                "name": self.features[index].get("name"),
+                "strategic_score": float(self._scores[index]),
+                "rice_score": float(self._matrix[index][0]),
+            }
+            for rank, index in enumerate(self._top, start=1)
+        ]
+    
+    def quadrant_counts(self) -> Dict[str, Any]:
+        """
+        Value vs. Effort quadrant sizes under the current weights.
+        
+        Returns:
+            Dictionary with a count per quadrant and the value_threshold and
+            effort_threshold used
+        """
+        if self._counts is None:
+            high_value, low_effort, value_threshold, effort_threshold = self._classify()
+            if np is not None:
+                quick = int(np.count_nonzero(high_value & low_effort))
+                high, low = int(np.count_nonzero(high_value)), int(np.count_nonzero(low_effort))
+            else:
+                quick = sum(1 for value, easy in zip(high_value, low_effort) if value and easy)
+                high, low = sum(high_value), sum(low_effort)
+            total = len(self.features)
+            self._counts = {
+                "quick_wins": quick,
+                "big_bets": high - quick,
+                "fill_ins": low - quick,
+                "time_sinks": total - high - low + quick,
+                "value_threshold": value_threshold,
+                "effort_threshold": effort_threshold,
+            }
+        return dict(self._counts)
+    
+    def value_effort_matrix(self) -> Dict[str, Any]:
+        """
+        Full Value vs. Effort matrix under the current weights.
+        
+        Returns:
+            Dictionary with a list of feature names per quadrant (in backlog
+            order), "counts" (see quadrant_counts) and "weights"
+        """
+        high_value, low_effort, _, _ = self._classify()
+        quadrants: Dict[str, List[Any]] = {quadrant: [] for quadrant in QUADRANTS}
+        for feature, value, easy in zip(self.features, high_value, low_effort):
+            if value:
+                quadrants["quick_wins" if easy else "big_bets"].append(feature.get("name"))
+            else:
+                quadrants["fill_ins" if easy else "time_sinks"].append(feature.get("name"))
+        quadrants["counts"] = self.quadrant_counts()
+        quadrants["weights"] = self.weights
+        return quadrants
+    
+    def view(self) -> Dict[str, Any]:
+        """Current weights, top N and quadrant counts."""
+        return {"weights": self.weights, "top": self.top(), "quadrant_counts": self.quadrant_counts()}
+    
+    def scores(self) -> List[float]:
+        """Strategic score of every feature, in backlog order."""
+        return [float(score) for score in self._scores]
+    
+    def _multiply(self):
+        """Strategic scores for the current weights: one matrix-vector product."""
+        if np is not None:
+            return self._matrix @ np.asarray(self._weights, dtype=np.float64)
+        weights = self._weights
+        return array("d", (sum(value * weight for value, weight in zip(row, weights)) for row in self._matrix))
+    
+    def _patch_top(self, index: int, old_score: float) -> None:
+        """Keep the top N correct after the score of one feature changed."""
+        scores = self._scores
+        top = self._top
+        # Same ordering as top_k: score descending, then lower index first
+        key = lambda position: (-scores[position], position)
+        if index in top:
+            # Every unranked feature sorts after the old last entry, so the
+            # set is unchanged as long as the feature did not fall below it
+            last = top[-1]
+            boundary = (-old_score, index) if last == index else key(last)
+            if key(index) <= boundary:
+                self._top = sorted(top, key=key)
+            else:
+                self._top = top_k(scores, self.top_n)
+        elif len(top) < min(self.top_n, len(scores)):
+            self._top = sorted(top + [index], key=key)
+        elif top and key(index) < key(top[-1]):
+            self._top = sorted(top[:-1] + [index], key=key)
+    
+    def _classify(self):
+        """High-value and low-effort flags plus the thresholds behind them."""
+        value_threshold = self.value_threshold
+        effort_threshold = self.effort_threshold
+        if np is not None:
+            if value_threshold is None:
+                value_threshold = float(np.median(self._scores)) if len(self._scores) else 0.0
+            if effort_threshold is None:
+                effort_threshold = float(np.median(self._effort)) if len(self._effort) else 0.0
+            return self._scores >= value_threshold, self._effort <= effort_threshold, value_threshold, effort_threshold
+        if value_threshold is None:
+            value_threshold = statistics.median(self._scores) if self._scores else 0.0
+        if effort_threshold is None:
+            effort_threshold = statistics.median(self._effort) if self._effort else 0.0
+        return (
+            [score >= value_threshold for score in self._scores],
+            [effort <= effort_threshold for effort in self._effort],
+            value_threshold,
+            effort_threshold,
+        )
+
+
+def apply_strategic_weights(features: List[Dict[str, Any]], weights: Dict[str, float]) -> List[Dict[str, Any]]:
+    """
+    Adjust scores based on company strategic priorities.
+    
+    Args:
+        features: Feature dictionaries in the prioritizer format, optionally
+            with "strategic_scores" or "strategic_alignment"
+        weights: company_priorities dictionary (growth_weight,
+            retention_weight, monetization_weight)
+    
+    Returns:
+        Copies of the features with "rice_score" and "strategic_score" added,
+        best strategic score first
+    """
+    ranker = StrategicRanker(features, top_n=len(features))
+    ranker.set_weights(weights)
+    return [
+        dict(features[index], rice_score=float(ranker._matrix[index][0]), strategic_score=float(ranker._scores[index]))
+        for index in ranker._top
+    ]
+
+
+def generate_value_effort_matrix(
+    features: List[Dict[str, Any]],
+    weights: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Create a 2x2 matrix categorizing features into quadrants.
+    
+    Value is the strategic score (plain RICE without weights); high value
+    and low effort are split at the backlog medians.
+    
+    Args:
+        features: Feature dictionaries in the prioritizer format
+        weights: Optional company_priorities dictionary
+    
+    Returns:
+        Dictionary with quick_wins, big_bets, fill_ins and time_sinks name
+        lists, "counts" and "weights" (see StrategicRanker.value_effort_matrix)
+    """
+    ranker = StrategicRanker(features, top_n=0)
+    if weights:
+        ranker.set_weights(weights)
+    return ranker.value_effort_matrix()
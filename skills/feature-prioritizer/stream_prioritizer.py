@@ -0,0 +1,350 @@
+"""
+Feature Prioritizer - Streaming
+Online RICE/ICE top-k and Value vs. Effort counts over a stream of feature
+create, update and delete events
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Hashable, Tuple
+
+from calculate_scores import calculate_rice, calculate_ice, ease_from_effort
+from strategic_weights import QUADRANTS
+
+EVENT_TYPES = ("create", "update", "delete")
+
+SCORES = ("rice", "ice")
+
+
+class IndexedHeap:
+    """
+    Binary min-heap of (key, item) pairs with a position index per item.
+    
+    The index lets an item's key be changed or the item removed in
+    O(log n), which plain ``heapq`` lists cannot do without a linear search.
+    Items must be hashable and unique within the heap.
+    """
+    
+    __slots__ = ("_keys", "_items", "_position")
+    
+    def __init__(self):
+        self._keys: List[Any] = []
+        self._items: List[Hashable] = []
+        self._position: Dict[Hashable, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._position
+    
+    def peek(self) -> Tuple[Any, Hashable]:
+        """Return the (key, item) pair with the smallest key."""
+        return self._keys[0], self._items[0]
+    
+    def push(self, item: Hashable, key: Any):
+        """
+        Add an item.
+        
+        Raises:
+            ValueError: If the item is already in the heap
+        """
+        if item in self._position:
+            raise ValueError(f"Item {item!r} is already in the heap")
+        self._keys.append(key)
+        self._items.append(item)
+        self._position[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+    
+    def pop(self) -> Tuple[Any, Hashable]:
+        """Remove and return the (key, item) pair with the smallest key."""
+        key, item = self._keys[0], self._items[0]
+        self.remove(item)
+        return key, item
+    
+    def remove(self, item: Hashable) -> Any:
+        """Remove an item and return its key."""
+        index = self._position.pop(item)
+        key = self._keys[index]
+        last_key, last_item = self._keys.pop(), self._items.pop()
+        if index < len(self._items):
+            self._keys[index], self._items[index] = last_key, last_item
+            self._position[last_item] = index
+            self._restore(index)
+        return key
+    
+    def update(self, item: Hashable, key: Any):
+        """Change the key of an item already in the heap."""
+        index = self._position[item]
+        self._keys[index] = key
+        self._restore(index)
+    
+    def key(self, item: Hashable) -> Any:
+        """Return the current key of an item."""
+        return self._keys[self._position[item]]
+    
+    def items(self) -> List[Hashable]:
+        """Items in heap (not sorted) order."""
+        return list(self._items)
+    
+    def _restore(self, index: int):
+        if index > 0 and self._keys[index] < self._keys[(index - 1) >> 1]:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+    
+    def _sift_up(self, index: int):
+        keys, items, position = self._keys, self._items, self._position
+        key, item = keys[index], items[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not key < keys[parent]:
+                break
+            keys[index], items[index] = keys[parent], items[parent]
+            position[items[index]] = index
+            index = parent
+        keys[index], items[index] = key, item
+        position[item] = index
+    
+    def _sift_down(self, index: int):
+        keys, items, position = self._keys, self._items, self._position
+        size = len(items)
+        key, item = keys[index], items[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[child + 1] < keys[child]:
+                child += 1
+            if not keys[child] < key:
+                break
+            keys[index], items[index] = keys[child], items[child]
+            position[items[index]] = index
+            index = child
+        keys[index], items[index] = key, item
+        position[item] = index
+
+
+class TopK:
+    """
+    The k best items of a changing collection, kept current incrementally.
+    
+    Items are split between two indexed heaps: the current top k, rooted at
+    its weakest member, and everything else, rooted at its strongest. Setting
+    or discarding an item touches each heap at most twice, so every change
+    costs O(log n) and the top k never has to be recomputed from scratch.
+    
+    Items are ordered by descending score, ties broken by lower ``order``
+    (matching ``top_k``'s lower-index rule).
+    """
+    
+    def __init__(self, k: int):
+        self.k = max(k, 0)
+        # Keys are (score, -order) so the root is the weakest of the top k
+        self._top = IndexedHeap()
+        # Keys are (-score, order) so the root is the strongest of the rest
+        self._rest = IndexedHeap()
+    
+    def __len__(self) -> int:
+        return len(self._top) + len(self._rest)
+    
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._top or item in self._rest
+    
+    def set(self, item: Hashable, score: float, order: int):
+        """Add an item or change its score."""
+        self.discard(item)
+        if len(self._top) < self.k:
+            self._top.push(item, (score, -order))
+            return
+        if self.k and (score, -order) > self._top.peek()[0]:
+            # Beats the weakest of the top k, which moves down to the rest
+            (weakest_score, weakest_order), weakest = self._top.pop()
+            self._rest.push(weakest, (-weakest_score, -weakest_order))
+            self._top.push(item, (score, -order))
+        else:
+            self._rest.push(item, (-score, order))
+    
+    def discard(self, item: Hashable):
+        """Remove an item if present."""
+        if item in self._top:
+            self._top.remove(item)
+            if self._rest:
+                # Promote the strongest of the rest into the freed slot
+                (negated_score, order), strongest = self._rest.pop()
+                self._top.push(strongest, (-negated_score, -order))
+        elif item in self._rest:
+            self._rest.remove(item)
+    
+    def ranked(self) -> List[Tuple[Hashable, float]]:
+        """The top k as (item, score) pairs, best first."""
+        entries = [(self._top.key(item), item) for item in self._top.items()]
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        return [(item, score) for (score, _), item in entries]
+
+
+class StreamingPrioritizer:
+    """
+    RICE and ICE top-k plus Value vs. Effort counts over a feature event stream.
+    
+    Each event changes one feature, and the rankings and quadrant counts are
+    patched rather than recomputed: O(log n) per event for the two top-k
+    structures and O(1) for the counts. ``snapshot()`` costs O(k log k)
+    regardless of how many features have been seen.
+    
+    Value is the RICE score, as in ``generate_value_effort_matrix`` without
+    weights. The batch matrix splits at the median value and effort, but a
+    running median would shift under every event and force a recount, so the
+    streaming counts use fixed thresholds instead: a feature is high value when
+    its RICE score is >= ``value_threshold`` and low effort when its effort is
+    <= ``effort_threshold``.
+    
+    Ease is taken per feature: an explicit "ease" is used when present,
+    otherwise it is derived from effort. (``rank_features`` only uses explicit
+    ease when every feature in the batch has one.)
+    """
+    
+    def __init__(self, value_threshold: float, effort_threshold: float, k: int = 10):
+        """
+        Args:
+            value_threshold: RICE score at or above which a feature is high value
+            effort_threshold: Effort (person-months) at or below which a
+                feature is low effort
+            k: Number of features kept in each top-k ranking
+        """
+        self.value_threshold = value_threshold
+        self.effort_threshold = effort_threshold
+        self.k = k
+        self._features: Dict[str, Dict[str, Any]] = {}
+        # name -> (arrival order, rice, ice, quadrant)
+        self._state: Dict[str, Tuple[int, float, float, str]] = {}
+        self._rankings = {score: TopK(k) for score in SCORES}
+        self._counts = {quadrant: 0 for quadrant in QUADRANTS}
+        self._arrivals = 0
+        self.events = 0
+    
+    def __len__(self) -> int:
+        return len(self._features)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._features
+    
+    def apply(self, event: Dict[str, Any]):
+        """
+        Apply one feature event.
+        
+        Events are dictionaries with a "type" ("create", "update" or
+        "delete") and a "feature" in the prioritizer format. Features are
+        identified by "name"; updates may carry only the changed fields, and
+        deletes only the name.
+        
+        Raises:
+            ValueError: On an unknown event type, a feature without a name, a
+                create for an existing feature, or an update or delete for an
+                unknown one
+        """
+        kind = event.get("type")
+        if kind not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type '{kind}', expected one of: {', '.join(EVENT_TYPES)}")
+        feature = event.get("feature") or {}
+        name = feature.get("name")
+        if name is None:
+            raise ValueError(f"{kind.capitalize()} event without a feature name")
+        
+        if kind == "create":
+            if name in self._features:
+                raise ValueError(f"Feature '{name}' already exists")
+            self._set(name, dict(feature))
+        elif name not in self._features:
+            raise ValueError(f"Unknown feature '{name}'")
+        elif kind == "update":
+            merged = dict(self._features[name])
+            merged.update(feature)
+            self._set(name, merged)
+        else:
+            self._delete(name)
+        self.events += 1
+    
+    def consume(self, events: Iterable[Dict[str, Any]]) -> "StreamingPrioritizer":
+        """Apply every event of an iterable in order; returns self."""
+        for event in events:
+            self.apply(event)
+        return self
+    
+    def top(self, by: str = "rice") -> List[Dict[str, Any]]:
+        """
+        Current top k by one score, best first.
+        
+        Returns:
+            Entries shaped like ``rank_features`` output: "rank", "name",
+            "rice_score" and "ice_score"
+        """
+        if by not in SCORES:
+            raise ValueError(f"Unknown score '{by}', expected 'rice' or 'ice'")
+        ranked = []
+        for rank, (name, _) in enumerate(self._rankings[by].ranked(), start=1):
+            _, rice, ice, _ = self._state[name]
+            ranked.append({"rank": rank, "name": name, "rice_score": rice, "ice_score": ice})
+        return ranked
+    
+    def quadrant_counts(self) -> Dict[str, Any]:
+        """Features per Value vs. Effort quadrant, plus the thresholds used."""
+        counts: Dict[str, Any] = dict(self._counts)
+        counts["value_threshold"] = self.value_threshold
+        counts["effort_threshold"] = self.effort_threshold
+        return counts
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Point-in-time view of the stream.
+        
+        Returns:
+            Dictionary with "features" (live feature count), "events" (events
+            applied), "top_rice", "top_ice" and "quadrant_counts"
+        """
+        return {
+            "features": len(self._features),
+            "events": self.events,
+            "top_rice": self.top("rice"),
+            "top_ice": self.top("ice"),
+            "quadrant_counts": self.quadrant_counts(),
+        }
+    
+    def feature(self, name: str) -> Optional[Dict[str, Any]]:
+        """Current fields of a feature, or None if it is not live."""
+        feature = self._features.get(name)
+        return dict(feature) if feature is not None else None
+    
+    def _set(self, name: str, feature: Dict[str, Any]):
+        """Score a created or updated feature and patch rankings and counts."""
+        previous = self._state.get(name)
+        if previous is None:
+            order = self._arrivals
+            self._arrivals += 1
+        else:
+            order = previous[0]
+            self._counts[previous[3]] -= 1
+        
+        effort = feature.get("effort", 0)
+        impact = feature.get("impact", 0)
+        confidence = feature.get("confidence", 0)
+        ease = feature["ease"] if "ease" in feature else ease_from_effort(effort)
+        rice = float(calculate_rice(feature.get("reach", 0), impact, confidence, effort))
+        ice = float(calculate_ice(impact, confidence, ease))
+        quadrant = self._quadrant(rice, effort)
+        
+        self._features[name] = feature
+        self._state[name] = (order, rice, ice, quadrant)
+        self._counts[quadrant] += 1
+        self._rankings["rice"].set(name, rice, order)
+        self._rankings["ice"].set(name, ice, order)
+    
+    def _delete(self, name: str):
+        _, _, _, quadrant = self._state.pop(name)
+        del self._features[name]
+        self._counts[quadrant] -= 1
+        for ranking in self._rankings.values():
+            ranking.discard(name)
+    
+    def _quadrant(self, value: float, effort: float) -> str:
+        if value >= self.value_threshold:
+            return "quick_wins" if effort <= self.effort_threshold else "big_bets"
+        return "fill_ins" if effort <= self.effort_threshold else "time_sinks"
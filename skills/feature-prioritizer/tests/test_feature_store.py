@@ -0,0 +1,53 @@
+"""
+Feature records and stores must rank exactly like the feature dictionaries
+they replace
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculate_scores import rank_features  # noqa: E402
+from feature_store import FeatureStore, compact  # noqa: E402
+from strategic_weights import StrategicRanker, apply_strategic_weights  # noqa: E402
+
+WEIGHTS = {"growth_weight": 1.0, "retention_weight": 0.5}
+
+FEATURES = [
+    {"name": "a", "reach": 1000, "impact": 1, "confidence": 0.8, "effort": 10, "ease": 2,
+     "strategic_scores": {"growth": 1.0, "retention": 0.2}},
+    {"name": "b", "reach": 1000, "impact": 1, "confidence": 0.8, "effort": 8, "ease": 6,
+     "strategic_alignment": 1, "dependencies": ["a"]},
+    {"name": "c", "reach": 400, "impact": 2, "confidence": 1.0, "effort": 4, "ease": 3,
+     "strategic_scores": {}, "strategic_alignment": 5},
+]
+
+
+def _names(ranked):
+    return [entry["name"] for entry in ranked]
+
+
+def test_records_rank_like_dicts():
+    records = compact(FEATURES)
+    for by in ("rice", "ice"):
+        assert rank_features(records, k=3, by=by) == rank_features(FEATURES, k=3, by=by)
+
+    expected = apply_strategic_weights(FEATURES, WEIGHTS)
+    assert apply_strategic_weights(records, WEIGHTS) == expected
+    # a only beats b through its strategic_scores (168 vs 100)
+    assert _names(expected).index("a") < _names(expected).index("b")
+
+    from_dicts, from_records = StrategicRanker(FEATURES), StrategicRanker(records)
+    assert from_records.set_weights(WEIGHTS) == from_dicts.set_weights(WEIGHTS)
+
+
+def test_store_round_trip_keeps_strategic_scores(tmp_path):
+    store = FeatureStore.from_features(FEATURES)
+    path = str(tmp_path / "backlog.features")
+    store.save(path)
+    with FeatureStore.open(path) as opened:
+        for source in (store, opened):
+            assert [record.to_dict() for record in source] == FEATURES
+            assert source.rank(3, by="ice") == rank_features(FEATURES, k=3, by="ice")
+            assert apply_strategic_weights(list(source), WEIGHTS) == apply_strategic_weights(FEATURES, WEIGHTS)
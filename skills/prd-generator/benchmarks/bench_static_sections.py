@@ -0,0 +1,88 @@
+"""
+Static Section Cache Benchmark
+Compares per-document render cost of the original f-string renderers (a
+frozen copy in baseline_renderers.py) with the section registry, both with
+the static-section cache cleared on every call and with it in use
+
+Usage:
+    python benchmarks/bench_static_sections.py [--iterations N]
+"""
+
+from typing import Any, Callable, Dict
+import argparse
+import json
+import os
+import sys
+import timeit
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SKILL_DIR)
+
+import generate_prd as prd  # noqa: E402
+from baseline_renderers import BaselinePRDGenerator  # noqa: E402
+from generate_prd import PRDGenerator, SECTION_SEPARATOR  # noqa: E402
+from prd_document import blocks_to_markdown  # noqa: E402
+
+
+def render_uncached(generator: PRDGenerator, input_data: Dict[str, Any]) -> str:
+    """Render every registry section from scratch, bypassing the static-section cache."""
+    prd._DATE_FORMAT_CACHE.clear()
+    sections = []
+    for spec in generator.section_registry:
+        if spec["requires"] and not input_data.get(spec["requires"]):
+            continue
+        sections.append(blocks_to_markdown(prd._blocks(getattr(generator, spec["renderer"])(input_data))))
+    return SECTION_SEPARATOR.join(sections)
+
+
+def time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    """Return the best-of-5 mean time per call in microseconds."""
+    best = min(timeit.repeat(func, number=iterations, repeat=5))
+    return best / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000, help="Renders per timing run")
+    args = parser.parse_args()
+    
+    with open(os.path.join(SKILL_DIR, "sample_input.json"), encoding="utf-8") as fp:
+        input_data = json.load(fp)
+    
+    generator = PRDGenerator()
+    baseline = BaselinePRDGenerator()
+    assert render_uncached(generator, input_data) == generator.generate_prd(input_data)
+    
+    before = time_per_call(lambda: baseline.generate_prd(input_data), args.iterations)
+    uncached = time_per_call(lambda: render_uncached(generator, input_data), args.iterations)
+    after = time_per_call(lambda: generator.generate_prd(input_data), args.iterations)
+    
+    print("Per-section render cost (registry, uncached):")
+    for spec in generator.section_registry:
+        if spec["requires"] and not input_data.get(spec["requires"]):
+            continue
+        renderer = getattr(generator, spec["renderer"])
+        
+        def render_section() -> str:
+            prd._DATE_FORMAT_CACHE.clear()
+            return renderer(input_data)
+        
+        cost = time_per_call(render_section, args.iterations)
+        print(f"  {spec['title']:<25} {spec['kind']:<7} {cost:8.2f} µs")
+    
+    print()
+    print("before:   original f-string renderers (frozen copy, prd_version 1.0.0)")
+    print("uncached: current registry renderers with the static-section cache cleared")
+    print("after:    current generate_prd with the static-section cache")
+    print("The frozen renderers predate input validation, localization, tables and the")
+    print("document tree, so their output is not identical to generate_prd's.")
+    print()
+    print(f"Per-document (before):   {before:8.2f} µs")
+    print(f"Per-document (uncached): {uncached:8.2f} µs")
+    print(f"Per-document (after):    {after:8.2f} µs")
+    print(f"Speedup over before:     {before / after:8.2f}x")
+    print(f"Speedup from the cache:  {uncached / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
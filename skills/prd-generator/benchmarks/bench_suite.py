@@ -0,0 +1,337 @@
+"""
+PRD Generation Benchmark Suite
+Measures throughput, per-section latency and peak memory of generate_prd on
+synthetic inputs of increasing size, times a full-size RICE sensitivity run,
+and compares runs to catch regressions
+
+Usage:
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --compare baseline.json --threshold 0.2
+"""
+
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SKILL_DIR)
+
+from generate_prd import PRDGenerator  # noqa: E402
+import rice_sensitivity  # noqa: E402
+
+# Input size profiles: (business goals, success metrics, research bytes, include AI/ML)
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "small": {"goals": 3, "metrics": 3, "research_bytes": 1_000, "ai_ml": False},
+    "small_ai": {"goals": 3, "metrics": 3, "research_bytes": 1_000, "ai_ml": True},
+    "many_goals": {"goals": 500, "metrics": 10, "research_bytes": 10_000, "ai_ml": True},
+    "many_metrics": {"goals": 10, "metrics": 5_000, "research_bytes": 10_000, "ai_ml": True},
+    "large_research": {"goals": 10, "metrics": 10, "research_bytes": 2_000_000, "ai_ml": True},
+}
+
+# Backlog size for the sensitivity timing: features x samples per feature
+SENSITIVITY_FEATURES = 2_000
+SENSITIVITY_SAMPLES = 100_000
+
+# Section timings below this many microseconds are too noisy to compare
+MIN_COMPARABLE_US = 5.0
+
+RESEARCH_SENTENCE = (
+    "Interviewed support agents about their workflow; most reported repetitive "
+    "questions, slow tooling and a need for AI suggestions they can edit. "
+)
+
+
+def synthetic_input(goals: int, metrics: int, research_bytes: int, ai_ml: bool) -> Dict[str, Any]:
+    """
+    Build a realistic-looking PRD input of the requested size.
+    
+    Args:
+        goals: Number of business goals
+        metrics: Number of success metrics
+        research_bytes: Approximate size of each research/competitive text
+        ai_ml: Whether to include ai_ml_requirements
+    
+    Returns:
+        Input dictionary shaped like sample_input.json
+    """
+    research = (RESEARCH_SENTENCE * (research_bytes // len(RESEARCH_SENTENCE) + 1))[:research_bytes]
+    data: Dict[str, Any] = {
+        "feature_name": "Synthetic Benchmark Feature",
+        "problem_statement": "Users spend too long on repetitive work, leading to churn",
+        "target_users": ["Support agents", "Team leads", "Customer success managers"],
+        "business_goals": [f"Improve goal metric {index} by {index % 40 + 5}%" for index in range(goals)],
+        "user_research_summary": research,
+        "competitive_landscape": research,
+        "technical_constraints": ["Response time < 500ms", "GDPR compliant", "Support 10 languages"],
+        "success_metrics": [
+            {
+                "name": f"Metric {index}",
+                "baseline": f"Current: {index}%",
+                "target": f"Target: {index + 5}%",
+                "timeline": "3 months post-launch",
+                "measurement": "Weekly measurement from product analytics",
+            }
+            for index in range(metrics)
+        ],
+        "reach_estimate": 25_000,
+        "impact_estimate": 0.3,
+        "confidence_level": 0.7,
+        "effort_estimate": 6,
+    }
+    if ai_ml:
+        data["ai_ml_requirements"] = {
+            "model_type": "Fine-tuned LLM",
+            "data_requirements": "50K labeled examples",
+            "accuracy_target": "85%",
+            "latency_target": "< 500ms",
+            "throughput_target": "100 predictions/second",
+        }
+    return data
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure_throughput(generator: PRDGenerator, data: Dict[str, Any], min_seconds: float) -> Dict[str, float]:
+    """Render repeatedly for at least min_seconds and report documents per second."""
+    count = 0
+    output_chars = 0
+    started = time.perf_counter()
+    while True:
+        output_chars = len(generator.generate_prd(data))
+        count += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds and count >= 3:
+            break
+    return {
+        "documents": count,
+        "seconds": elapsed,
+        "docs_per_second": count / elapsed,
+        "mean_ms": elapsed / count * 1000,
+        "output_chars": output_chars,
+    }
+
+
+def measure_sections(generator: PRDGenerator, data: Dict[str, Any], samples: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time each section as generate_prd produces it and report latency in microseconds.
+    
+    Static sections are served from the per-process cache, exactly as in a
+    real render, so their latency is the cost of reusing the cached text.
+    """
+    results = {}
+    for requires, renderer, static_text, spec in generator._section_plan():
+        if requires and not data.get(requires):
+            continue
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            if static_text is None:
+                renderer(data)
+            timings.append((time.perf_counter() - started) * 1e6)
+        results[spec["name"]] = {
+            "kind": spec["kind"],
+            "p50_us": percentile(timings, 0.50),
+            "p95_us": percentile(timings, 0.95),
+            "mean_us": statistics.fmean(timings),
+        }
+    return results
+
+
+def synthetic_backlog(features: int) -> List[Dict[str, Any]]:
+    """Build a backlog mixing point estimates and every distribution kind."""
+    backlog = []
+    for index in range(features):
+        backlog.append({
+            "name": f"Feature {index}",
+            "reach": {"low": 500 + index, "high": 5_000 + index * 3},
+            "impact": {"low": 0.5, "mode": 1 + index % 3, "high": 3},
+            "confidence": {"distribution": "normal", "mean": 0.7, "sd": 0.1} if index % 2 else 0.8,
+            "effort": {"low": 1 + index % 4, "high": 8, "distribution": "lognormal"},
+        })
+    return backlog
+
+
+def measure_sensitivity(features: int, samples: int) -> Optional[Dict[str, Any]]:
+    """
+    Time one simulate_rice call over a synthetic backlog.
+    
+    Returns None without NumPy: the pure-Python sampler is not meant for
+    this size and would take hours.
+    """
+    if rice_sensitivity.np is None:
+        return None
+    backlog = synthetic_backlog(features)
+    started = time.perf_counter()
+    rice_sensitivity.simulate_rice(backlog, samples=samples)
+    return {"features": features, "samples": samples, "seconds": time.perf_counter() - started}
+
+
+def measure_peak_memory(generator: PRDGenerator, data: Dict[str, Any]) -> Dict[str, int]:
+    """Report the peak traced allocation while rendering one document."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        generator.generate_prd(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peak - baseline}
+
+
+def run_suite(
+    profiles: List[str],
+    min_seconds: float,
+    samples: int,
+    sensitivity_features: int = SENSITIVITY_FEATURES,
+    sensitivity_samples: int = SENSITIVITY_SAMPLES,
+) -> Dict[str, Any]:
+    """
+    Run every requested profile, then the sensitivity timing.
+    
+    Args:
+        profiles: Names from PROFILES
+        min_seconds: Minimum wall time per throughput measurement
+        samples: Timing samples per section
+        sensitivity_features: Backlog size for the simulate_rice timing (0 skips it)
+        sensitivity_samples: Draws per feature in that timing
+    
+    Returns:
+        Results dictionary ready to be saved as JSON
+    """
+    generator = PRDGenerator()
+    results: Dict[str, Any] = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "prd_version": generator.prd_version,
+        },
+        "profiles": {},
+    }
+    for name in profiles:
+        data = synthetic_input(**PROFILES[name])
+        generator.generate_prd(data)  # warm caches
+        results["profiles"][name] = {
+            "input": PROFILES[name],
+            "throughput": measure_throughput(generator, data, min_seconds),
+            "sections": measure_sections(generator, data, samples),
+            "memory": measure_peak_memory(generator, data),
+        }
+    if sensitivity_features > 0:
+        results["sensitivity"] = measure_sensitivity(sensitivity_features, sensitivity_samples)
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List regressions of current results against a baseline run.
+    
+    Args:
+        current: Results from run_suite
+        baseline: Previously saved results
+        threshold: Allowed relative slowdown or memory growth (0.2 = 20%)
+    
+    Returns:
+        Human-readable regression descriptions (empty when none)
+    """
+    regressions = []
+    for name, result in current["profiles"].items():
+        previous = baseline.get("profiles", {}).get(name)
+        if not previous:
+            continue
+        checks = [
+            ("mean render time", result["throughput"]["mean_ms"], previous["throughput"]["mean_ms"], "ms"),
+            ("peak memory", result["memory"]["peak_bytes"], previous["memory"]["peak_bytes"], "bytes"),
+        ]
+        for section, timing in result["sections"].items():
+            # Sections this fast are dominated by timer noise
+            if section in previous["sections"] and previous["sections"][section]["p50_us"] >= MIN_COMPARABLE_US:
+                checks.append((f"{section} p50", timing["p50_us"], previous["sections"][section]["p50_us"], "µs"))
+        for label, now, before, unit in checks:
+            if before and now > before * (1 + threshold):
+                regressions.append(f"{name}: {label} {before:,.1f} -> {now:,.1f} {unit} (+{now / before - 1:.0%})")
+    
+    sensitivity = current.get("sensitivity")
+    previous = baseline.get("sensitivity")
+    # Only runs of the same size are comparable
+    if sensitivity and previous and (sensitivity["features"], sensitivity["samples"]) == (previous["features"], previous["samples"]):
+        now, before = sensitivity["seconds"], previous["seconds"]
+        if now > before * (1 + threshold):
+            regressions.append(f"sensitivity: simulate_rice {before:,.2f} -> {now:,.2f} s (+{now / before - 1:.0%})")
+    return regressions
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    """Print a compact table of the headline numbers."""
+    print(f"{'Profile':<16} {'docs/s':>10} {'mean ms':>10} {'peak KiB':>10} {'slowest section':>28}")
+    for name, result in results["profiles"].items():
+        sections = result["sections"]
+        slowest = max(sections, key=lambda section: sections[section]["p50_us"])
+        print(
+            f"{name:<16} {result['throughput']['docs_per_second']:>10,.1f} "
+            f"{result['throughput']['mean_ms']:>10.3f} {result['memory']['peak_bytes'] / 1024:>10,.1f} "
+            f"{slowest + ' ' + format(sections[slowest]['p50_us'], ',.1f') + 'µs':>28}"
+        )
+    if "sensitivity" in results:
+        sensitivity = results["sensitivity"]
+        if sensitivity is None:
+            print("\nsimulate_rice: skipped (NumPy is not installed)")
+        else:
+            print(
+                f"\nsimulate_rice: {sensitivity['features']:,} features x {sensitivity['samples']:,} samples "
+                f"in {sensitivity['seconds']:.2f} s"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES), help="Profiles to run")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Minimum time per throughput measurement")
+    parser.add_argument("--samples", type=int, default=50, help="Timing samples per section")
+    parser.add_argument(
+        "--sensitivity-features", type=int, default=SENSITIVITY_FEATURES,
+        help="Backlog size for the simulate_rice timing (0 skips it)",
+    )
+    parser.add_argument(
+        "--sensitivity-samples", type=int, default=SENSITIVITY_SAMPLES, help="Draws per feature in the simulate_rice timing",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression before failing (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    
+    results = run_suite(args.profiles, args.min_seconds, args.samples, args.sensitivity_features, args.sensitivity_samples)
+    print_summary(results)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Markdown Table Benchmark
+Times success-metric tables with 10K rows built by repeated concatenation
+versus the shared join-based table renderer
+
+Usage:
+    python benchmarks/bench_tables.py [--rows N]
+"""
+
+from typing import Any, Dict, List
+import argparse
+import io
+import os
+import sys
+import time
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SKILL_DIR)
+
+from generate_prd import PRDGenerator  # noqa: E402
+from markdown_table import render_table, table_rows, write_table  # noqa: E402
+from prd_locales import DEFAULT_LOCALE, load_catalog  # noqa: E402
+
+METRICS_TABLE_HEADERS = load_catalog(DEFAULT_LOCALE).text("metrics_table_headers")
+METRICS_TABLE_COLUMNS = load_catalog(DEFAULT_LOCALE).text("metrics_table_columns")
+
+
+def synthetic_metrics(count: int) -> List[Dict[str, Any]]:
+    """Build metric rows, some with pipes and line breaks in their cells."""
+    return [
+        {
+            "name": f"Metric {index}" + (" | split" if index % 10 == 0 else ""),
+            "baseline": f"Current: {index}%",
+            "target": f"Target: {index + 5}%",
+            "timeline": "3 months post-launch",
+            "measurement": "Weekly active usage\nper segment" if index % 7 == 0 else "Weekly active usage",
+        }
+        for index in range(count)
+    ]
+
+
+def concatenated_table(metrics: List[Dict[str, Any]]) -> str:
+    """Build the table the way _generate_success_metrics used to (no escaping)."""
+    table = "| Metric | Baseline | Target | Timeline | Measurement Method |\n"
+    table += "|--------|----------|--------|----------|-------------------|\n"
+    for metric in metrics:
+        table += f"| {metric.get('name', 'Metric')} | {metric.get('baseline', 'TBD')} | {metric.get('target', 'TBD')} | {metric.get('timeline', 'TBD')} | {metric.get('measurement', 'TBD')} |\n"
+    return table
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Return the fastest of several runs in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="Metric rows per table")
+    args = parser.parse_args()
+    
+    metrics = synthetic_metrics(args.rows)
+    generator = PRDGenerator()
+    data = {"success_metrics": metrics}
+    
+    rendered = render_table(METRICS_TABLE_HEADERS, table_rows(metrics, METRICS_TABLE_COLUMNS))
+    broken = concatenated_table(metrics)
+    print(f"Rows: {args.rows}")
+    print(f"  Lines emitted (concatenation): {broken.count(chr(10)):>8} (corrupted by unescaped line breaks)")
+    print(f"  Lines emitted (table builder): {rendered.count(chr(10)):>8}")
+    print()
+    print(f"  Concatenation:         {best_of(lambda: concatenated_table(metrics)):8.2f} ms")
+    print(f"  render_table:          {best_of(lambda: render_table(METRICS_TABLE_HEADERS, table_rows(metrics, METRICS_TABLE_COLUMNS))):8.2f} ms")
+    print(f"  write_table (stream):  {best_of(lambda: write_table(io.StringIO(), METRICS_TABLE_HEADERS, table_rows(metrics, METRICS_TABLE_COLUMNS))):8.2f} ms")
+    print(f"  Success Metrics section: {best_of(lambda: generator._generate_success_metrics(data)):6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
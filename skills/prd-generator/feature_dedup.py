@@ -0,0 +1,550 @@
+"""
+Feature Deduplication
+Near-duplicate detection for merged backlogs using word shingles, MinHash
+signatures and LSH banding
+"""
+
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+from array import array
+from functools import lru_cache
+from itertools import islice
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+
+try:  # NumPy is optional; signatures and banding are vectorized with it
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+DEFAULT_TEXT_FIELDS = ("feature_name", "problem_statement")
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+
+_TOKEN = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+# Odd 64-bit multiplier for combining token hashes into shingle hashes
+_SHINGLE_PRIME = 0x100000001B3
+# Items whose signatures are computed together by find_duplicates; bounds
+# the (shingles x permutations) matrix to a few tens of MB
+_SIGNATURE_CHUNK = 1024
+# Candidate pairs verified against their signatures at once
+_VERIFY_CHUNK = 1 << 20
+
+
+@lru_cache(maxsize=1 << 20)
+def _token_hash(token: str) -> int:
+    """Stable 64-bit token hash (never 0, which pads short texts)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little") | 1
+
+
+def feature_text(item: Any, text_fields: Sequence[str] = DEFAULT_TEXT_FIELDS) -> str:
+    """Join the text fields of an item (lists are joined item by item; other values are skipped)."""
+    if not isinstance(item, dict):
+        return ""
+    parts = []
+    for field in text_fields:
+        value = item.get(field)
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, (list, tuple)):
+            parts.extend(part for part in value if isinstance(part, str))
+    return " ".join(parts)
+
+
+def lsh_params(threshold: float, num_perm: int, false_positive_weight: float = 0.1) -> Tuple[int, int]:
+    """
+    Choose (bands, rows) for a Jaccard threshold.
+    
+    Minimizes the weighted false positive and false negative areas under the
+    banding S-curve ``1 - (1 - s**rows)**bands``, as is standard for MinHash LSH.
+    Candidates are verified against their signatures afterwards, so a false
+    positive only costs a comparison and false negatives are weighted more.
+    
+    Returns:
+        (bands, rows) with bands * rows <= num_perm
+    """
+    def area(bands: int, rows: int, low: float, high: float) -> float:
+        steps = 50
+        width = (high - low) / steps
+        return sum(
+            1 - (1 - (low + (step + 0.5) * width) ** rows) ** bands for step in range(steps)
+        ) * width
+    
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = area(bands, rows, 0.0, threshold)
+            false_negative = (1 - threshold) - area(bands, rows, threshold, 1.0)
+            error = false_positive_weight * false_positive + (1 - false_positive_weight) * false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+@lru_cache(maxsize=32)
+def _cached_lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    return lsh_params(threshold, num_perm)
+
+
+def _permutations(num_perm: int, seed: int) -> Tuple[List[int], List[int]]:
+    """Multiply-shift hash parameters: odd 64-bit multipliers and 64-bit offsets."""
+    rng = random.Random(seed)
+    multipliers = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+    offsets = [rng.getrandbits(64) for _ in range(num_perm)]
+    return multipliers, offsets
+
+
+class DedupIndex:
+    """
+    Incremental MinHash/LSH index of backlog items.
+    
+    Each item's text fields are lowercased and split into words, and every
+    run of ``shingle_size`` words is hashed. A MinHash signature of
+    ``num_perm`` values estimates the Jaccard similarity of two items'
+    shingle sets, and LSH banding groups signatures into buckets so that
+    only items sharing a bucket are compared: lookups cost the same however
+    many items are indexed.
+    
+    ``add`` only indexes items that are not near-duplicates of an earlier
+    one, so every match points at the first item of its group. This makes
+    the index usable as a streaming filter in front of batch generation.
+    
+    Example:
+        index = DedupIndex(threshold=0.8)
+        for position, item in enumerate(backlog):
+            original = index.add(item, key=position)
+            if original is not None:
+                print(f"{position} duplicates {original}")
+    """
+    
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = 2,
+        text_fields: Sequence[str] = DEFAULT_TEXT_FIELDS,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity at which items count as duplicates
+            num_perm: MinHash signature length (more is more accurate and slower)
+            shingle_size: Words per shingle
+            text_fields: Item fields compared (strings, or lists of strings)
+            seed: Seed for the MinHash permutations; indexes only agree on
+                signatures when they share it
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm < 1 or shingle_size < 1:
+            raise ValueError("num_perm and shingle_size must be at least 1")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.text_fields = tuple(text_fields)
+        self.seed = seed
+        self.bands, self.rows = _cached_lsh_params(threshold, num_perm)
+        
+        self._multipliers, self._offsets = _permutations(num_perm, seed)
+        if np is not None:
+            self._np_multipliers = np.array(self._multipliers, dtype=np.uint64)
+            self._np_offsets = np.array(self._offsets, dtype=np.uint64)
+        self._buckets: List[Dict[Any, List[int]]] = [{} for _ in range(self.bands)]
+        self._signatures = array("I")
+        self._keys: List[Any] = []
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def signature(self, item: Any) -> Optional[Sequence[int]]:
+        """
+        MinHash signature of an item's text.
+        
+        Returns:
+            num_perm unsigned 32-bit values (a NumPy array when available),
+            or None when the item has no words to compare
+        """
+        hashes = self._shingles(item)
+        if not hashes:
+            return None
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)[:, None] * self._np_multipliers + self._np_offsets
+            return (values.min(axis=0) >> np.uint64(32)).astype(np.uint32)
+        # Taking the minimum before shifting gives the same result: the high
+        # 32 bits are monotonic in the full 64-bit value
+        return [
+            (min((multiplier * shingle + offset) & _MASK64 for shingle in hashes)) >> 32
+            for multiplier, offset in zip(self._multipliers, self._offsets)
+        ]
+    
+    def query(self, item: Any) -> List[Tuple[Any, float]]:
+        """
+        Find indexed items similar to item.
+        
+        Returns:
+            (key, estimated similarity) pairs at or above the threshold, most
+            similar first (ties in insertion order)
+        """
+        signature = self.signature(item)
+        if signature is None:
+            return []
+        return self._matches(signature, self._band_keys(signature))
+    
+    def add(self, item: Any, key: Any = None) -> Optional[Any]:
+        """
+        Index an item unless it duplicates one already indexed.
+        
+        Args:
+            item: Item dictionary
+            key: Identifier returned for later matches (defaults to the
+                number of items indexed so far)
+        
+        Returns:
+            Key of the most similar indexed item when item is a near-duplicate
+            (item is then not indexed), otherwise None
+        """
+        signature = self.signature(item)
+        if signature is None:
+            return None
+        band_keys = self._band_keys(signature)
+        matches = self._matches(signature, band_keys)
+        if matches:
+            return matches[0][0]
+        self._insert(signature, band_keys, key)
+        return None
+    
+    def _link(self, item: Any, key: Any) -> List[Any]:
+        """
+        Index an item whether or not it matches, returning the keys it matches.
+        
+        Only the first and the latest member of each band bucket are compared,
+        as find_duplicates does with NumPy, so both paths group alike.
+        """
+        signature = self.signature(item)
+        if signature is None:
+            return []
+        band_keys = self._band_keys(signature)
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets.get(band_key)
+            if bucket:
+                candidates.update((bucket[0], bucket[-1]))
+        required = self.threshold * self.num_perm
+        linked = [
+            self._keys[position]
+            for position in sorted(candidates)
+            if self._agreement(position, signature) >= required
+        ]
+        self._insert(signature, band_keys, key)
+        return linked
+    
+    def _insert(self, signature: Sequence[int], band_keys: List[Any], key: Any) -> None:
+        position = len(self._keys)
+        self._keys.append(position if key is None else key)
+        if np is not None:
+            self._signatures.frombytes(signature.tobytes())
+        else:
+            self._signatures.extend(signature)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets.get(band_key)
+            if bucket is None:
+                buckets[band_key] = [position]
+            else:
+                bucket.append(position)
+    
+    def _shingles(self, item: Any) -> List[int]:
+        """Hashes of every run of shingle_size words (short texts are zero-padded)."""
+        tokens = [_token_hash(token) for token in _TOKEN.findall(feature_text(item, self.text_fields).lower())]
+        if not tokens:
+            return []
+        size = self.shingle_size
+        if len(tokens) < size:
+            tokens.extend([0] * (size - len(tokens)))
+        shingles = set()
+        for start in range(len(tokens) - size + 1):
+            value = 0
+            for token in tokens[start:start + size]:
+                value = (value * _SHINGLE_PRIME + token) & _MASK64
+            shingles.add(value)
+        return list(shingles)
+    
+    def _band_keys(self, signature: Sequence[int]) -> List[Any]:
+        rows = self.rows
+        if np is not None:
+            raw = signature.tobytes()
+            width = rows * 4
+            return [raw[band * width:(band + 1) * width] for band in range(self.bands)]
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+    
+    def _matches(self, signature: Sequence[int], band_keys: List[Any]) -> List[Tuple[Any, float]]:
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets.get(band_key)
+            if bucket:
+                candidates.update(bucket)
+        if not candidates:
+            return []
+        matches = []
+        for position in sorted(candidates):
+            similarity = self._agreement(position, signature) / self.num_perm
+            if similarity >= self.threshold:
+                matches.append((self._keys[position], similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+    
+    def _agreement(self, position: int, signature: Sequence[int]) -> int:
+        """Number of signature values an indexed item shares with signature."""
+        num_perm = self.num_perm
+        stored = self._signatures[position * num_perm:(position + 1) * num_perm]
+        if np is not None:
+            return int(np.count_nonzero(np.frombuffer(stored, dtype=np.uint32) == signature))
+        return sum(1 for left, right in zip(stored, signature) if left == right)
+
+
+def find_duplicates(
+    items: Iterable[Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = 2,
+    text_fields: Sequence[str] = DEFAULT_TEXT_FIELDS,
+    seed: int = 1,
+) -> Dict[str, Any]:
+    """
+    Group near-duplicate items of a whole backlog.
+    
+    Items are consumed lazily and only their signatures are kept (64 values
+    per item by default, so 500,000 items take about 128 MB). With NumPy,
+    signatures are computed for blocks of items at once and each LSH band
+    is bucketed by sorting its hashes, so the work grows as n log n rather
+    than with the number of pairs. Within a bucket every member is checked
+    against the bucket's first member and its predecessor, which keeps very
+    large buckets of identical text linear. Without NumPy, items are indexed
+    one at a time and compared the same way. Groups are transitive on both
+    paths: if a matches b and b matches c, all three are one group even when
+    a and c do not match.
+    
+    Args:
+        items: Iterable of item dictionaries
+        threshold, num_perm, shingle_size, text_fields, seed: See DedupIndex
+    
+    Returns:
+        Dictionary with:
+            - items: Number of items read
+            - duplicate_of: Per item, the index of the first item of its
+              group, or None for items that are kept
+            - groups: Lists of item indexes, one per group of two or more,
+              ordered by first index
+            - duplicates: Number of items that duplicate an earlier one
+    """
+    index = DedupIndex(threshold, num_perm, shingle_size, text_fields, seed)
+    parent: List[int] = []
+    
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+    
+    def union(first: int, second: int) -> None:
+        first, second = find(first), find(second)
+        if first != second:
+            # The smaller index becomes the root, so it is the group's first item
+            parent[max(first, second)] = min(first, second)
+    
+    if np is None:
+        for position, item in enumerate(items):
+            parent.append(position)
+            for earlier in index._link(item, position):
+                union(earlier, position)
+    else:
+        signatures, has_text = _signature_matrix(index, items)
+        parent.extend(range(len(has_text)))
+        pairs = _candidate_pairs(index, signatures, has_text)
+        for start in range(0, len(pairs), _VERIFY_CHUNK):
+            left, right = pairs[start:start + _VERIFY_CHUNK].T
+            agreement = (signatures[left] == signatures[right]).sum(axis=1)
+            accepted = agreement >= threshold * num_perm
+            for first, second in zip(left[accepted].tolist(), right[accepted].tolist()):
+                union(first, second)
+    
+    duplicate_of: List[Optional[int]] = [None] * len(parent)
+    for position in range(len(parent)):
+        root = find(position)
+        if root != position:
+            duplicate_of[position] = root
+    return _summarize(duplicate_of)
+
+
+def deduplicate(items: Iterable[Any], **options: Any) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Drop near-duplicates from a backlog, keeping the first item of each group.
+    
+    Args:
+        items: Iterable of item dictionaries
+        **options: Passed to find_duplicates
+    
+    Returns:
+        (kept items in input order, find_duplicates report)
+    """
+    items = list(items)
+    report = find_duplicates(items, **options)
+    kept = [item for item, original in zip(items, report["duplicate_of"]) if original is None]
+    return kept, report
+
+
+def _summarize(duplicate_of: List[Optional[int]]) -> Dict[str, Any]:
+    groups: Dict[int, List[int]] = {}
+    for position, original in enumerate(duplicate_of):
+        if original is not None:
+            groups.setdefault(original, [original]).append(position)
+    return {
+        "items": len(duplicate_of),
+        "duplicate_of": duplicate_of,
+        "groups": [groups[first] for first in sorted(groups)],
+        "duplicates": sum(1 for original in duplicate_of if original is not None),
+    }
+
+
+def _signature_matrix(index: DedupIndex, items: Iterable[Any]) -> Tuple[Any, Any]:
+    """Compute signatures block by block; returns (uint32 signatures, has-text mask)."""
+    size = index.shingle_size
+    find_tokens, text_fields = _TOKEN.findall, index.text_fields
+    # Token hashes for this call; a plain dict lookup is much cheaper than
+    # calling the lru_cache-wrapped _token_hash for every token
+    memo: Dict[str, int] = {}
+    blocks, masks = [], []
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, _SIGNATURE_CHUNK))
+        if not chunk:
+            break
+        tokens: List[int] = []
+        lengths_list = []
+        for item in chunk:
+            words = find_tokens(feature_text(item, text_fields).lower())
+            length = len(words)
+            if length:
+                tokens.extend([memo[word] if word in memo else memo.setdefault(word, _token_hash(word)) for word in words])
+                if length < size:
+                    tokens.extend([0] * (size - length))
+                    length = size
+            lengths_list.append(length)
+        lengths = np.array(lengths_list, dtype=np.int64)
+        block = np.full((len(chunk), index.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        present = lengths > 0
+        if present.any():
+            flat = np.array(tokens, dtype=np.uint64)
+            owner = np.repeat(np.arange(len(chunk)), lengths)
+            # Windows of `size` tokens that do not cross item boundaries
+            starts = np.flatnonzero(owner[:len(owner) - size + 1] == owner[size - 1:])
+            shingles = np.zeros(len(starts), dtype=np.uint64)
+            for offset in range(size):
+                shingles *= np.uint64(_SHINGLE_PRIME)
+                shingles += flat[starts + offset]
+            shingle_owner = owner[starts]
+            # Every item with text owns at least one window, in item order
+            boundaries = np.flatnonzero(np.r_[True, shingle_owner[1:] != shingle_owner[:-1]])
+            for perm_start in range(0, index.num_perm, 16):
+                multipliers = index._np_multipliers[perm_start:perm_start + 16]
+                offsets = index._np_offsets[perm_start:perm_start + 16]
+                hashed = shingles[:, None] * multipliers + offsets
+                minima = np.minimum.reduceat(hashed, boundaries, axis=0) >> np.uint64(32)
+                block[shingle_owner[boundaries], perm_start:perm_start + 16] = minima
+        blocks.append(block)
+        masks.append(present)
+    if not blocks:
+        return np.empty((0, index.num_perm), dtype=np.uint32), np.empty(0, dtype=bool)
+    return np.concatenate(blocks), np.concatenate(masks)
+
+
+def _candidate_pairs(index: DedupIndex, signatures: Any, has_text: Any) -> Any:
+    """Unique (earlier, later) candidate pairs from LSH banding, as an (n, 2) array."""
+    positions = np.flatnonzero(has_text)
+    if len(positions) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    found = []
+    for band in range(index.bands):
+        columns = signatures[positions, band * index.rows:(band + 1) * index.rows].astype(np.uint64)
+        keys = np.zeros(len(positions), dtype=np.uint64)
+        for column in range(index.rows):
+            keys *= np.uint64(_SHINGLE_PRIME)
+            keys += columns[:, column]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        same = sorted_keys[1:] == sorted_keys[:-1]
+        if not same.any():
+            continue
+        members = np.flatnonzero(same) + 1
+        # Index of the first member of each member's run
+        run_start = np.where(np.r_[True, ~same], np.arange(len(order)), 0)
+        np.maximum.accumulate(run_start, out=run_start)
+        later = positions[order[members]]
+        found.append(np.stack([positions[order[run_start[members]]], later], axis=1))
+        found.append(np.stack([positions[order[members - 1]], later], axis=1))
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.concatenate(found)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    # Pairs found in several bands are verified once
+    count = np.int64(len(has_text))
+    codes = np.unique(pairs[:, 0] * count + pairs[:, 1])
+    return np.stack([codes // count, codes % count], axis=1)
+
+
+def _iter_jsonl_items(fp: IO[bytes]) -> Iterator[Any]:
+    """Parse non-blank JSON Lines; unparseable lines yield None (never duplicates)."""
+    for raw in fp:
+        if not raw.strip():
+            continue
+        try:
+            yield json.loads(raw)
+        except ValueError:
+            yield None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python feature_dedup.py",
+        description="Drop near-duplicate features from a JSON Lines backlog",
+    )
+    parser.add_argument("input", help="JSON Lines file with one feature per line")
+    parser.add_argument("-o", "--output", required=True, help="JSON Lines file for the kept features")
+    parser.add_argument("--fields", nargs="+", default=list(DEFAULT_TEXT_FIELDS), help="Text fields to compare")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Similarity threshold (0-1)")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM, help="MinHash signature length")
+    parser.add_argument("--report", help="Write the duplicate groups (by line order) as JSON")
+    args = parser.parse_args(argv)
+    
+    try:
+        with open(args.input, "rb") as fp:
+            report = find_duplicates(
+                _iter_jsonl_items(fp), threshold=args.threshold, num_perm=args.num_perm, text_fields=args.fields
+            )
+        # Second pass copies the kept lines verbatim
+        duplicate_of = report["duplicate_of"]
+        position = 0
+        with open(args.input, "rb") as source, open(args.output, "wb") as output:
+            for raw in source:
+                if not raw.strip():
+                    continue
+                if duplicate_of[position] is None:
+                    output.write(raw if raw.endswith(b"\n") else raw + b"\n")
+                position += 1
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as fp:
+                json.dump({"items": report["items"], "duplicates": report["duplicates"], "groups": report["groups"]}, fp)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    
+    print(f"Kept {report['items'] - report['duplicates']:,} of {report['items']:,} items "
+          f"({report['duplicates']:,} near-duplicates in {len(report['groups']):,} groups)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,20 +3,162 @@ PRD Generator - Python Implementation
 Generates comprehensive Product Requirements Documents for AI Product Managers
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Iterator, IO, Callable, Set
+from collections import deque
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import argparse
+import hashlib
 import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+from feature_dedup import DEFAULT_THRESHOLD as DEFAULT_DEDUP_THRESHOLD, DedupIndex
+from input_schema import default_validator
+from markdown_table import table_rows
+from prd_document import PRDDocument, blocks_to_markdown, list_block, paragraph_block, parse_markdown, table_block
+from prd_locales import DEFAULT_LOCALE, MessageCatalog, load_catalog
+from research_extract import RESEARCH_FIELDS, ResearchExtract, condense_reference, format_size, is_reference, reference_stamp, source_link
+from rice_sensitivity import RICE_PARAMETERS, rice_interval
+
+SECTION_SEPARATOR = "\n\n"
+
+# Section kinds used by the section registry
+STATIC_SECTION = "static"          # Output never changes; rendered once per process
+DATE_SECTION = "date"              # Output depends on the render date (and input)
+INPUT_SECTION = "input"            # Output depends only on input_data
+
+
+def _section(name: str, title: str, renderer: str, kind: str, requires: Optional[str] = None) -> Dict[str, Any]:
+    """Build a section registry entry."""
+    return {"name": name, "title": title, "renderer": renderer, "kind": kind, "requires": requires}
+
+
+# Ordered registry of PRD sections. ``requires`` names an input key that must
+# be truthy for the section to be included.
+SECTION_REGISTRY: List[Dict[str, Any]] = [
+    _section("header", "Header", "_generate_header", DATE_SECTION),
+    _section("executive_summary", "Executive Summary", "_generate_executive_summary", INPUT_SECTION),
+    # JTBD Framework
+    _section("problem_statement", "Problem Statement", "_generate_problem_statement", INPUT_SECTION),
+    _section("opportunity_sizing", "Opportunity Sizing", "_generate_opportunity_sizing", INPUT_SECTION),
+    # SMART Framework
+    _section("success_metrics", "Success Metrics", "_generate_success_metrics", INPUT_SECTION),
+    _section("user_stories", "User Stories", "_generate_user_stories", INPUT_SECTION),
+    # MoSCoW
+    _section("functional_requirements", "Functional Requirements", "_generate_functional_requirements", STATIC_SECTION),
+    _section("technical_requirements", "Technical Requirements", "_generate_technical_requirements", INPUT_SECTION),
+    _section("ai_ml_specs", "AI/ML Specifications", "_generate_ai_ml_specs", INPUT_SECTION, requires="ai_ml_requirements"),
+    _section("user_experience", "User Experience", "_generate_ux_section", STATIC_SECTION),
+    _section("risk_assessment", "Risk Assessment", "_generate_risk_assessment", STATIC_SECTION),
+    _section("launch_plan", "Launch Plan", "_generate_launch_plan", STATIC_SECTION),
+    # RACI
+    _section("stakeholder_matrix", "Stakeholder Matrix", "_generate_stakeholder_matrix", STATIC_SECTION),
+    _section("appendix", "Appendix", "_generate_appendix", DATE_SECTION),
+]
+
+# Input schema, compiled once at import and shared by every generator
+_INPUT_VALIDATOR = default_validator()
+
+# Rendered static sections as (blocks, markdown), keyed by (generator class,
+# renderer name, locale)
+_STATIC_SECTION_CACHE: Dict[tuple, tuple] = {}
+
+# Formatted render dates, keyed by (date, strftime format)
+_DATE_FORMAT_CACHE: Dict[tuple, str] = {}
 
 
 class PRDGenerator:
     """
     Generates comprehensive Product Requirements Documents following PM best practices.
     Incorporates JTBD, SMART goals, RICE prioritization, and AI-specific considerations.
+    
+    Sections are rendered in the order given by ``section_registry``. Subclasses
+    that make a static section depend on input must reclassify it there.
+    
+    Section renderers return document blocks (see prd_document); Markdown is
+    serialized from the blocks, so the Markdown, HTML and JSON of a PRD all
+    come from one rendering. A renderer may still return Markdown text, which
+    is then parsed into blocks.
     """
     
-    def __init__(self):
+    section_registry: List[Dict[str, Any]] = SECTION_REGISTRY
+    
+    def __init__(
+        self,
+        clock: Optional[Callable[[], datetime]] = None,
+        validate: bool = True,
+        locale: str = DEFAULT_LOCALE,
+    ):
+        """
+        Args:
+            clock: Callable returning the current datetime, used for the render
+                date in the header and revision history (defaults to datetime.now)
+            validate: Check inputs against input_schema.INPUT_SCHEMA before
+                rendering, raising InputValidationError with every problem found
+            locale: Code of the message catalog headings and boilerplate are
+                rendered from (see prd_locales.available_locales)
+        """
         self.prd_version = "1.0.0"
         self.frameworks = ["JTBD", "SMART", "RICE", "MoSCoW", "RACI"]
+        self.clock = clock or datetime.now
+        self.validate = validate
+        self.locale = locale
+        # Callbacks fired around each section render (see add_section_hook)
+        self.section_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self.trace_allocations = False
+    
+    def add_section_hook(self, hook: Callable[[Dict[str, Any]], None], trace_allocations: bool = False) -> None:
+        """
+        Register a callback that fires after every section is rendered.
+        
+        The hook receives an event dictionary with:
+            - section / title / kind: Registry entry of the section
+            - cached: Whether the section came from the static-section cache
+            - seconds: Wall time spent producing the section
+            - output_chars: Length of the rendered section
+            - allocated_bytes / peak_bytes: tracemalloc deltas, or None when
+              allocation tracing is off
+        
+        With no hooks registered, rendering takes the uninstrumented path, so
+        the cost of leaving this surface in place is one attribute check per
+        document.
+        
+        Args:
+            hook: Callable receiving the event dictionary
+            trace_allocations: Also record tracemalloc allocation deltas
+                (starts tracemalloc if it is not already running)
+        """
+        self.section_hooks.append(hook)
+        if trace_allocations:
+            self.trace_allocations = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+    
+    def remove_section_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """Unregister a hook added with add_section_hook."""
+        self.section_hooks.remove(hook)
+        if not self.section_hooks:
+            self.trace_allocations = False
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Hooks and the resolved plan stay in the process that created them;
+        # batch workers get a plain copy of the generator.
+        state = self.__dict__.copy()
+        state["section_hooks"] = []
+        state["trace_allocations"] = False
+        state.pop("_plan", None)
+        state.pop("_shared_values", None)
+        return state
+    
+    @property
+    def catalog(self) -> MessageCatalog:
+        """Message catalog of the generator's locale (loaded on first use)."""
+        return load_catalog(self.locale)
     
     def generate_prd(self, input_data: Dict[str, Any]) -> str:
         """
@@ -28,541 +170,536 @@ class PRDGenerator:
                 - problem_statement: User problem to solve
                 - target_users: User segments affected
                 - business_goals: List of business objectives
-                - user_research_summary: Optional research insights
-                - competitive_landscape: Optional competitor analysis
+                - user_research_summary: Optional research insights, as text
+                  or as a file reference ({"path": ...}) condensed into key
+                  findings and a link to the file
+                - competitive_landscape: Optional competitor analysis (text or
+                  file reference)
                 - technical_constraints: Optional technical limitations
                 - success_metrics: Optional predefined metrics
                 - ai_ml_requirements: Optional AI/ML specifications
         
         Returns:
             Complete PRD in Markdown format
+        
+        Raises:
+            InputValidationError: If validation is on and the input does not
+                match the schema (raised before anything is rendered)
         """
+        return SECTION_SEPARATOR.join(self.iter_sections(input_data))
+    
+    def iter_sections(self, input_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Render the PRD one section at a time.
+        
+        Each section is produced only when the consumer asks for it, so callers
+        can forward it to a file or socket before the next one is rendered.
+        Joining the yielded sections with SECTION_SEPARATOR gives exactly the
+        document returned by generate_prd.
+        
+        Args:
+            input_data: Feature requirements dictionary (see generate_prd)
+        
+        Yields:
+            Markdown for each PRD section, in document order
+        """
+        if self.validate:
+            _INPUT_VALIDATOR.check(input_data)
+        if self.section_hooks:
+            yield from self._iter_sections_instrumented(input_data)
+            return
+        for requires, renderer, static, _ in self._section_plan():
+            if requires and not input_data.get(requires):
+                continue
+            yield static[1] if static is not None else blocks_to_markdown(_blocks(renderer(input_data)))
+    
+    def _iter_sections_instrumented(self, input_data: Dict[str, Any]) -> Iterator[str]:
+        """Render sections like iter_sections, firing section hooks around each one."""
+        trace = self.trace_allocations and tracemalloc.is_tracing()
+        for requires, renderer, static, spec in self._section_plan():
+            if requires and not input_data.get(requires):
+                continue
+            if trace:
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+            started = time.perf_counter()
+            section = static[1] if static is not None else blocks_to_markdown(_blocks(renderer(input_data)))
+            elapsed = time.perf_counter() - started
+            allocated = peak = None
+            if trace:
+                after, peak_traced = tracemalloc.get_traced_memory()
+                allocated, peak = after - before, peak_traced - before
+            event = {
+                "section": spec["name"],
+                "title": spec["title"],
+                "kind": spec["kind"],
+                "cached": static is not None,
+                "seconds": elapsed,
+                "output_chars": len(section),
+                "allocated_bytes": allocated,
+                "peak_bytes": peak,
+            }
+            for hook in self.section_hooks:
+                hook(event)
+            yield section
+    
+    def _section_plan(self) -> List[tuple]:
+        """
+        Resolve section_registry into (requires, renderer, static, spec) tuples.
+        
+        The plan is built once per generator. Static sections are rendered once
+        per process (shared by all generators of the same class) and stored as
+        (blocks, markdown), so emitting them costs nothing per document;
+        ``static`` is None for the other sections.
+        """
+        plan = self.__dict__.get("_plan")
+        if plan is None or plan[0] is not self.section_registry or plan[1] != self.locale:
+            steps = []
+            for spec in self.section_registry:
+                renderer = getattr(self, spec["renderer"])
+                static = self._static_section(spec) if spec["kind"] == STATIC_SECTION else None
+                steps.append((spec["requires"], renderer, static, spec))
+            plan = (self.section_registry, self.locale, steps)
+            self._plan = plan
+        return plan[2]
+    
+    def _static_section(self, spec: Dict[str, Any]) -> tuple:
+        """Return the per-process (blocks, markdown) rendering of a static section."""
+        key = (type(self), spec["renderer"], self.locale)
+        section = _STATIC_SECTION_CACHE.get(key)
+        if section is None:
+            # Static sections must not read input, so render them without any
+            blocks = _blocks(getattr(self, spec["renderer"])({}))
+            section = _STATIC_SECTION_CACHE[key] = (blocks, blocks_to_markdown(blocks))
+        return section
+    
+    def _format_today(self, fmt: str) -> str:
+        """Format the clock's current date, formatting each (day, format) pair once per process."""
+        today = self.clock().date()
+        key = (today, fmt)
+        formatted = _DATE_FORMAT_CACHE.get(key)
+        if formatted is None:
+            formatted = today.strftime(fmt)
+            _DATE_FORMAT_CACHE[key] = formatted
+        return formatted
+    
+    def write_prd(self, input_data: Dict[str, Any], fp: IO[str], flush: bool = True) -> int:
+        """
+        Stream a PRD to a writable text stream section by section.
+        
+        Only one rendered section is held in memory at a time. With ``flush``
+        enabled the stream is flushed after every section, so readers on the
+        other end of a pipe or socket see output as soon as it is rendered.
+        
+        Args:
+            input_data: Feature requirements dictionary (see generate_prd)
+            fp: Text stream with a ``write`` method (file, StringIO, socket.makefile("w"), ...)
+            flush: Whether to flush ``fp`` after each section
+        
+        Returns:
+            Number of characters written
+        """
+        written = 0
+        for position, section in enumerate(self.iter_sections(input_data)):
+            if position:
+                written += fp.write(SECTION_SEPARATOR) or 0
+            written += fp.write(section) or 0
+            if flush and hasattr(fp, "flush"):
+                fp.flush()
+        return written
+    
+    def build_document(self, input_data: Dict[str, Any]) -> PRDDocument:
+        """
+        Generate the PRD as a document tree of sections, lists and tables.
+        
+        The section renderers emit the blocks directly, and the tree renders
+        to Markdown (identical to generate_prd), HTML or structured JSON, so
+        exporting several formats costs one generation and no parsing. Static
+        sections share their blocks and Markdown across documents.
+        
+        Args:
+            input_data: Feature requirements dictionary (see generate_prd)
+        
+        Returns:
+            PRDDocument for the input
+        """
+        if self.validate:
+            _INPUT_VALIDATOR.check(input_data)
         sections = []
+        for requires, renderer, static, spec in self._section_plan():
+            if requires and not input_data.get(requires):
+                continue
+            blocks, markdown = static if static is not None else (_blocks(renderer(input_data)), None)
+            sections.append({
+                "name": spec["name"],
+                "title": spec["title"],
+                "kind": spec["kind"],
+                "markdown": markdown,
+                "blocks": blocks,
+            })
+        return PRDDocument(input_data["feature_name"], sections, SECTION_SEPARATOR, self.locale)
+    
+    def export(self, input_data: Dict[str, Any], formats: Iterable[str] = ("markdown", "html", "json")) -> Dict[str, str]:
+        """
+        Render one PRD in several formats from a single document tree.
+        
+        Args:
+            input_data: Feature requirements dictionary (see generate_prd)
+            formats: Renderer names registered in prd_document.RENDERERS
+        
+        Returns:
+            Mapping of format name to rendered text
+        """
+        document = self.build_document(input_data)
+        return {fmt: document.render(fmt) for fmt in formats}
+    
+    def generate_localized(self, input_data: Dict[str, Any], locales: Iterable[str]) -> Dict[str, str]:
+        """
+        Render one input into several locales in a single pass.
         
-        # Header
-        sections.append(self._generate_header(input_data))
+        Sections are rendered in document order for every locale in turn.
+        Locale-independent work (validation, the RICE score and its Monte
+        Carlo band, formatted input lists) is done once and shared; only
+        catalog text and the tables that carry it are rendered per locale. Each document is identical
+        to what a generator with that locale returns from generate_prd.
         
-        # Executive Summary
-        sections.append(self._generate_executive_summary(input_data))
+        Args:
+            input_data: Feature requirements dictionary (see generate_prd)
+            locales: Locale codes to render
         
-        # Problem Statement (JTBD Framework)
-        sections.append(self._generate_problem_statement(input_data))
+        Returns:
+            Mapping of locale code to PRD Markdown, in the order given
         
-        # Opportunity Sizing
-        sections.append(self._generate_opportunity_sizing(input_data))
+        Raises:
+            ValueError: If a locale has no catalog (raised before rendering)
+        """
+        codes = list(dict.fromkeys(locales))
+        for code in codes:
+            load_catalog(code)
+        if self.validate:
+            _INPUT_VALIDATOR.check(input_data)
         
-        # Success Metrics (SMART Framework)
-        sections.append(self._generate_success_metrics(input_data))
+        shared: Dict[str, Dict[str, Any]] = {}
+        renders = []
+        for code in codes:
+            # Per-locale views share the values computed by the first locale
+            view = object.__new__(type(self))
+            view.__dict__.update(self.__dict__)
+            view.__dict__.pop("_plan", None)
+            view.locale = code
+            view.validate = False
+            view._shared_values = shared
+            renders.append(view.iter_sections(input_data))
         
-        # User Stories
-        sections.append(self._generate_user_stories(input_data))
+        documents: Dict[str, List[str]] = {code: [] for code in codes}
+        for sections in zip(*renders):
+            for code, section in zip(codes, sections):
+                documents[code].append(section)
+        return {code: SECTION_SEPARATOR.join(sections) for code, sections in documents.items()}
+    
+    def generate_prd_payload(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate a PRD wrapped in the structured payload of expected_output.json.
         
-        # Functional Requirements (MoSCoW)
-        sections.append(self._generate_functional_requirements(input_data))
+        Args:
+            input_data: Feature requirements dictionary (see generate_prd)
         
-        # Technical Requirements
-        sections.append(self._generate_technical_requirements(input_data))
+        Returns:
+            Dictionary with:
+                - prd_document: Complete PRD in Markdown format
+                - metadata: version, date_generated, frameworks_applied,
+                  rice_score and sections_included
+                - key_metrics: Success metrics with baseline, target and improvement
+                - ai_considerations: AI/ML oversight summary (None without
+                  ai_ml_requirements)
+        """
+        document = self.generate_prd(input_data)
+        sections_included = [
+            spec["title"]
+            for requires, _, _, spec in self._section_plan()
+            if spec["name"] != "header" and (not requires or input_data.get(requires))
+        ]
         
-        # AI/ML Specifications (if applicable)
-        if input_data.get("ai_ml_requirements"):
-            sections.append(self._generate_ai_ml_specs(input_data))
+        ai_reqs = input_data.get("ai_ml_requirements")
+        ai_considerations = None
+        if ai_reqs:
+            ai_considerations = {
+                "bias_assessment_required": True,
+                "explainability_level": ai_reqs.get("explainability_level", "medium"),
+                "human_oversight": ai_reqs.get("human_oversight", "Users can override AI decisions"),
+                "fallback_strategy": ai_reqs.get("fallback_strategy", "Fall back to the non-AI experience if the model fails"),
+                "monitoring_required": ai_reqs.get("monitoring_required", [
+                    "Model accuracy",
+                    "Model drift",
+                    "Bias metrics across user segments",
+                ]),
+            }
         
-        # User Experience
-        sections.append(self._generate_ux_section(input_data))
+        return {
+            "prd_document": document,
+            "metadata": {
+                "version": self.prd_version,
+                "date_generated": self._format_today("%Y-%m-%d"),
+                "frameworks_applied": list(self.frameworks),
+                "rice_score": round(self.calculate_rice_score(*self._rice_inputs(input_data)), 1),
+                "sections_included": sections_included,
+            },
+            "key_metrics": [self._summarize_metric(metric) for metric in input_data.get("success_metrics", [])],
+            "ai_considerations": ai_considerations,
+        }
+    
+    def generate_batch(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        workers: Optional[int] = None,
+        output_dir: Optional[str] = None,
+        chunk_size: int = 64,
+        dedup: Optional[DedupIndex] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate PRDs for many inputs, fanning work out across a process pool.
         
-        # Risk Assessment
-        sections.append(self._generate_risk_assessment(input_data))
+        Inputs are consumed lazily in chunks and at most ``2 * workers`` chunks
+        are in flight at once, so arbitrarily long iterables can be processed
+        without materializing them. A failure on one item is recorded in its
+        result and does not stop the batch.
         
-        # Launch Plan
-        sections.append(self._generate_launch_plan(input_data))
+        Args:
+            inputs: Iterable of input dictionaries (same shape as generate_prd)
+            workers: Number of worker processes (defaults to CPU count; 1 runs inline)
+            output_dir: Optional directory to write each PRD to as Markdown.
+                When given, documents are written by the workers and not returned.
+            chunk_size: Number of inputs sent to a worker per task
+            dedup: Optional feature_dedup.DedupIndex; inputs that are
+                near-duplicates of an earlier input are not rendered
         
-        # Stakeholder Matrix (RACI)
-        sections.append(self._generate_stakeholder_matrix(input_data))
+        Returns:
+            One result per input, in input order, with keys:
+                - index: Position of the input in the batch
+                - feature_name: Feature name (None if missing)
+                - status: "ok", "error" or "duplicate"
+                - output_path: Path written (None without output_dir or on error)
+                - prd_document: Markdown PRD (None with output_dir or on error)
+                - error: Error description (None on success)
+                - duplicate_of: Index of the earlier input a duplicate matched (else None)
+        """
+        return list(self.iter_batch(inputs, workers=workers, output_dir=output_dir, chunk_size=chunk_size, dedup=dedup))
+    
+    def iter_batch(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        workers: Optional[int] = None,
+        output_dir: Optional[str] = None,
+        chunk_size: int = 64,
+        start_index: int = 0,
+        dedup: Optional[DedupIndex] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming form of generate_batch that yields results as they complete.
         
-        # Appendix
-        sections.append(self._generate_appendix(input_data))
+        Results are yielded in input order and nothing is retained after it
+        is yielded, so memory stays bounded by the work in flight.
         
-        return "\n\n".join(sections)
+        Args:
+            inputs: Iterable of input dictionaries
+            workers: Number of worker processes (defaults to CPU count; 1 runs inline)
+            output_dir: Optional directory to write each PRD to as Markdown
+            chunk_size: Number of inputs sent to a worker per task
+            start_index: Index of the first input, used in results and output
+                file names (e.g. when resuming a partially processed batch)
+            dedup: Optional feature_dedup.DedupIndex that inputs are added to
+                as they are read; near-duplicates of an earlier input are
+                reported with status "duplicate" instead of being rendered
+        
+        Yields:
+            One result per input (see generate_batch)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        workers = workers or os.cpu_count() or 1
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        chunks = _iter_chunks(inputs, chunk_size, start_index)
+        
+        if workers == 1:
+            for start, chunk in chunks:
+                yield from _render_chunk(self, start, chunk, output_dir, _chunk_duplicates(dedup, start, chunk))
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            pending: deque = deque()
+            for start, chunk in chunks:
+                # Duplicates are found here, in input order, before any work is sent out
+                duplicates = _chunk_duplicates(dedup, start, chunk)
+                pending.append(executor.submit(_render_chunk_in_worker, start, chunk, output_dir, duplicates))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
     
-    def _generate_header(self, data: Dict[str, Any]) -> str:
+    def _localize(
+        self, name: str, values: Callable[[Dict[str, Any]], Dict[str, Any]], data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Render a section's blocks from this generator's catalog.
+        
+        ``values`` computes the locale-independent replacement values of the
+        section. During generate_localized they are computed once per input
+        and shared by every locale.
+        """
+        shared = self.__dict__.get("_shared_values")
+        if shared is None:
+            section_values = values(data)
+        else:
+            section_values = shared.get(name)
+            if section_values is None:
+                section_values = shared[name] = values(data)
+        return self.catalog.render_blocks(name, section_values)
+    
+    def _generate_header(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate PRD header with metadata."""
-        today = datetime.now().strftime("%B %d, %Y")
-        return f"""# PRD: {data['feature_name']}
-
-**Document Version**: {self.prd_version}  
-**Last Updated**: {today}  
-**Status**: Draft  
-**Owner**: [Product Manager Name]  
-**Stakeholders**: [Engineering Lead, Design Lead, Data Science Lead]
-
----
-"""
+        return self._localize("header", self._header_values, data)
+    
+    def _header_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Feature name, document version and the render date (formatted per locale)."""
+        today = self.clock().date()
+        return {
+            "feature_name": data['feature_name'],
+            "version": self.prd_version,
+            "today": lambda catalog: catalog.format_date(today),
+        }
     
-    def _generate_executive_summary(self, data: Dict[str, Any]) -> str:
+    def _generate_executive_summary(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate executive summary section."""
-        return f"""## Executive Summary
-
-### Overview
-{data['feature_name']} addresses the need for {data.get('problem_statement', 'improved user experience')} among {self._format_target_users(data.get('target_users', 'our users'))}.
-
-### Business Goals
-{self._format_list(data.get('business_goals', ['Improve user engagement', 'Drive revenue growth']))}
-
-### Expected Impact
-This feature is expected to reach {data.get('reach_estimate', 'a significant portion')} of our user base and deliver {data.get('impact_estimate', 'meaningful improvements')} in key metrics.
-
-### The Ask
-- **Engineering Resources**: [To be determined based on technical design]
-- **Timeline**: [To be determined after estimation]
-- **Dependencies**: [To be identified during planning]
-"""
+        return self._localize("executive_summary", self._executive_summary_values, data)
+    
+    def _executive_summary_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Input fields shown in the summary, with target users and goals pre-formatted."""
+        values = _given(data, 'feature_name', 'problem_statement', 'reach_estimate', 'impact_estimate')
+        if 'target_users' in data:
+            values['target_users'] = self._format_target_users(data['target_users'])
+        if 'business_goals' in data:
+            values['business_goals'] = self._format_list(data['business_goals'])
+        return values
     
-    def _generate_problem_statement(self, data: Dict[str, Any]) -> str:
+    def _generate_problem_statement(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate problem statement using JTBD framework."""
-        problem = data.get('problem_statement', 'Users need a better way to accomplish their goals')
-        
-        return f"""## Problem Statement
-
-### Jobs-to-be-Done Framework
-
-**When** users need to accomplish their goals,  
-**They want** a solution that {problem},  
-**So they can** achieve better outcomes and satisfaction.
-
-### Current Experience
-Users currently face the following challenges:
-- Friction in current workflow
-- Time-consuming manual processes
-- Lack of intelligent assistance
-- Suboptimal outcomes
-
-### Desired Experience
-With this feature, users will be able to:
-- Accomplish tasks more efficiently
-- Receive intelligent recommendations
-- Make better-informed decisions
-- Achieve superior outcomes
-
-### Why Now?
-- User research indicates strong demand
-- Competitive pressure in the market
-- Technical capabilities now available
-- Strategic alignment with company vision
-"""
+        return self._localize("problem_statement", lambda data: _given(data, 'problem_statement'), data)
     
-    def _generate_opportunity_sizing(self, data: Dict[str, Any]) -> str:
+    def _generate_opportunity_sizing(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate opportunity sizing using TAM/SAM/SOM framework."""
-        reach = data.get('reach_estimate', 10000)
-        impact = data.get('impact_estimate', 0.20)
-        confidence = data.get('confidence_level', 0.80)
-        effort = data.get('effort_estimate', 5)
-        
-        rice_score = self.calculate_rice_score(reach, impact, confidence, effort)
+        return self._localize("opportunity_sizing", self._opportunity_sizing_values, data)
+    
+    def _opportunity_sizing_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """RICE inputs and score, plus the simulated range when rice_ranges is given."""
+        reach, impact, confidence, effort = self._rice_inputs(data)
+        score = f"{self.calculate_rice_score(reach, impact, confidence, effort):.1f}"
+        values = {"reach": reach, "impact": impact, "confidence": confidence, "effort": effort, "rice_score": score}
         
-        return f"""## Opportunity Sizing
-
-### Market Analysis
-- **TAM** (Total Addressable Market): [Total potential users who could benefit]
-- **SAM** (Serviceable Addressable Market): [Users we can realistically reach]
-- **SOM** (Serviceable Obtainable Market): [Users we expect to capture in next 12 months]
-
-### RICE Prioritization Score
-- **Reach**: {reach:,} users affected per quarter
-- **Impact**: {impact:.1%} improvement in key metrics
-- **Confidence**: {confidence:.0%} confidence in estimates
-- **Effort**: {effort} person-months
-
-**RICE Score**: {rice_score:.1f}
-
-### Expected Business Impact
-- **Revenue Impact**: [Projected increase in revenue]
-- **User Growth**: [Expected new user acquisition]
-- **Retention**: [Improvement in retention metrics]
-- **Competitive Position**: [Improvement in market standing]
-"""
+        # Ranged estimates add a Monte Carlo percentile band next to the point score
+        ranges = data.get('rice_ranges')
+        if ranges:
+            points = dict(zip(RICE_PARAMETERS, (reach, impact, confidence, effort)))
+            band = rice_interval(**{name: ranges.get(name, points[name]) for name in RICE_PARAMETERS})
+            values["rice_score"] = lambda catalog: score + catalog.render("rice_range", band)
+        return values
     
-    def _generate_success_metrics(self, data: Dict[str, Any]) -> str:
+    def _generate_success_metrics(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate SMART success metrics."""
-        metrics = data.get('success_metrics', [
-            {
-                'name': 'User Engagement',
-                'baseline': 'Current: X%',
-                'target': 'Target: Y%',
-                'timeline': '3 months post-launch',
-                'measurement': 'Weekly active usage rate'
-            }
-        ])
-        
-        metrics_table = "| Metric | Baseline | Target | Timeline | Measurement Method |\n"
-        metrics_table += "|--------|----------|--------|----------|-------------------|\n"
+        return self._localize("success_metrics", self._success_metrics_values, data)
+    
+    def _success_metrics_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """The metrics table, built per locale since headers and defaults are localized."""
+        metrics = data.get('success_metrics')
         
-        for metric in metrics:
-            metrics_table += f"| {metric.get('name', 'Metric')} | {metric.get('baseline', 'TBD')} | {metric.get('target', 'TBD')} | {metric.get('timeline', 'TBD')} | {metric.get('measurement', 'TBD')} |\n"
+        def metrics_table(catalog: MessageCatalog) -> List[Dict[str, Any]]:
+            rows = table_rows(
+                catalog.text("default_success_metrics") if metrics is None else metrics,
+                catalog.text("metrics_table_columns"),
+            )
+            return [table_block(catalog.text("metrics_table_headers"), rows)]
         
-        return f"""## Success Metrics
-
-### Primary Metrics (North Star)
-The primary metric we're optimizing for is **[Primary Metric Name]** because it best reflects the value delivered to users and the business.
-
-### Key Performance Indicators
-
-{metrics_table}
-
-### Leading vs. Lagging Indicators
-- **Leading Indicators**: Early signals of success (e.g., feature adoption rate)
-- **Lagging Indicators**: Ultimate outcome measures (e.g., retention, revenue)
-
-### Measurement Methodology
-- **Data Collection**: [How data will be captured]
-- **Analysis Cadence**: [How often metrics will be reviewed]
-- **Reporting**: [Who receives metric updates and how often]
-- **Thresholds**: [When to intervene if metrics underperform]
-"""
+        return {"metrics_table": metrics_table}
     
-    def _generate_user_stories(self, data: Dict[str, Any]) -> str:
+    def _generate_user_stories(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate user stories with acceptance criteria."""
-        return f"""## User Stories
-
-### Primary User Flows
-
-#### Story 1: [Core Feature Usage]
-**As a** {self._format_target_users(data.get('target_users', 'user'))},  
-**I want** to access this feature,  
-**So that** I can accomplish my goals more effectively.
-
-**Acceptance Criteria:**
-- ✓ User can discover the feature from [entry point]
-- ✓ User receives clear guidance on how to use the feature
-- ✓ User can complete the primary action within [X] clicks
-- ✓ User receives confirmation of successful completion
-- ✓ User can undo or modify their action if needed
-
-#### Story 2: [Secondary Feature Usage]
-**As a** power user,  
-**I want** advanced capabilities,  
-**So that** I can optimize my workflow.
-
-**Acceptance Criteria:**
-- ✓ Advanced options are available but not overwhelming
-- ✓ User can customize settings to their preferences
-- ✓ User can save and reuse configurations
-- ✓ User receives performance insights
-
-### Edge Cases
-- What happens when [edge case scenario]?
-- How does the system handle [error condition]?
-- What if user has [unusual permissions/data state]?
-"""
+        return self._localize("user_stories", self._user_stories_values, data)
+    
+    def _user_stories_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Target users of the primary story."""
+        if 'target_users' in data:
+            return {"target_users": self._format_target_users(data['target_users'])}
+        return {}
     
-    def _generate_functional_requirements(self, data: Dict[str, Any]) -> str:
+    def _generate_functional_requirements(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate functional requirements using MoSCoW method."""
-        return f"""## Functional Requirements
-
-### Must Have (MVP)
-These features are essential for v1 launch:
-1. **Core Functionality**: [Primary feature capability]
-2. **User Onboarding**: [Introduction and guidance]
-3. **Basic Analytics**: [Usage tracking and feedback]
-4. **Error Handling**: [Graceful degradation]
-5. **Documentation**: [Help content and FAQs]
-
-### Should Have (Post-MVP)
-Important features for v1.1-v1.2:
-1. **Advanced Features**: [Enhanced capabilities]
-2. **Customization**: [User preferences and settings]
-3. **Integrations**: [Connect with other tools]
-4. **Performance Optimization**: [Speed improvements]
-
-### Could Have (Future)
-Nice-to-have features for v2+:
-1. **Premium Features**: [Advanced functionality]
-2. **Collaboration**: [Multi-user capabilities]
-3. **API Access**: [Programmatic interface]
-4. **Mobile Optimization**: [Native mobile experience]
-
-### Won't Have (Out of Scope)
-Explicitly out of scope:
-1. **Feature X**: [Reason for exclusion]
-2. **Feature Y**: [Alternative approach]
-3. **Feature Z**: [Deferred to future version]
-"""
+        return self.catalog.render_blocks("functional_requirements")
     
-    def _generate_technical_requirements(self, data: Dict[str, Any]) -> str:
+    def _generate_technical_requirements(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate technical requirements and constraints."""
-        constraints = data.get('technical_constraints', ['Performance', 'Scalability', 'Security'])
-        
-        return f"""## Technical Requirements
-
-### Architecture
-- **Frontend**: [Technology stack and frameworks]
-- **Backend**: [Services, APIs, databases]
-- **Infrastructure**: [Hosting, CDN, caching]
-- **Third-Party Services**: [External dependencies]
-
-### Performance Requirements
-- **Response Time**: < 200ms for 95th percentile
-- **Throughput**: Support X concurrent users
-- **Availability**: 99.9% uptime SLA
-- **Data Latency**: Real-time updates within 1 second
-
-### Security & Privacy
-- **Authentication**: [How users are authenticated]
-- **Authorization**: [Permission model]
-- **Data Encryption**: [At rest and in transit]
-- **Privacy Compliance**: [GDPR, CCPA considerations]
-- **Audit Logging**: [What actions are logged]
-
-### Technical Constraints
-{self._format_list(constraints)}
-
-### APIs & Integrations
-- **Internal APIs**: [Services required]
-- **External APIs**: [Third-party dependencies]
-- **Webhooks**: [Event notifications]
-- **Data Sync**: [Cross-system consistency]
-
-### Dependencies
-- **Upstream Dependencies**: [What must be completed first]
-- **Downstream Dependencies**: [What depends on this]
-- **Cross-Team Dependencies**: [Other teams involved]
-"""
+        return self._localize("technical_requirements", self._technical_requirements_values, data)
+    
+    def _technical_requirements_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Technical constraints as a bullet list."""
+        if 'technical_constraints' in data:
+            return {"technical_constraints": self._format_list(data['technical_constraints'])}
+        return {}
     
-    def _generate_ai_ml_specs(self, data: Dict[str, Any]) -> str:
+    def _generate_ai_ml_specs(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate AI/ML specifications and ethical considerations."""
-        ai_reqs = data.get('ai_ml_requirements', {})
-        
-        return f"""## AI/ML Specifications
-
-### Model Requirements
-- **Model Type**: {ai_reqs.get('model_type', 'TBD')}
-- **Performance Targets**:
-  - Accuracy: {ai_reqs.get('accuracy_target', '> 90%')}
-  - Latency: {ai_reqs.get('latency_target', '< 100ms')}
-  - Throughput: {ai_reqs.get('throughput_target', 'X predictions/second')}
-
-### Data Requirements
-- **Training Data**: {ai_reqs.get('data_requirements', 'TBD')}
-- **Data Volume**: [Minimum dataset size]
-- **Data Quality**: [Labeling accuracy requirements]
-- **Data Freshness**: [How often to retrain]
-- **Feature Engineering**: [Key features required]
-
-### Bias & Fairness
-- **Demographic Parity**: Model performs equally across user segments
-- **Evaluation Criteria**: Test against protected attributes
-- **Mitigation Strategy**: [How to address identified biases]
-- **Monitoring**: [Ongoing fairness assessment]
-
-### Explainability
-- **User Visibility**: How users understand AI decisions
-- **Feature Importance**: What factors influenced the prediction
-- **Confidence Scores**: When to show uncertainty
-- **Human Override**: When users can override AI
-
-### Model Monitoring
-- **Performance Tracking**: [Metrics to monitor]
-- **Drift Detection**: [When to trigger retraining]
-- **A/B Testing**: [Gradual rollout strategy]
-- **Fallback Behavior**: [What happens if model fails]
-
-### Ethical Considerations
-- **Transparency**: Users know when AI is involved
-- **Consent**: Users can opt-out of AI features
-- **Privacy**: No PII used without explicit consent
-- **Accountability**: Clear ownership of AI decisions
-- **Regulatory Compliance**: [GDPR, AI Act, industry-specific]
-
-### Responsible AI Checklist
-✓ Fairness evaluated across demographics  
-✓ Explainability provided to users  
-✓ Privacy by design implemented  
-✓ Security measures in place  
-✓ Human oversight maintained  
-✓ Feedback mechanisms enabled  
-✓ Documentation complete  
-"""
+        return self._localize("ai_ml_specs", self._ai_ml_specs_values, data)
+    
+    def _ai_ml_specs_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Model and data targets given in ai_ml_requirements."""
+        return _given(
+            data.get('ai_ml_requirements', {}),
+            'model_type', 'accuracy_target', 'latency_target', 'throughput_target', 'data_requirements',
+        )
     
-    def _generate_ux_section(self, data: Dict[str, Any]) -> str:
+    def _generate_ux_section(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate UX requirements section."""
-        return f"""## User Experience
-
-### Key User Flows
-1. **Discovery Flow**: How users find the feature
-   - Entry points: [Navigation, notifications, recommendations]
-   - First-time user experience: [Onboarding flow]
-   
-2. **Core Usage Flow**: Primary interaction pattern
-   - Happy path: [Step-by-step ideal scenario]
-   - Alternative paths: [Different ways to accomplish goal]
-   
-3. **Error Recovery Flow**: Handling failures gracefully
-   - Error prevention: [Input validation]
-   - Error messages: [Clear, actionable guidance]
-   - Recovery options: [How users can resolve issues]
-
-### Design Principles
-- **Simplicity**: Progressive disclosure of complexity
-- **Clarity**: Clear labeling and instructions
-- **Feedback**: Immediate response to user actions
-- **Consistency**: Aligned with design system
-- **Accessibility**: WCAG 2.1 AA compliance
-
-### Mobile Considerations
-- Responsive design for all screen sizes
-- Touch-optimized interactions
-- Offline capability where appropriate
-- Performance on slower networks
-
-### Accessibility Requirements
-- Screen reader compatibility
-- Keyboard navigation support
-- Color contrast compliance
-- Alt text for images
-- Captions for media
-"""
+        return self.catalog.render_blocks("user_experience")
     
-    def _generate_risk_assessment(self, data: Dict[str, Any]) -> str:
+    def _generate_risk_assessment(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate risk assessment with mitigation strategies."""
-        return f"""## Risk Assessment
-
-### Technical Risks
-| Risk | Probability | Impact | Mitigation Strategy |
-|------|-------------|--------|---------------------|
-| Performance degradation | Medium | High | Load testing, incremental rollout |
-| Integration failures | Low | High | Comprehensive testing, fallback plans |
-| Data quality issues | Medium | Medium | Validation rules, monitoring |
-
-### Product Risks
-| Risk | Probability | Impact | Mitigation Strategy |
-|------|-------------|--------|---------------------|
-| Low user adoption | Medium | High | User research, pilot testing |
-| Feature not solving problem | Low | Critical | Prototype validation, feedback loops |
-| Competitive response | High | Medium | Speed to market, unique value props |
-
-### Business Risks
-| Risk | Probability | Impact | Mitigation Strategy |
-|------|-------------|--------|---------------------|
-| Resource constraints | Medium | High | Phased delivery, MVP scope |
-| Market timing | Low | Medium | Competitive analysis, user research |
-| Regulatory changes | Low | High | Legal review, compliance monitoring |
-
-### Rollback Plan
-If critical issues arise post-launch:
-1. **Immediate**: Feature flag to disable for all users
-2. **Within 1 hour**: Root cause analysis and decision to fix or rollback
-3. **Within 24 hours**: Communication to affected users
-4. **Within 1 week**: Resolution or permanent rollback with alternative plan
-"""
+        catalog = self.catalog
+        headers = catalog.text("risk_table_headers")
+        return catalog.render_blocks("risk_assessment", {
+            "technical_risks": [table_block(headers, catalog.text("technical_risks"))],
+            "product_risks": [table_block(headers, catalog.text("product_risks"))],
+            "business_risks": [table_block(headers, catalog.text("business_risks"))],
+        })
     
-    def _generate_launch_plan(self, data: Dict[str, Any]) -> str:
+    def _generate_launch_plan(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate phased launch plan."""
-        return f"""## Launch Plan
-
-### Phase 1: Alpha (Internal)
-- **Audience**: Internal team members (50 users)
-- **Duration**: 2 weeks
-- **Goals**: Validate core functionality, identify major bugs
-- **Success Criteria**: < 5 P0 bugs, > 80% positive feedback
-
-### Phase 2: Beta (Limited)
-- **Audience**: Selected power users (500 users)
-- **Duration**: 4 weeks
-- **Goals**: Validate product-market fit, gather feedback
-- **Success Criteria**: > 60% weekly active users, NPS > 40
-
-### Phase 3: General Availability
-- **Audience**: All eligible users (phased rollout)
-- **Duration**: 4 weeks (25% → 50% → 75% → 100%)
-- **Goals**: Scale safely, monitor metrics
-- **Success Criteria**: Meet all primary KPIs, < 1% error rate
-
-### Go/No-Go Criteria
-Before proceeding to GA:
-- ✓ All P0 and P1 bugs resolved
-- ✓ Performance meets SLAs
-- ✓ Security review approved
-- ✓ Documentation complete
-- ✓ Support team trained
-- ✓ Monitoring and alerting in place
-- ✓ Rollback plan tested
-
-### Communication Plan
-- **T-2 weeks**: Announce to internal stakeholders
-- **T-1 week**: Email to beta users
-- **Launch day**: Blog post, in-app announcement
-- **T+1 week**: Results update to leadership
-- **T+1 month**: Full retrospective
-"""
+        return self.catalog.render_blocks("launch_plan")
     
-    def _generate_stakeholder_matrix(self, data: Dict[str, Any]) -> str:
+    def _generate_stakeholder_matrix(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate RACI matrix for stakeholders."""
-        return f"""## Stakeholder Matrix (RACI)
-
-### Decision Rights
-
-| Decision | Responsible | Accountable | Consulted | Informed |
-|----------|-------------|-------------|-----------|----------|
-| Product vision | PM | CPO | Design, Eng | All stakeholders |
-| Technical approach | Eng Lead | CTO | PM, Design | Product team |
-| Design decisions | Designer | Design Lead | PM, Eng | Stakeholders |
-| Launch timing | PM | CPO | Eng, Marketing | Company |
-| Success metrics | PM | CPO | Data, Eng | Leadership |
-
-### Approval Required From
-- **Product scope**: CPO, VP Engineering
-- **Design**: Design Lead
-- **Technical architecture**: CTO, Principal Engineer
-- **Security & Privacy**: Security Lead, Legal
-- **Go-to-Market**: VP Marketing, VP Sales
-
-### Communication Cadence
-- **Weekly**: PM → Engineering team (standup updates)
-- **Bi-weekly**: PM → Design team (review sessions)
-- **Monthly**: PM → Leadership (progress reports)
-- **Quarterly**: PM → Company (roadmap updates)
-"""
+        catalog = self.catalog
+        return catalog.render_blocks("stakeholder_matrix", {
+            "raci_table": [table_block(catalog.text("raci_table_headers"), catalog.text("raci_decisions"))],
+        })
     
-    def _generate_appendix(self, data: Dict[str, Any]) -> str:
+    def _generate_appendix(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate appendix with additional context."""
-        return f"""## Appendix
-
-### User Research Summary
-{data.get('user_research_summary', 'See separate user research document for detailed findings.')}
-
-### Competitive Landscape
-{data.get('competitive_landscape', 'See competitive analysis document for market positioning.')}
-
-### Alternatives Considered
-1. **Alternative 1**: [Description]
-   - Pros: [Advantages]
-   - Cons: [Disadvantages]
-   - Why not chosen: [Reason]
-
-2. **Alternative 2**: [Description]
-   - Pros: [Advantages]
-   - Cons: [Disadvantages]
-   - Why not chosen: [Reason]
-
-### Open Questions
-- [ ] Question 1: [To be resolved by whom/when]
-- [ ] Question 2: [To be resolved by whom/when]
-- [ ] Question 3: [To be resolved by whom/when]
-
-### References
-- [User Research Report](#)
-- [Competitive Analysis](#)
-- [Technical Design Doc](#)
-- [Design Spec](#)
-
-### Revision History
-| Version | Date | Author | Changes |
-|---------|------|--------|---------|
-| {self.prd_version} | {datetime.now().strftime("%Y-%m-%d")} | PM | Initial draft |
-
----
-
-*This PRD is a living document and will be updated as we learn more through development and user feedback.*
-"""
+        return self._localize("appendix", self._appendix_values, data)
+    
+    def _appendix_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Research and competitive context, and the revision history row."""
+        values = _given(data, *RESEARCH_FIELDS)
+        for key, value in values.items():
+            if is_reference(value):
+                values[key] = _extract_text(condense_reference(value))
+        revision = (self.prd_version, self._format_today("%Y-%m-%d"))
+        values["revision_history"] = lambda catalog: [table_block(
+            catalog.text("revision_table_headers"),
+            [revision + (catalog.text("revision_author"), catalog.text("revision_initial"))],
+        )]
+        return values
     
     @staticmethod
     def calculate_rice_score(reach: int, impact: float, confidence: float, effort: float) -> float:
@@ -582,6 +719,36 @@ Before proceeding to GA:
             return 0.0
         return (reach * impact * confidence) / effort
     
+    @staticmethod
+    def _rice_inputs(data: Dict[str, Any]) -> tuple:
+        """Return (reach, impact, confidence, effort) estimates with their defaults."""
+        return (
+            data.get('reach_estimate', 10000),
+            data.get('impact_estimate', 0.20),
+            data.get('confidence_level', 0.80),
+            data.get('effort_estimate', 5),
+        )
+    
+    @staticmethod
+    def _summarize_metric(metric: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize a success metric as name, baseline, target and relative improvement."""
+        baseline = _strip_metric_label(metric.get('baseline', 'TBD'))
+        target = _strip_metric_label(metric.get('target', 'TBD'))
+        baseline_value = _first_number(baseline)
+        target_value = _first_number(target)
+        if baseline_value is None:
+            improvement = "new metric" if baseline.upper().startswith("N/A") else "TBD"
+        elif target_value is None or baseline_value == 0:
+            improvement = "TBD"
+        else:
+            improvement = f"{abs(target_value - baseline_value) / abs(baseline_value):.0%}"
+        return {
+            'name': metric.get('name', 'Metric'),
+            'baseline': baseline,
+            'target': target,
+            'improvement': improvement,
+        }
+    
     @staticmethod
     def _format_target_users(users: Any) -> str:
         """Format target users for display."""
@@ -590,9 +757,262 @@ Before proceeding to GA:
         return str(users)
     
     @staticmethod
-    def _format_list(items: List[str]) -> str:
-        """Format list items as markdown bullets."""
-        return "\n".join(f"- {item}" for item in items)
+    def _format_list(items: List[str]) -> List[Dict[str, Any]]:
+        """Format list items as a bullet list block."""
+        return [list_block(items)]
+
+
+def _blocks(section: Any) -> List[Dict[str, Any]]:
+    """Blocks returned by a section renderer (Markdown text from older renderers is parsed)."""
+    return parse_markdown(section) if isinstance(section, str) else section
+
+
+def _given(data: Dict[str, Any], *keys: str) -> Dict[str, Any]:
+    """Pick the keys present in the input; the catalog supplies defaults for the rest."""
+    return {key: data[key] for key in keys if key in data}
+
+
+def _extract_text(extract: ResearchExtract) -> Callable[[MessageCatalog], List[Dict[str, Any]]]:
+    """Appendix blocks for a condensed research file: findings, themes and source link."""
+    def render(catalog: MessageCatalog) -> List[Dict[str, Any]]:
+        if extract.findings:
+            blocks = [list_block(extract.findings)]
+        else:
+            blocks = [paragraph_block(catalog.render("research_empty"))]
+        if extract.themes:
+            blocks.append(paragraph_block(catalog.render("research_themes", {"themes": ", ".join(extract.themes)})))
+        blocks.append(paragraph_block(catalog.render("research_source", {
+            "source_name": os.path.basename(extract.path),
+            "source_link": source_link(extract.path),
+            "source_size": format_size(extract.size),
+            "sentences": extract.sentences,
+        })))
+        return blocks
+    return render
+
+
+def _strip_metric_label(value: Any) -> str:
+    """Drop "Current:"/"Target:" prefixes and parenthetical notes from a metric value."""
+    text = re.sub(r"^\s*(current|target|baseline)\s*:\s*", "", str(value), flags=re.IGNORECASE)
+    return re.sub(r"\s*\(.*\)\s*$", "", text).strip()
+
+
+def _first_number(text: str) -> Optional[float]:
+    """Return the first number in a string, or None."""
+    match = re.search(r"-?\d+(?:\.\d+)?", text.replace(",", ""))
+    return float(match.group()) if match else None
+
+
+class _ReadTracker(dict):
+    """Dictionary that records which keys a section renderer looks up."""
+    
+    def __init__(self, data: Dict[str, Any]):
+        super().__init__(data)
+        self.keys_read: Set[str] = set()
+    
+    def __getitem__(self, key):
+        self.keys_read.add(key)
+        return super().__getitem__(key)
+    
+    def get(self, key, default=None):
+        self.keys_read.add(key)
+        return super().get(key, default)
+    
+    def __contains__(self, key):
+        self.keys_read.add(key)
+        return super().__contains__(key)
+
+
+_MISSING = "<missing>"
+
+
+def _fingerprint(input_data: Dict[str, Any], keys: Iterable[str], stamp: Optional[str] = None) -> str:
+    """Hash the values (or absence) of the given input keys, plus an optional render stamp."""
+    digest = hashlib.blake2b(digest_size=16)
+    for key in sorted(keys):
+        value = reference_stamp(input_data[key]) if key in input_data else _MISSING
+        digest.update(json.dumps([key, value], sort_keys=True, default=repr).encode("utf-8"))
+    if stamp is not None:
+        digest.update(stamp.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class IncrementalPRD:
+    """
+    Re-renders only the PRD sections whose inputs changed since the last render.
+    
+    Every section renderer runs against a dictionary that records the input
+    keys it reads. Those keys are fingerprinted (together with the render date
+    and document version for date-dependent sections) and the rendered text
+    is kept. On the next render a section is reused when its fingerprint is
+    unchanged.
+    
+    For deterministic output across days, give the generator a fixed clock.
+    """
+    
+    def __init__(self, generator: Optional[PRDGenerator] = None):
+        """
+        Args:
+            generator: Generator to render with (defaults to a new PRDGenerator)
+        """
+        self.generator = generator or PRDGenerator()
+        # section name -> (keys read, fingerprint, rendered text)
+        self._sections: Dict[str, tuple] = {}
+    
+    def render(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Render the PRD, re-rendering only sections whose inputs changed.
+        
+        Args:
+            input_data: Feature requirements dictionary (see PRDGenerator.generate_prd)
+        
+        Returns:
+            Dictionary with:
+                - prd_document: Complete PRD in Markdown format
+                - changes: List of {"section", "title", "change"} entries where
+                  change is "added", "modified" or "removed"
+                - rendered: Names of sections that were re-rendered
+                - reused: Names of sections reused from the previous render
+        """
+        if self.generator.validate:
+            _INPUT_VALIDATOR.check(input_data)
+        # Date-dependent sections also show the document version
+        render_stamp = f"{self.generator.clock().date().isoformat()}|{self.generator.prd_version}"
+        previous = self._sections
+        current: Dict[str, tuple] = {}
+        sections, changes, rendered, reused = [], [], [], []
+        
+        for requires, renderer, static, spec in self.generator._section_plan():
+            name = spec["name"]
+            if requires and not input_data.get(requires):
+                if name in previous:
+                    changes.append({"section": name, "title": spec["title"], "change": "removed"})
+                continue
+            
+            stamp = render_stamp if spec["kind"] == DATE_SECTION else None
+            cached = previous.get(name)
+            if static is not None:
+                entry = cached or ((), "", static[1])
+            elif cached is not None and _fingerprint(input_data, cached[0], stamp) == cached[1]:
+                entry = cached
+            else:
+                tracker = _ReadTracker(input_data)
+                text = blocks_to_markdown(_blocks(renderer(tracker)))
+                keys = tuple(sorted(tracker.keys_read))
+                entry = (keys, _fingerprint(input_data, keys, stamp), text)
+            
+            if entry is cached:
+                reused.append(name)
+            else:
+                rendered.append(name)
+                if cached is None:
+                    changes.append({"section": name, "title": spec["title"], "change": "added"})
+                elif entry[2] != cached[2]:
+                    changes.append({"section": name, "title": spec["title"], "change": "modified"})
+            current[name] = entry
+            sections.append(entry[2])
+        
+        self._sections = current
+        return {
+            "prd_document": SECTION_SEPARATOR.join(sections),
+            "changes": changes,
+            "rendered": rendered,
+            "reused": reused,
+        }
+
+
+# Batch helpers (module level so they can be pickled into worker processes)
+_worker_generator: Optional[PRDGenerator] = None
+
+
+def _init_worker(generator: PRDGenerator) -> None:
+    """Install the generator each worker process renders with."""
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _render_chunk_in_worker(
+    start: int, chunk: List[Dict[str, Any]], output_dir: Optional[str], duplicates: Optional[Dict[int, int]] = None
+) -> List[Dict[str, Any]]:
+    """Render a chunk with the generator installed by _init_worker."""
+    return _render_chunk(_worker_generator, start, chunk, output_dir, duplicates)
+
+
+def _iter_chunks(inputs: Iterable[Dict[str, Any]], chunk_size: int, start: int = 0) -> Iterator[tuple]:
+    """Yield (start_index, chunk) pairs from an iterable without materializing it."""
+    iterator = iter(inputs)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _chunk_duplicates(dedup: Optional[DedupIndex], start: int, chunk: List[Dict[str, Any]]) -> Optional[Dict[int, int]]:
+    """Add a chunk to a dedup index; returns {index: earlier index} for its near-duplicates."""
+    if dedup is None:
+        return None
+    duplicates = {}
+    for offset, input_data in enumerate(chunk):
+        if isinstance(input_data, dict):
+            original = dedup.add(input_data, key=start + offset)
+            if original is not None:
+                duplicates[start + offset] = original
+    return duplicates
+
+
+def _render_chunk(
+    generator: PRDGenerator,
+    start: int,
+    chunk: List[Dict[str, Any]],
+    output_dir: Optional[str],
+    duplicates: Optional[Dict[int, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Render every item of a chunk, capturing per-item errors and skipping known duplicates."""
+    results = []
+    for offset, input_data in enumerate(chunk):
+        index = start + offset
+        feature_name = input_data.get("feature_name") if isinstance(input_data, dict) else None
+        result = {
+            "index": index,
+            "feature_name": feature_name,
+            "status": "ok",
+            "output_path": None,
+            "prd_document": None,
+            "error": None,
+            "duplicate_of": None,
+        }
+        if duplicates and index in duplicates:
+            result["status"] = "duplicate"
+            result["duplicate_of"] = duplicates[index]
+            results.append(result)
+            continue
+        path = os.path.join(output_dir, _output_filename(index, feature_name)) if output_dir else None
+        try:
+            if path:
+                with open(path, "w", encoding="utf-8") as fp:
+                    generator.write_prd(input_data, fp, flush=False)
+                result["output_path"] = path
+            else:
+                result["prd_document"] = generator.generate_prd(input_data)
+        except Exception as exc:
+            result["status"] = "error"
+            result["error"] = f"{type(exc).__name__}: {exc}"
+            # Don't leave a half-streamed document behind
+            if path and os.path.exists(path):
+                os.remove(path)
+        results.append(result)
+    return results
+
+
+def _output_filename(index: int, feature_name: Optional[str]) -> str:
+    """Build a stable, filesystem-safe file name for a batch item."""
+    slug = re.sub(r"[^a-z0-9]+", "-", str(feature_name or "prd").lower()).strip("-")[:60]
+    return f"{index:06d}-{slug or 'prd'}.md"
+
+
+_default_generator: Optional[PRDGenerator] = None
 
 
 # Helper function for easy invocation
@@ -606,5 +1026,333 @@ def generate_prd(input_data: Dict[str, Any]) -> str:
     Returns:
         Complete PRD in Markdown format
     """
-    generator = PRDGenerator()
-    return generator.generate_prd(input_data)
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = PRDGenerator()
+    return _default_generator.generate_prd(input_data)
+
+
+def generate_localized(input_data: Dict[str, Any], locales: Iterable[str]) -> Dict[str, str]:
+    """
+    Convenience function to render one PRD in several locales in a single pass.
+    
+    Args:
+        input_data: Feature requirements dictionary
+        locales: Locale codes (see prd_locales.available_locales)
+    
+    Returns:
+        Mapping of locale code to PRD Markdown
+    """
+    return PRDGenerator().generate_localized(input_data, locales)
+
+
+def generate_batch(
+    inputs: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    output_dir: Optional[str] = None,
+    chunk_size: int = 64,
+    dedup: Optional[DedupIndex] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Convenience function to generate PRDs for many inputs in parallel.
+    
+    Args:
+        inputs: Iterable of feature requirements dictionaries
+        workers: Number of worker processes (defaults to CPU count)
+        output_dir: Optional directory to write each PRD to
+        chunk_size: Number of inputs sent to a worker per task
+        dedup: Optional feature_dedup.DedupIndex to skip near-duplicate inputs
+    
+    Returns:
+        Per-item results in input order (see PRDGenerator.generate_batch)
+    """
+    return PRDGenerator().generate_batch(
+        inputs, workers=workers, output_dir=output_dir, chunk_size=chunk_size, dedup=dedup
+    )
+
+
+# Command-line rendering of JSON Lines input with resumable checkpoints
+MANIFEST_FILENAME = "manifest.jsonl"
+CHECKPOINT_FILENAME = ".checkpoint.json"
+
+
+def render_jsonl(
+    input_path: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    checkpoint_every: int = 500,
+    restart: bool = False,
+    generator: Optional[PRDGenerator] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    dedup_threshold: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Render every feature in a JSON Lines file to Markdown, resuming where a previous run stopped.
+    
+    The input is read one line at a time and results are appended to
+    ``manifest.jsonl`` in the output directory as they complete, so memory
+    use does not grow with the size of the file. Every ``checkpoint_every``
+    items (and on exit, including Ctrl-C) the byte offset of the last
+    finished line is saved to ``.checkpoint.json``; the next run seeks
+    straight to it and trims any manifest lines written after it.
+    
+    Args:
+        input_path: JSON Lines file with one input dictionary per line
+        output_dir: Directory for the Markdown files, manifest and checkpoint
+        workers: Number of worker processes (defaults to CPU count; 1 runs inline)
+        chunk_size: Number of inputs sent to a worker per task
+        checkpoint_every: Items between checkpoints
+        restart: Ignore any existing checkpoint and start from the first line
+        generator: Generator to render with (defaults to a new PRDGenerator)
+        progress: Optional callback receiving the checkpoint state after each save
+        dedup_threshold: Skip inputs whose feature_name and problem_statement
+            are near-duplicates (estimated Jaccard similarity at or above this)
+            of an earlier input; see feature_dedup.DedupIndex. A resumed run
+            re-reads the lines before the checkpoint to rebuild the index.
+    
+    Returns:
+        Dictionary with processed (items handled by this call), ok, failed and
+        duplicates (totals across runs), resumed_from (first index of this
+        call) and the manifest and checkpoint paths
+    
+    Raises:
+        ValueError: If the checkpoint belongs to a different or modified input
+            file, or was written with a different dedup_threshold
+    """
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be at least 1")
+    generator = generator or PRDGenerator()
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    source = os.path.abspath(input_path)
+    
+    state = None if restart else _load_checkpoint(checkpoint_path)
+    if state is None:
+        state = {
+            "input": source,
+            "offset": 0,
+            "line": 0,
+            "next_index": 0,
+            "manifest_offset": 0,
+            "last_line_digest": None,
+            "last_line_length": 0,
+            "ok": 0,
+            "failed": 0,
+            "duplicates": 0,
+            "dedup_threshold": dedup_threshold,
+        }
+    elif state.get("input") != source:
+        raise ValueError(f"{checkpoint_path} was written for {state.get('input')}; start over with --restart")
+    elif state.get("dedup_threshold") != dedup_threshold:
+        raise ValueError(f"{checkpoint_path} was written with a different dedup threshold; start over with --restart")
+    resumed_from = state["next_index"]
+    dedup = DedupIndex(threshold=dedup_threshold) if dedup_threshold is not None else None
+    processed = 0
+    positions: deque = deque()
+    
+    with open(input_path, "rb") as source_fp, open(manifest_path, "ab") as manifest:
+        _verify_resume_point(source_fp, state)
+        if dedup is not None and state["offset"]:
+            _replay_dedup(source_fp, state["offset"], dedup)
+        source_fp.seek(state["offset"])
+        # Drop manifest entries written after the last checkpoint
+        manifest.truncate(state["manifest_offset"])
+        manifest.seek(0, os.SEEK_END)
+        
+        items = _iter_jsonl(source_fp, state["line"], positions)
+        try:
+            for result in generator.iter_batch(
+                items,
+                workers=workers,
+                output_dir=output_dir,
+                chunk_size=chunk_size,
+                start_index=resumed_from,
+                dedup=dedup,
+            ):
+                line_number, offset, length, digest, parse_error = positions.popleft()
+                if parse_error:
+                    result["status"] = "error"
+                    result["error"] = parse_error
+                entry = {
+                    "index": result["index"],
+                    "line": line_number,
+                    "feature_name": result["feature_name"],
+                    "status": result["status"],
+                    "output_path": result["output_path"],
+                    "error": result["error"],
+                    "duplicate_of": result["duplicate_of"],
+                }
+                manifest.write(json.dumps(entry).encode("utf-8") + b"\n")
+                if result["status"] == "duplicate":
+                    state["duplicates"] = state.get("duplicates", 0) + 1
+                else:
+                    state["ok" if result["status"] == "ok" else "failed"] += 1
+                state.update(
+                    offset=offset,
+                    line=line_number,
+                    next_index=result["index"] + 1,
+                    last_line_digest=digest,
+                    last_line_length=length,
+                )
+                processed += 1
+                if processed % checkpoint_every == 0:
+                    _save_checkpoint(checkpoint_path, manifest, state)
+                    if progress:
+                        progress(dict(state))
+        finally:
+            _save_checkpoint(checkpoint_path, manifest, state)
+    
+    return {
+        "processed": processed,
+        "ok": state["ok"],
+        "failed": state["failed"],
+        "duplicates": state.get("duplicates", 0),
+        "resumed_from": resumed_from,
+        "manifest": manifest_path,
+        "checkpoint": checkpoint_path,
+    }
+
+
+def _iter_jsonl(fp: IO[bytes], line_number: int, positions: deque) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Lazily parse JSON Lines from a binary stream positioned at a line start.
+    
+    For every item yielded, appends (line number, end offset, line length,
+    line digest, parse error) to ``positions``; lines that are not a JSON
+    object yield None with the error recorded. Blank lines are skipped.
+    """
+    offset = fp.tell()
+    for raw in fp:
+        line_number += 1
+        offset += len(raw)
+        if not raw.strip():
+            continue
+        item, error = None, None
+        try:
+            item = json.loads(raw)
+        except ValueError as exc:
+            error = f"Invalid JSON on line {line_number}: {exc}"
+        if error is None and not isinstance(item, dict):
+            item, error = None, f"Line {line_number} is not a JSON object"
+        positions.append((line_number, offset, len(raw), hashlib.blake2b(raw, digest_size=16).hexdigest(), error))
+        yield item
+
+
+def _replay_dedup(fp: IO[bytes], end: int, dedup: DedupIndex) -> None:
+    """Rebuild a dedup index from the lines before a checkpoint, as the interrupted run saw them."""
+    fp.seek(0)
+    positions: deque = deque(maxlen=1)
+    for index, item in enumerate(_iter_jsonl(fp, 0, positions)):
+        if isinstance(item, dict):
+            dedup.add(item, key=index)
+        if positions[-1][1] >= end:
+            break
+
+
+def _verify_resume_point(fp: IO[bytes], state: Dict[str, Any]) -> None:
+    """Check that the last checkpointed line is still where the checkpoint says it is."""
+    if not state["last_line_digest"]:
+        return
+    fp.seek(state["offset"] - state["last_line_length"])
+    raw = fp.read(state["last_line_length"])
+    if hashlib.blake2b(raw, digest_size=16).hexdigest() != state["last_line_digest"]:
+        raise ValueError(f"{state['input']} changed since the last checkpoint; start over with --restart")
+
+
+def _load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """Read a checkpoint file, or return None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        return None
+
+
+def _save_checkpoint(path: str, manifest: IO[bytes], state: Dict[str, Any]) -> None:
+    """Flush the manifest, then atomically replace the checkpoint file."""
+    manifest.flush()
+    os.fsync(manifest.fileno())
+    state["manifest_offset"] = manifest.tell()
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as fp:
+        json.dump(state, fp)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(temp_path, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m generate_prd",
+        description="Render a PRD for every feature in a JSON Lines file",
+    )
+    parser.add_argument("input", help="JSON Lines file with one feature input per line")
+    parser.add_argument("-o", "--output-dir", help="Directory for PRDs, manifest and checkpoint")
+    parser.add_argument("--validate-only", action="store_true", help="Check every line against the input schema and exit")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Inputs sent to a worker per task")
+    parser.add_argument("--checkpoint-every", type=int, default=500, help="Items between checkpoints")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start from the first line")
+    parser.add_argument(
+        "--dedup", type=float, nargs="?", const=DEFAULT_DEDUP_THRESHOLD, default=None, metavar="THRESHOLD",
+        help=f"Skip near-duplicate features (similarity threshold, default {DEFAULT_DEDUP_THRESHOLD})",
+    )
+    args = parser.parse_args(argv)
+    
+    if args.validate_only:
+        return _validate_jsonl_command(args.input)
+    if not args.output_dir:
+        parser.error("--output-dir is required unless --validate-only is given")
+    
+    def report(state: Dict[str, Any]) -> None:
+        print(f"Checkpoint: {state['next_index']:,} items through line {state['line']:,} ({state['failed']:,} failed)", file=sys.stderr)
+    
+    try:
+        summary = render_jsonl(
+            args.input,
+            args.output_dir,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            checkpoint_every=args.checkpoint_every,
+            restart=args.restart,
+            progress=report,
+            dedup_threshold=args.dedup,
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    
+    if summary["resumed_from"]:
+        print(f"Resumed at item {summary['resumed_from']:,}")
+    print(f"Rendered {summary['processed']:,} items; {summary['ok']:,} ok, {summary['failed']:,} failed in total")
+    if summary["duplicates"]:
+        print(f"Skipped {summary['duplicates']:,} near-duplicates")
+    print(f"Manifest: {summary['manifest']}")
+    return 1 if summary["failed"] else 0
+
+
+def _validate_jsonl_command(input_path: str) -> int:
+    """Print schema errors for every invalid line of a JSON Lines file."""
+    items = invalid = 0
+    try:
+        with open(input_path, encoding="utf-8") as fp:
+            for line_number, errors in _INPUT_VALIDATOR.iter_jsonl(fp):
+                items += 1
+                if errors:
+                    invalid += 1
+                    for error in errors:
+                        print(f"line {line_number}: {error['path'] or 'input'}: {error['message']}")
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    print(f"Validated {items:,} items; {items - invalid:,} valid, {invalid:,} invalid", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
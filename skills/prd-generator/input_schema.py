@@ -0,0 +1,430 @@
+"""
+PRD Input Schema
+Validates PRD inputs against the documented fields before any rendering
+"""
+
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple
+import json
+
+from research_extract import reference_error
+from rice_sensitivity import parse_distribution
+
+
+def _distribution_error(value: Any) -> Optional[str]:
+    """Why an estimate cannot be simulated, or None if parse_distribution accepts it."""
+    try:
+        parse_distribution(value, "estimate")
+    except ValueError as exc:
+        return str(exc).split(": ", 1)[-1]
+    return None
+
+
+# Declarative description of the documented input fields (see SKILL.md).
+# Fields not listed here are allowed and ignored by validation. A "validate"
+# entry is a function returning an error message (or None) for values that
+# already have the right type.
+_TEXT = {"type": ["string", "number"]}
+# A point estimate, a [low, high] / [low, mode, high] range or a distribution object
+_ESTIMATE = {"type": ["number", "array", "object"], "validate": _distribution_error}
+# Inline text or a reference to a (possibly very large) file to condense
+_RESEARCH = {
+    "type": ["string", "object"],
+    "validate": reference_error,
+    "properties": {
+        "path": {"type": "string", "required": True, "min_length": 1},
+        "max_sentences": {"type": "integer", "minimum": 1},
+    },
+}
+
+INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "feature_name": {"type": "string", "required": True, "min_length": 1},
+        "problem_statement": {"type": "string"},
+        "target_users": {"type": ["string", "array"], "items": {"type": "string"}},
+        "business_goals": {"type": "array", "items": _TEXT},
+        "user_research_summary": _RESEARCH,
+        "competitive_landscape": _RESEARCH,
+        "technical_constraints": {"type": "array", "items": _TEXT},
+        "success_metrics": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": _TEXT,
+                    "baseline": _TEXT,
+                    "target": _TEXT,
+                    "timeline": _TEXT,
+                    "measurement": _TEXT,
+                },
+            },
+        },
+        "ai_ml_requirements": {
+            "type": "object",
+            "properties": {
+                "model_type": _TEXT,
+                "data_requirements": _TEXT,
+                "accuracy_target": _TEXT,
+                "latency_target": _TEXT,
+                "throughput_target": _TEXT,
+                "performance_targets": {"type": "object"},
+            },
+        },
+        "reach_estimate": {"type": "number", "minimum": 0},
+        "impact_estimate": {"type": "number", "minimum": 0},
+        "confidence_level": {"type": "number", "minimum": 0, "maximum": 1},
+        "effort_estimate": {"type": "number", "minimum": 0},
+        "rice_ranges": {
+            "type": "object",
+            "properties": {
+                "reach": _ESTIMATE,
+                "impact": _ESTIMATE,
+                "confidence": _ESTIMATE,
+                "effort": _ESTIMATE,
+            },
+        },
+    },
+}
+
+_PYTHON_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "array": (list, tuple),
+    "object": (dict,),
+}
+
+_MISSING = object()
+
+# Checker signature: (value, path, errors) -> None, appending to errors
+Checker = Callable[[Any, str, List[Dict[str, str]]], None]
+
+
+class InputValidationError(ValueError):
+    """Raised when a PRD input does not match the schema; carries every error found."""
+    
+    def __init__(self, errors: List[Dict[str, str]]):
+        self.errors = errors
+        details = "; ".join(f"{error['path'] or 'input'}: {error['message']}" for error in errors)
+        noun = "error" if len(errors) == 1 else "errors"
+        super().__init__(f"{len(errors)} input {noun}: {details}")
+
+
+class InputValidator:
+    """
+    Schema validator compiled once into nested checking closures.
+    
+    Compilation resolves types, bounds and nested properties up front, so
+    validating an item is a walk over plain Python checks with no schema
+    interpretation. Every error in an item is collected, not just the first.
+    
+    Example:
+        validator = InputValidator()
+        errors = validator.errors({"reach_estimate": "lots"})
+        # [{"path": "feature_name", "message": "is required"},
+        #  {"path": "reach_estimate", "message": "must be a number (got string)"}]
+    """
+    
+    def __init__(self, schema: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            schema: Schema in the INPUT_SCHEMA format (defaults to INPUT_SCHEMA)
+        """
+        self.schema = schema or INPUT_SCHEMA
+        # Valid inputs only pay for the cheap boolean pass; error paths and
+        # messages are built by the full pass once something is wrong
+        self._is_valid = _compile_fast(self.schema)
+        self._check = _compile(self.schema)
+    
+    def errors(self, input_data: Any) -> List[Dict[str, str]]:
+        """
+        Validate one input.
+        
+        Args:
+            input_data: Candidate input dictionary
+        
+        Returns:
+            List of {"path", "message"} dictionaries (empty when valid)
+        """
+        errors: List[Dict[str, str]] = []
+        if not self._is_valid(input_data):
+            self._check(input_data, "", errors)
+        return errors
+    
+    def check(self, input_data: Any) -> None:
+        """
+        Validate one input and raise if it is invalid.
+        
+        Raises:
+            InputValidationError: With every error found in the input
+        """
+        if self._is_valid(input_data):
+            return
+        errors: List[Dict[str, str]] = []
+        self._check(input_data, "", errors)
+        if errors:
+            raise InputValidationError(errors)
+    
+    def iter_jsonl(self, fp: IO[str]) -> Iterator[Tuple[int, List[Dict[str, str]]]]:
+        """
+        Validate a JSON Lines stream in a single pass.
+        
+        Args:
+            fp: Text stream with one JSON input per line (blank lines are skipped)
+        
+        Yields:
+            (line number, errors) for every non-blank line, in file order;
+            errors is empty for valid lines
+        """
+        is_valid, check = self._is_valid, self._check
+        for line_number, line in enumerate(fp, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as exc:
+                yield line_number, [{"path": "", "message": f"invalid JSON: {exc}"}]
+                continue
+            errors: List[Dict[str, str]] = []
+            if not is_valid(item):
+                check(item, "", errors)
+            yield line_number, errors
+    
+    def validate_jsonl(self, path: str, max_reported: int = 1000) -> Dict[str, Any]:
+        """
+        Validate every line of a JSON Lines file.
+        
+        Args:
+            path: JSON Lines file to validate
+            max_reported: Maximum invalid lines to include in the result
+                (all of them are still counted)
+        
+        Returns:
+            Dictionary with items, valid, invalid and errors (a list of
+            {"line", "errors"} entries for the first max_reported invalid lines)
+        """
+        items = invalid = 0
+        reported = []
+        with open(path, encoding="utf-8") as fp:
+            for line_number, errors in self.iter_jsonl(fp):
+                items += 1
+                if errors:
+                    invalid += 1
+                    if len(reported) < max_reported:
+                        reported.append({"line": line_number, "errors": errors})
+        return {"items": items, "valid": items - invalid, "invalid": invalid, "errors": reported}
+
+
+def _compile(spec: Dict[str, Any]) -> Checker:
+    """Turn a schema node into a checker closure."""
+    types = spec.get("type")
+    names = [types] if isinstance(types, str) else list(types or [])
+    allowed = tuple(python_type for name in names for python_type in _PYTHON_TYPES[name])
+    # bool is an int subclass, but True is never a valid number here
+    reject_bool = bool(names) and "boolean" not in names
+    expected = " or ".join(("an " if name[0] in "aeiou" else "a ") + name for name in names)
+    
+    checks: List[Checker] = []
+    
+    if "properties" in spec:
+        fields = [
+            (key, child.get("required", False), _compile(child))
+            for key, child in spec["properties"].items()
+        ]
+        
+        def check_properties(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if not isinstance(value, dict):
+                return
+            prefix = path + "." if path else ""
+            for key, required, check in fields:
+                if key in value:
+                    check(value[key], prefix + key, errors)
+                elif required:
+                    errors.append({"path": prefix + key, "message": "is required"})
+        
+        checks.append(check_properties)
+    
+    if "items" in spec:
+        check_item = _compile(spec["items"])
+        
+        def check_items(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if isinstance(value, (list, tuple)):
+                for index, item in enumerate(value):
+                    check_item(item, f"{path}[{index}]", errors)
+        
+        checks.append(check_items)
+    
+    min_length = spec.get("min_length")
+    if min_length is not None:
+        def check_length(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if isinstance(value, (str, list, tuple)) and len(value.strip() if isinstance(value, str) else value) < min_length:
+                errors.append({"path": path, "message": "must not be empty"})
+        
+        checks.append(check_length)
+    
+    minimum, maximum = spec.get("minimum"), spec.get("maximum")
+    if minimum is not None or maximum is not None:
+        def check_range(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if type(value) is bool or not isinstance(value, (int, float)):
+                return
+            if value != value:
+                errors.append({"path": path, "message": "must be a number (got NaN)"})
+            elif minimum is not None and value < minimum:
+                errors.append({"path": path, "message": f"must be at least {minimum} (got {value})"})
+            elif maximum is not None and value > maximum:
+                errors.append({"path": path, "message": f"must be at most {maximum} (got {value})"})
+        
+        checks.append(check_range)
+    
+    validate = spec.get("validate")
+    if validate is not None:
+        def check_value(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            message = validate(value)
+            if message is not None:
+                errors.append({"path": path, "message": message})
+        
+        checks.append(check_value)
+    
+    def check(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+        if allowed and (not isinstance(value, allowed) or (reject_bool and type(value) is bool)):
+            errors.append({"path": path, "message": f"must be {expected} (got {_type_name(value)})"})
+            return
+        for extra_check in checks:
+            extra_check(value, path, errors)
+    
+    return check
+
+
+def _compile_fast(spec: Dict[str, Any]) -> Callable[[Any], bool]:
+    """
+    Turn a schema node into a predicate that only answers "valid or not".
+    
+    Types are matched exactly (so bool never passes as a number); values of
+    subclasses fail here and are settled by the full checker instead.
+    """
+    types = spec.get("type")
+    names = [types] if isinstance(types, str) else list(types or [])
+    exact = frozenset(python_type for name in names for python_type in _PYTHON_TYPES[name])
+    
+    predicates: List[Callable[[Any], bool]] = []
+    
+    if "properties" in spec:
+        # Plain type-only fields are checked inline rather than via a call
+        fields = [
+            (key, child.get("required", False), _leaf_types(child), _compile_fast(child))
+            for key, child in spec["properties"].items()
+        ]
+        
+        def properties_ok(value: Any) -> bool:
+            if type(value) is not dict:
+                return True
+            for key, required, leaf_types, ok in fields:
+                field = value.get(key, _MISSING)
+                if field is _MISSING:
+                    if required:
+                        return False
+                elif leaf_types is not None:
+                    if type(field) not in leaf_types:
+                        return False
+                elif not ok(field):
+                    return False
+            return True
+        
+        predicates.append(properties_ok)
+    
+    if "items" in spec:
+        item_ok = _compile_fast(spec["items"])
+        
+        def items_ok(value: Any) -> bool:
+            if type(value) is str:
+                return True
+            for item in value:
+                if not item_ok(item):
+                    return False
+            return True
+        
+        predicates.append(items_ok)
+    
+    if spec.get("min_length") is not None:
+        min_length = spec["min_length"]
+        predicates.append(lambda value: len(value.strip() if type(value) is str else value) >= min_length)
+    
+    minimum, maximum = spec.get("minimum"), spec.get("maximum")
+    if minimum is not None or maximum is not None:
+        low = float("-inf") if minimum is None else minimum
+        high = float("inf") if maximum is None else maximum
+        predicates.append(lambda value: type(value) is str or low <= value <= high)
+    
+    if spec.get("validate") is not None:
+        validate = spec["validate"]
+        predicates.append(lambda value: validate(value) is None)
+    
+    if not exact:
+        return lambda value: all(predicate(value) for predicate in predicates)
+    if not predicates:
+        return lambda value: type(value) in exact
+    
+    def ok(value: Any) -> bool:
+        if type(value) not in exact:
+            return False
+        for predicate in predicates:
+            if not predicate(value):
+                return False
+        return True
+    
+    return ok
+
+
+def _leaf_types(spec: Dict[str, Any]) -> Optional[frozenset]:
+    """Exact types accepted by a node that only constrains type, else None."""
+    if set(spec) != {"type"}:
+        return None
+    names = [spec["type"]] if isinstance(spec["type"], str) else spec["type"]
+    return frozenset(python_type for name in names for python_type in _PYTHON_TYPES[name])
+
+
+def _type_name(value: Any) -> str:
+    """Describe a value's type in JSON terms."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+_default_validator: Optional[InputValidator] = None
+
+
+def default_validator() -> InputValidator:
+    """Return the shared validator for INPUT_SCHEMA, compiling it on first use."""
+    global _default_validator
+    if _default_validator is None:
+        _default_validator = InputValidator()
+    return _default_validator
+
+
+def validate_input(input_data: Any) -> List[Dict[str, str]]:
+    """
+    Validate one PRD input against INPUT_SCHEMA.
+    
+    Args:
+        input_data: Candidate input dictionary
+    
+    Returns:
+        List of {"path", "message"} errors (empty when valid)
+    """
+    return default_validator().errors(input_data)
+
+
+def validate_jsonl(path: str, max_reported: int = 1000) -> Dict[str, Any]:
+    """Validate every line of a JSON Lines file against INPUT_SCHEMA (see InputValidator.validate_jsonl)."""
+    return default_validator().validate_jsonl(path, max_reported=max_reported)
@@ -0,0 +1,118 @@
+"""
+Markdown Table Builder
+Shared renderer for every table emitted by the PRD generator
+"""
+
+from typing import Any, Iterable, Iterator, IO, List, Sequence
+from functools import lru_cache
+
+
+def escape_cell(value: Any) -> str:
+    """
+    Make a value safe to place in a Markdown table cell.
+    
+    Pipes are backslash-escaped and line breaks become ``<br>`` so a cell can
+    never split a row or add columns.
+    
+    Args:
+        value: Cell value (converted with str)
+    
+    Returns:
+        Escaped cell text
+    """
+    text = value if type(value) is str else str(value)
+    # Most cells are plain text; only pay for the replacements when needed
+    if "|" in text:
+        text = text.replace("|", "\\|")
+    if "\n" in text or "\r" in text:
+        text = text.replace("\r\n", "<br>").replace("\n", "<br>").replace("\r", "<br>")
+    return text
+
+
+def iter_table_rows(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """
+    Render a Markdown table one line at a time.
+    
+    Rows are consumed lazily, so tables can be streamed from generators
+    without building the whole table in memory.
+    
+    Args:
+        headers: Column headers
+        rows: Iterable of row value sequences (one value per header)
+    
+    Yields:
+        Table lines, each ending with a newline: header, separator, then rows
+    """
+    yield _header_lines(tuple(headers))
+    for row in rows:
+        yield _format_row(row)
+
+
+def render_table(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """
+    Render a complete Markdown table in linear time.
+    
+    Args:
+        headers: Column headers
+        rows: Iterable of row value sequences
+    
+    Returns:
+        Table text ending with a newline
+    """
+    lines = [_header_lines(tuple(headers))]
+    lines.extend(map(_format_row, rows))
+    return "".join(lines)
+
+
+def write_table(fp: IO[str], headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """
+    Stream a Markdown table to a writable text stream.
+    
+    Args:
+        fp: Text stream with a ``write`` method
+        headers: Column headers
+        rows: Iterable of row value sequences
+    
+    Returns:
+        Number of characters written
+    """
+    written = 0
+    for line in iter_table_rows(headers, rows):
+        written += fp.write(line) or 0
+    return written
+
+
+@lru_cache(maxsize=256)
+def _header_lines(headers: tuple) -> str:
+    """Render (and cache) the header and separator lines for a set of headers."""
+    cells = [escape_cell(header) for header in headers]
+    return (
+        "| " + " | ".join(cells) + " |\n"
+        + "|" + "|".join("-" * (len(cell) + 2) for cell in cells) + "|\n"
+    )
+
+
+def _format_row(row: Sequence[Any]) -> str:
+    """Render one table row, escaping cells only when the row needs it."""
+    cells = [cell if type(cell) is str else str(cell) for cell in row]
+    line = " | ".join(cells)
+    # Join first and only escape cell by cell when the row holds a stray
+    # pipe or line break, which keeps the common case to one join
+    if line.count("|") != len(cells) - 1 or "\n" in line or "\r" in line:
+        line = " | ".join(map(escape_cell, cells))
+    return "| " + line + " |\n"
+
+
+def table_rows(records: Iterable[dict], columns: List[tuple]) -> Iterator[List[Any]]:
+    """
+    Project dictionaries onto table columns.
+    
+    Args:
+        records: Dictionaries to turn into rows
+        columns: (key, default) pairs, one per table column
+    
+    Yields:
+        One list of cell values per record
+    """
+    for record in records:
+        yield [record.get(key, default) for key, default in columns]
@@ -0,0 +1,269 @@
+"""
+PRD Output Cache
+Content-addressed cache of rendered PRDs with an in-memory LRU tier and a
+persistent SQLite tier
+"""
+
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import hashlib
+import io
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from generate_prd import PRDGenerator
+from prd_locales import DEFAULT_LOCALE
+from research_extract import RESEARCH_FIELDS, is_reference, reference_stamp
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prd_cache (
+    key TEXT PRIMARY KEY,
+    document TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prd_cache_last_access ON prd_cache (last_access);
+"""
+
+# Disk eviction trims down to this fraction of max_disk_bytes so that a full
+# cache does not evict on every write
+_DISK_LOW_WATER = 0.9
+
+
+def cache_key(input_data: Dict[str, Any], prd_version: str, render_date: str, locale: str = DEFAULT_LOCALE) -> str:
+    """
+    Build the content address of a rendered PRD.
+    
+    The input is serialized with pickle rather than JSON because a cache
+    hit costs one key computation and pickling is several times faster.
+    Top-level fields are sorted so their order does not matter, and
+    memoization is disabled so equal values always serialize identically
+    however the objects happen to be shared. Research file references are
+    keyed by the file's size and modification time as well as its path.
+    
+    Args:
+        input_data: Feature requirements dictionary
+        prd_version: Generator document version (changes when templates change)
+        render_date: Date the document is rendered for (YYYY-MM-DD)
+        locale: Message catalog the document is rendered with
+    
+    Returns:
+        SHA-256 hex digest of the version, date, locale and input
+    """
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=5)
+    pickler.fast = True
+    if any(is_reference(input_data.get(field)) for field in RESEARCH_FIELDS):
+        input_data = {key: reference_stamp(value) for key, value in input_data.items()}
+    pickler.dump((prd_version, render_date, locale, sorted(input_data.items())))
+    return hashlib.sha256(buffer.getbuffer()).hexdigest()
+
+
+class PRDCache:
+    """
+    Cache in front of ``PRDGenerator.generate_prd``.
+    
+    Documents are keyed by ``cache_key`` so identical inputs rendered for
+    the same version and day share one entry. Lookups check a bounded
+    in-memory LRU first, then the optional SQLite file; a disk hit is
+    promoted to memory. Both tiers evict least recently used entries once
+    they exceed their size limits.
+    
+    Section hooks on the generator only fire for cache misses.
+    
+    Example:
+        cache = PRDCache(path="prd_cache.sqlite3")
+        document = cache.generate_prd(input_data)
+        print(cache.stats())
+    """
+    
+    def __init__(
+        self,
+        generator: Optional[PRDGenerator] = None,
+        path: Optional[str] = None,
+        max_memory_entries: int = 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Args:
+            generator: Generator to render misses with (defaults to a new PRDGenerator)
+            path: SQLite file for the persistent tier (None keeps the cache in memory only)
+            max_memory_entries: Maximum documents held in memory
+            max_memory_bytes: Maximum UTF-8 size of the documents held in memory
+            max_disk_bytes: Maximum UTF-8 size of the documents stored on disk
+        """
+        self.generator = generator or PRDGenerator()
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (document, size)
+        self._memory_bytes = 0
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM prd_cache").fetchone()[0]
+    
+    def key_for(self, input_data: Dict[str, Any]) -> str:
+        """Return the cache key for rendering input_data today with this generator."""
+        generator = self.generator
+        return cache_key(input_data, generator.prd_version, generator._format_today("%Y-%m-%d"), generator.locale)
+    
+    def generate_prd(self, input_data: Dict[str, Any]) -> str:
+        """
+        Return the PRD for input_data, rendering it only on a cache miss.
+        
+        Args:
+            input_data: Feature requirements dictionary
+        
+        Returns:
+            Complete PRD in Markdown format
+        """
+        try:
+            key = self.key_for(input_data)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Values that cannot be serialized are rendered without caching
+            with self._lock:
+                self._counters["misses"] += 1
+            return self.generator.generate_prd(input_data)
+        document = self.get(key)
+        if document is None:
+            document = self.generator.generate_prd(input_data)
+            self.put(key, document)
+        return document
+    
+    def get(self, key: str) -> Optional[str]:
+        """Look a key up in memory, then on disk; returns None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return entry[0]
+            
+            if self._db is not None:
+                row = self._db.execute("SELECT document, size FROM prd_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE prd_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+                    self._remember(key, row[0], row[1])
+                    self._counters["disk_hits"] += 1
+                    return row[0]
+            
+            self._counters["misses"] += 1
+            return None
+    
+    def put(self, key: str, document: str) -> None:
+        """Store a rendered document in both tiers."""
+        size = len(document.encode("utf-8"))
+        with self._lock:
+            self._remember(key, document, size)
+            if self._db is None or size > self.max_disk_bytes:
+                return
+            previous = self._db.execute("SELECT size FROM prd_cache WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO prd_cache (key, document, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, document, size, time.time()),
+            )
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report hit/miss counters and tier sizes.
+        
+        Returns:
+            Dictionary with memory_hits, disk_hits, misses, hit_rate,
+            memory_evictions, disk_evictions, memory_entries, memory_bytes,
+            disk_entries and disk_bytes
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+            stats["disk_entries"] = (
+                self._db.execute("SELECT COUNT(*) FROM prd_cache").fetchone()[0] if self._db is not None else 0
+            )
+            stats["disk_bytes"] = self._disk_bytes
+        return stats
+    
+    def clear(self) -> None:
+        """Remove every entry from both tiers (counters are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM prd_cache")
+                self._disk_bytes = 0
+    
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def __enter__(self) -> "PRDCache":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _remember(self, key: str, document: str, size: int) -> None:
+        """Insert into the memory tier and evict least recently used entries (lock held)."""
+        if size > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+        self._memory[key] = (document, size)
+        self._memory_bytes += size
+        while len(self._memory) > self.max_memory_entries or self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._counters["memory_evictions"] += 1
+    
+    def _evict_disk(self) -> None:
+        """Delete least recently used rows until the disk tier is under its low-water mark (lock held)."""
+        target = self.max_disk_bytes * _DISK_LOW_WATER
+        self._db.execute("BEGIN")
+        try:
+            while self._disk_bytes > target:
+                rows = self._db.execute(
+                    "SELECT key, size FROM prd_cache ORDER BY last_access LIMIT 256"
+                ).fetchall()
+                if not rows:
+                    break
+                for key, size in rows:
+                    if self._disk_bytes <= target:
+                        break
+                    self._db.execute("DELETE FROM prd_cache WHERE key = ?", (key,))
+                    self._disk_bytes -= size
+                    self._counters["disk_evictions"] += 1
+            self._db.execute("COMMIT")
+        except sqlite3.Error:
+            self._db.execute("ROLLBACK")
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM prd_cache").fetchone()[0]
+            raise
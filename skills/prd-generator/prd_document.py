@@ -0,0 +1,445 @@
+"""
+PRD Document Model
+Lightweight document tree for a generated PRD, with pluggable renderers for
+Markdown, HTML and structured JSON
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import html
+import json
+import re
+
+from markdown_table import render_table
+
+# Block nodes are plain dictionaries so the tree serializes to JSON as is:
+#   {"type": "heading", "level": 2, "text": "..."}
+#   {"type": "paragraph", "text": "..."}        (hard line breaks as "\n")
+#   {"type": "list", "ordered": bool, "start": int,
+#    "items": [{"text": "...", "checked": None | bool, "children": [blocks]}]}
+#   {"type": "table", "headers": [...], "rows": [[...], ...]}
+#   {"type": "rule"}
+# Text keeps its inline Markdown (**bold**, [links](url)).
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_TASK = re.compile(r"^\[([ xX])\]\s+(.*)$")
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+_CELL_SPLIT = re.compile(r"(?<!\\)\|")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+# Markdown of blocks shared by every document (catalog template text), by
+# id; each entry keeps its block alive so the id cannot be reused
+_SHARED_MARKDOWN: Dict[int, Tuple[Dict[str, Any], str]] = {}
+
+
+class PRDDocument:
+    """
+    A rendered PRD as a tree of sections and blocks.
+    
+    The section renderers emit blocks directly, and every format is rendered
+    from them: Markdown (identical to ``PRDGenerator.generate_prd``, which is
+    serialized from the same blocks), HTML and JSON. Nothing is regenerated
+    or parsed back from text. Treat the blocks as read-only: static sections
+    and template text share them across documents.
+    
+    Example:
+        document = generator.build_document(input_data)
+        html_page = document.render("html")
+        sections = document.to_dict()["sections"]
+    """
+    
+    def __init__(self, title: str, sections: List[Dict[str, Any]], separator: str = "\n\n", language: str = "en"):
+        """
+        Args:
+            title: Document title (the feature name)
+            sections: Section dictionaries with name, title, kind, blocks and
+                optionally markdown (the blocks already serialized, reused by
+                render_markdown)
+            separator: Text placed between sections in Markdown output
+            language: Language code of the document text (the locale it was
+                rendered with)
+        """
+        self.title = title
+        self.sections = sections
+        self.separator = separator
+        self.language = language
+    
+    def section(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the section with the given registry name, or None."""
+        for section in self.sections:
+            if section["name"] == name:
+                return section
+        return None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the tree as JSON-serializable data (section Markdown omitted)."""
+        return {
+            "title": self.title,
+            "sections": [
+                {"name": section["name"], "title": section["title"], "kind": section["kind"], "blocks": section["blocks"]}
+                for section in self.sections
+            ],
+        }
+    
+    def render(self, fmt: str) -> str:
+        """
+        Render the document with a registered renderer.
+        
+        Args:
+            fmt: Renderer name ("markdown", "html", "json" or one added with
+                register_renderer)
+        
+        Returns:
+            Rendered document text
+        
+        Raises:
+            ValueError: If no renderer is registered under that name
+        """
+        renderer = RENDERERS.get(fmt)
+        if renderer is None:
+            raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(sorted(RENDERERS))}")
+        return renderer(self)
+
+
+def register_renderer(name: str, renderer: Callable[[PRDDocument], str]) -> None:
+    """
+    Make a renderer available to PRDDocument.render.
+    
+    Args:
+        name: Format name
+        renderer: Callable turning a PRDDocument into text
+    """
+    RENDERERS[name] = renderer
+
+
+def share_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mark a block as shared by many documents, serializing its Markdown once.
+    
+    The block must never change afterwards. Use it for long-lived blocks
+    only (template text), since shared blocks are kept for the life of the
+    process.
+    """
+    _SHARED_MARKDOWN[id(block)] = (block, _block_to_markdown(block, ""))
+    return block
+
+
+def paragraph_block(text: str) -> Dict[str, Any]:
+    """Build a paragraph block (line breaks in text are kept as hard breaks)."""
+    return {"type": "paragraph", "text": text}
+
+
+def list_block(items: Iterable[Any], ordered: bool = False) -> Dict[str, Any]:
+    """Build a flat bullet (or numbered) list block from item texts."""
+    return {
+        "type": "list",
+        "ordered": ordered,
+        "start": 1,
+        "items": [{"text": item if type(item) is str else str(item), "checked": None, "children": []} for item in items],
+    }
+
+
+def table_block(headers: Sequence[Any], rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+    """Build a table block; cells are kept as unescaped text."""
+    return {
+        "type": "table",
+        "headers": [header if type(header) is str else str(header) for header in headers],
+        "rows": [[cell if type(cell) is str else str(cell) for cell in row] for row in rows],
+    }
+
+
+def parse_markdown(text: str) -> List[Dict[str, Any]]:
+    """
+    Parse the Markdown subset emitted by the PRD generator into blocks.
+    
+    Handles ATX headings, paragraphs (with hard line breaks), nested bullet,
+    numbered and task lists, pipe tables and horizontal rules. The generator
+    uses it for Markdown it does not produce itself: catalog templates
+    (parsed once per locale) and Markdown given in the input.
+    
+    Args:
+        text: Markdown text
+    
+    Returns:
+        List of block dictionaries
+    """
+    lines = text.split("\n")
+    blocks: List[Dict[str, Any]] = []
+    paragraph: List[str] = []
+    index = 0
+    
+    def flush_paragraph() -> None:
+        if paragraph:
+            blocks.append({"type": "paragraph", "text": _join_paragraph(paragraph)})
+            paragraph.clear()
+    
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        if not stripped:
+            flush_paragraph()
+            index += 1
+            continue
+        
+        # Dispatch on the first character so plain text skips the block regexes
+        first = stripped[0]
+        
+        heading = _HEADING.match(line) if first == "#" else None
+        if heading:
+            flush_paragraph()
+            blocks.append({"type": "heading", "level": len(heading.group(1)), "text": heading.group(2)})
+            index += 1
+            continue
+        
+        if first in "-*_" and _RULE.match(line):
+            flush_paragraph()
+            blocks.append({"type": "rule"})
+            index += 1
+            continue
+        
+        if first == "|" and index + 1 < len(lines) and _TABLE_SEPARATOR.match(lines[index + 1].strip()):
+            flush_paragraph()
+            table, index = _parse_table(lines, index)
+            blocks.append(table)
+            continue
+        
+        if (first in "-*+" or first.isdigit()) and _LIST_ITEM.match(line):
+            flush_paragraph()
+            block, index = _parse_list(lines, index, len(line) - len(line.lstrip()))
+            blocks.append(block)
+            continue
+        
+        paragraph.append(line)
+        index += 1
+    
+    flush_paragraph()
+    return blocks
+
+
+def _join_paragraph(lines: List[str]) -> str:
+    """Join paragraph lines, keeping hard breaks (two trailing spaces) as newlines."""
+    parts = []
+    for position, line in enumerate(lines):
+        text = line.strip()
+        if position:
+            parts.append("\n" if lines[position - 1].endswith("  ") else " ")
+        parts.append(text)
+    return "".join(parts)
+
+
+def _parse_table(lines: List[str], start: int) -> Tuple[Dict[str, Any], int]:
+    """Parse a pipe table starting at its header line."""
+    headers = _split_row(lines[start])
+    rows = []
+    index = start + 2
+    while index < len(lines) and lines[index].strip().startswith("|"):
+        rows.append(_split_row(lines[index]))
+        index += 1
+    return {"type": "table", "headers": headers, "rows": rows}, index
+
+
+def _split_row(line: str) -> List[str]:
+    """Split a table row into unescaped cells (inverse of markdown_table.escape_cell)."""
+    text = line.strip()
+    if text.startswith("|"):
+        text = text[1:]
+    if text.endswith("|") and not text.endswith("\\|"):
+        text = text[:-1]
+    return [cell.strip().replace("\\|", "|").replace("<br>", "\n") for cell in _CELL_SPLIT.split(text)]
+
+
+def _parse_list(lines: List[str], start: int, indent: int) -> Tuple[Dict[str, Any], int]:
+    """Parse a list whose items sit at the given indent, including nested lists."""
+    first = _LIST_ITEM.match(lines[start])
+    ordered = first.group(2)[0].isdigit()
+    block = {"type": "list", "ordered": ordered, "start": int(first.group(2)[:-1]) if ordered else 1, "items": []}
+    items = block["items"]
+    index = start
+    
+    while index < len(lines):
+        line = lines[index]
+        if not line.strip():
+            # A blank line continues the list only if the list resumes after it
+            following = index + 1
+            while following < len(lines) and not lines[following].strip():
+                following += 1
+            if following == len(lines):
+                break
+            next_line = lines[following]
+            next_indent = len(next_line) - len(next_line.lstrip())
+            next_item = _LIST_ITEM.match(next_line)
+            if next_indent > indent or (
+                next_item and next_indent == indent and next_item.group(2)[0].isdigit() == ordered
+            ):
+                index = following
+                continue
+            break
+        
+        item = _LIST_ITEM.match(line)
+        line_indent = len(line) - len(line.lstrip())
+        if line_indent < indent:
+            break
+        if line_indent == indent:
+            if not item or item.group(2)[0].isdigit() != ordered:
+                break
+            items.append(_list_item(item.group(3)))
+            index += 1
+        elif item and items:
+            child, index = _parse_list(lines, index, line_indent)
+            items[-1]["children"].append(child)
+        elif items:
+            # Indented continuation of the previous item's text
+            items[-1]["text"] += " " + line.strip()
+            index += 1
+        else:
+            break
+    return block, index
+
+
+def _list_item(text: str) -> Dict[str, Any]:
+    """Build a list item, recognizing task-list checkboxes."""
+    task = _TASK.match(text)
+    if task:
+        return {"text": task.group(2).rstrip(), "checked": task.group(1) != " ", "children": []}
+    return {"text": text.rstrip(), "checked": None, "children": []}
+
+
+# Renderers
+
+def render_markdown(document: PRDDocument) -> str:
+    """Render Markdown, reusing each section's serialized text when it has one."""
+    return document.separator.join(
+        section["markdown"] if section.get("markdown") is not None else blocks_to_markdown(section["blocks"])
+        for section in document.sections
+    )
+
+
+def render_json(document: PRDDocument) -> str:
+    """Render the document tree as compact JSON."""
+    return json.dumps(document.to_dict(), ensure_ascii=False)
+
+
+def render_html(document: PRDDocument) -> str:
+    """Render a standalone HTML page with one <section> per PRD section."""
+    parts = [
+        "<!DOCTYPE html>",
+        f'<html lang="{html.escape(document.language)}">',
+        '<head><meta charset="utf-8"><title>' + html.escape(document.title) + "</title></head>",
+        "<body>",
+    ]
+    for section in document.sections:
+        parts.append(f'<section id="{html.escape(section["name"])}">')
+        _blocks_to_html(section["blocks"], parts)
+        parts.append("</section>")
+    parts.append("</body>")
+    parts.append("</html>")
+    return "\n".join(parts) + "\n"
+
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]*)\)")
+_SCHEME = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+
+# Link targets other than these schemes (e.g. javascript:) are rendered as text
+SAFE_LINK_SCHEMES = frozenset({"http", "https", "mailto"})
+
+
+def _inline_html(text: str) -> str:
+    """Escape text and convert the inline Markdown the generator uses."""
+    # Most fragments are plain text; only run the substitutions they need
+    if "&" in text or "<" in text or ">" in text:
+        text = html.escape(text, quote=False)
+    if "**" in text:
+        text = _BOLD.sub(r"<strong>\1</strong>", text)
+    if "](" in text:
+        text = _LINK.sub(_link_html, text)
+    if "\n" in text:
+        text = text.replace("\n", "<br>\n")
+    return text
+
+
+def _link_html(match: "re.Match") -> str:
+    """Turn an already escaped Markdown link into an anchor; unsafe targets keep only the text."""
+    href = match.group(2)
+    scheme = _SCHEME.match(href)
+    if scheme is not None and scheme.group(1).lower() not in SAFE_LINK_SCHEMES:
+        return match.group(1)
+    href = href.replace('"', "&quot;")
+    return f'<a href="{href}">{match.group(1)}</a>'
+
+
+def _blocks_to_html(blocks: List[Dict[str, Any]], parts: List[str]) -> None:
+    """Append the HTML for a list of blocks to parts."""
+    for block in blocks:
+        kind = block["type"]
+        if kind == "heading":
+            level = block["level"]
+            parts.append(f"<h{level}>{_inline_html(block['text'])}</h{level}>")
+        elif kind == "paragraph":
+            parts.append(f"<p>{_inline_html(block['text'])}</p>")
+        elif kind == "list":
+            tag = "ol" if block["ordered"] else "ul"
+            start = f' start="{block["start"]}"' if block["ordered"] and block["start"] != 1 else ""
+            parts.append(f"<{tag}{start}>")
+            for item in block["items"]:
+                checkbox = ""
+                if item["checked"] is not None:
+                    checkbox = '<input type="checkbox" disabled' + (" checked" if item["checked"] else "") + "> "
+                parts.append(f"<li>{checkbox}{_inline_html(item['text'])}")
+                _blocks_to_html(item["children"], parts)
+                parts.append("</li>")
+            parts.append(f"</{tag}>")
+        elif kind == "table":
+            parts.append("<table>")
+            parts.append("<thead><tr>" + "".join(f"<th>{_inline_html(cell)}</th>" for cell in block["headers"]) + "</tr></thead>")
+            parts.append("<tbody>")
+            for row in block["rows"]:
+                parts.append("<tr>" + "".join(f"<td>{_inline_html(cell)}</td>" for cell in row) + "</tr>")
+            parts.append("</tbody>")
+            parts.append("</table>")
+        elif kind == "rule":
+            parts.append("<hr>")
+
+
+def blocks_to_markdown(blocks: List[Dict[str, Any]]) -> str:
+    """
+    Serialize blocks to Markdown, one blank line between blocks.
+    
+    This is how every PRD section becomes Markdown, so parsing the result
+    with parse_markdown gives the same blocks back.
+    """
+    shared = _SHARED_MARKDOWN.get
+    return "\n\n".join([
+        entry[1] if (entry := shared(id(block))) is not None else _block_to_markdown(block, "")
+        for block in blocks
+    ]) + "\n"
+
+
+def _block_to_markdown(block: Dict[str, Any], indent: str) -> str:
+    """Render one block, indenting nested list content."""
+    kind = block["type"]
+    if kind == "heading":
+        return "#" * block["level"] + " " + block["text"]
+    if kind == "paragraph":
+        return indent + block["text"].replace("\n", "  \n" + indent)
+    if kind == "list":
+        lines = []
+        for number, item in enumerate(block["items"], block["start"]):
+            marker = f"{number}." if block["ordered"] else "-"
+            checkbox = "" if item["checked"] is None else ("[x] " if item["checked"] else "[ ] ")
+            lines.append(f"{indent}{marker} {checkbox}{item['text']}")
+            for child in item["children"]:
+                lines.append(_block_to_markdown(child, indent + " " * (len(marker) + 1)))
+        return "\n".join(lines)
+    if kind == "table":
+        return render_table(block["headers"], block["rows"]).rstrip("\n")
+    if kind == "rule":
+        return "---"
+    raise ValueError(f"Unknown block type {kind!r}")
+
+
+RENDERERS: Dict[str, Callable[[PRDDocument], str]] = {
+    "markdown": render_markdown,
+    "html": render_html,
+    "json": render_json,
+}
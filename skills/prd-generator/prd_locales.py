@@ -0,0 +1,298 @@
+"""
+PRD Message Catalogs
+Localized headings and boilerplate for PRD sections, loaded lazily and
+compiled once per locale
+"""
+
+from typing import Dict, List, Any, Optional, Mapping
+from datetime import date
+from functools import lru_cache
+from string import Formatter
+import json
+import os
+import re
+
+from prd_document import parse_markdown, share_block
+
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+
+DEFAULT_LOCALE = "en"
+
+_FORMATTER = Formatter()
+
+# A template paragraph that is only a replacement field is a block slot
+_SLOT = re.compile(r"^\{(\w+)\}$")
+
+
+class CompiledMessage:
+    """
+    A message template parsed once into literal text and replacement fields.
+    
+    Templates use ``str.format`` syntax ({name} or {name:spec}). Rendering
+    walks the pre-parsed pieces and joins them, so the template string is
+    never parsed again.
+    """
+    
+    __slots__ = ("key", "pieces")
+    
+    def __init__(self, key: str, template: str):
+        self.key = key
+        # (literal, field name or None, format spec)
+        self.pieces = [
+            (literal, field, spec or "")
+            for literal, field, spec, _ in _FORMATTER.parse(template)
+        ]
+    
+    def render(self, values: Mapping[str, Any], defaults: Mapping[str, Any], catalog: "MessageCatalog") -> str:
+        parts = []
+        for literal, field, spec in self.pieces:
+            parts.append(literal)
+            if field is None:
+                continue
+            if field in values:
+                value = values[field]
+            elif field in defaults:
+                value = defaults[field]
+            else:
+                raise KeyError(f"Message '{self.key}' needs a value for '{field}'")
+            if callable(value):
+                # Values that contain localized text are resolved per catalog
+                value = value(catalog)
+            parts.append(format(value, spec) if spec or type(value) is not str else value)
+        return "".join(parts)
+
+
+class SectionTemplate:
+    """
+    A section template parsed once into document blocks.
+    
+    The template's Markdown is parsed when the template is compiled, never
+    at render time. Block text holding replacement fields is compiled into a
+    CompiledMessage and filled per render; blocks without fields are shared
+    by every render and serialized to Markdown once. A paragraph that is only a replacement field
+    (``{metrics_table}``) is a slot: its value is a list of blocks, or
+    Markdown text (catalog defaults, input prose) parsed into blocks.
+    """
+    
+    __slots__ = ("key", "blocks")
+    
+    def __init__(self, key: str, template: str):
+        self.key = key
+        # (action, argument) steps; consecutive static blocks form one run
+        self.blocks: List[tuple] = []
+        for block in parse_markdown(template):
+            action, argument = self._compile_block(block)
+            if action == "static":
+                if self.blocks and self.blocks[-1][0] == "static":
+                    self.blocks[-1][1].append(argument)
+                    continue
+                argument = [argument]
+            self.blocks.append((action, argument))
+    
+    def _compile_block(self, block: Dict[str, Any]) -> tuple:
+        kind = block["type"]
+        if kind == "paragraph":
+            slot = _SLOT.match(block["text"])
+            if slot is not None:
+                return ("slot", slot.group(1))
+        if kind in ("heading", "paragraph") and "{" in block["text"]:
+            return ("fill", dict(block, text=CompiledMessage(self.key, block["text"])))
+        if kind == "list" and self._compile_items(block["items"]):
+            return ("fill", block)
+        return ("static", share_block(block))
+    
+    def _compile_items(self, items: List[Dict[str, Any]]) -> bool:
+        """Compile item text with fields in place; True if any item needs filling."""
+        fill = False
+        for item in items:
+            if "{" in item["text"]:
+                item["text"] = CompiledMessage(self.key, item["text"])
+                fill = True
+            for child in item["children"]:
+                if child["type"] == "list" and self._compile_items(child["items"]):
+                    fill = True
+        return fill
+    
+    def render(self, values: Mapping[str, Any], defaults: Mapping[str, Any], catalog: "MessageCatalog") -> List[Dict[str, Any]]:
+        blocks: List[Dict[str, Any]] = []
+        for action, block in self.blocks:
+            if action == "static":
+                blocks.extend(block)
+            elif action == "slot":
+                value = values[block] if block in values else defaults.get(block)
+                if value is None:
+                    raise KeyError(f"Message '{self.key}' needs a value for '{block}'")
+                if callable(value):
+                    value = value(catalog)
+                blocks.extend(_parse_text(value) if isinstance(value, str) else value)
+            else:
+                blocks.append(_fill(block, values, defaults, catalog))
+        return blocks
+
+
+def _fill(block: Dict[str, Any], values: Mapping[str, Any], defaults: Mapping[str, Any], catalog: "MessageCatalog") -> Dict[str, Any]:
+    """Copy a template block with its compiled text rendered."""
+    if block["type"] != "list":
+        return dict(block, text=block["text"].render(values, defaults, catalog))
+    items = []
+    for item in block["items"]:
+        text = item["text"]
+        items.append({
+            "text": text if type(text) is str else text.render(values, defaults, catalog),
+            "checked": item["checked"],
+            "children": [_fill(child, values, defaults, catalog) if child["type"] == "list" else child
+                         for child in item["children"]],
+        })
+    return dict(block, items=items)
+
+
+@lru_cache(maxsize=256)
+def _parse_text(text: str) -> List[Dict[str, Any]]:
+    """Blocks of Markdown given as a slot value (shared, read-only)."""
+    return parse_markdown(text)
+
+
+class MessageCatalog:
+    """
+    The PRD text of one locale.
+    
+    Catalogs are JSON files in LOCALE_DIR named after the locale code, with:
+        - name: Display name of the locale
+        - fallback: Locale consulted for entries this one does not define
+        - calendar: Month names and the long date template
+        - messages: Section templates (a string, or a list of lines joined
+          with newlines) and smaller message templates, by key
+        - defaults: Per-message values used when the input leaves a field out
+        - text: Plain strings, lists and table rows used by the renderers
+    
+    Messages are compiled the first time they are rendered and kept for the
+    life of the catalog. Section templates are rendered to text with
+    ``render`` or to document blocks with ``render_blocks``.
+    """
+    
+    def __init__(self, code: str, data: Dict[str, Any], fallback: Optional["MessageCatalog"] = None):
+        """
+        Args:
+            code: Locale code (e.g. "en")
+            data: Parsed catalog file
+            fallback: Catalog to consult for missing entries
+        """
+        self.code = code
+        self.name = data.get("name", code)
+        self.fallback = fallback
+        self._data = data
+        self._compiled: Dict[str, CompiledMessage] = {}
+        self._sections: Dict[str, SectionTemplate] = {}
+        self._merged_defaults: Dict[str, Dict[str, Any]] = {}
+        self._dates: Dict[date, str] = {}
+    
+    def _lookup(self, group: str, key: str) -> Any:
+        catalog: Optional[MessageCatalog] = self
+        while catalog is not None:
+            entries = catalog._data.get(group, {})
+            if key in entries:
+                return entries[key]
+            catalog = catalog.fallback
+        raise KeyError(f"No {group} entry '{key}' in locale '{self.code}'")
+    
+    def message(self, key: str) -> CompiledMessage:
+        """Return the compiled message for ``key``."""
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            template = self._lookup("messages", key)
+            if isinstance(template, list):
+                template = "\n".join(template)
+            compiled = self._compiled[key] = CompiledMessage(key, template)
+        return compiled
+    
+    def render(self, key: str, values: Optional[Mapping[str, Any]] = None) -> str:
+        """
+        Render a message.
+        
+        Args:
+            key: Message key
+            values: Replacement values; a callable value is called with this
+                catalog and its result used, so locale-independent work can be
+                shared while localized text is filled in per locale
+        
+        Returns:
+            Rendered text
+        """
+        defaults = self._defaults(key)
+        return self.message(key).render(values or {}, defaults, self)
+    
+    def section(self, key: str) -> SectionTemplate:
+        """Return the section template for ``key``, parsed into blocks once."""
+        template = self._sections.get(key)
+        if template is None:
+            text = self._lookup("messages", key)
+            if isinstance(text, list):
+                text = "\n".join(text)
+            template = self._sections[key] = SectionTemplate(key, text)
+        return template
+    
+    def render_blocks(self, key: str, values: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Render a section message as document blocks.
+        
+        Args:
+            key: Message key of the section
+            values: Replacement values as for render; a slot value (a field
+                alone on its own line) is a list of blocks or Markdown text
+        
+        Returns:
+            Blocks of the section (template blocks without fields are shared)
+        """
+        return self.section(key).render(values or {}, self._defaults(key), self)
+    
+    def _defaults(self, key: str) -> Dict[str, Any]:
+        """Defaults of a message, with this locale's entries over its fallback's."""
+        merged = self._merged_defaults.get(key)
+        if merged is None:
+            merged = dict(self.fallback._defaults(key)) if self.fallback is not None else {}
+            merged.update(self._data.get("defaults", {}).get(key, {}))
+            self._merged_defaults[key] = merged
+        return merged
+    
+    def text(self, key: str) -> Any:
+        """Return a plain text entry (string, list or table rows)."""
+        return self._lookup("text", key)
+    
+    def format_date(self, day: date) -> str:
+        """Format a date in the locale's long form (e.g. "October 17, 2026")."""
+        formatted = self._dates.get(day)
+        if formatted is None:
+            months = self._lookup("calendar", "months")
+            template = CompiledMessage("long_date", self._lookup("calendar", "long_date"))
+            formatted = template.render({"day": day.day, "month": months[day.month - 1], "year": day.year}, {}, self)
+            self._dates[day] = formatted
+        return formatted
+    
+    def __repr__(self) -> str:
+        return f"MessageCatalog({self.code!r})"
+
+
+@lru_cache(maxsize=None)
+def load_catalog(code: str = DEFAULT_LOCALE) -> MessageCatalog:
+    """
+    Load (once per process) the catalog of a locale and its fallbacks.
+    
+    Raises:
+        ValueError: If no catalog exists for the locale
+    """
+    path = os.path.join(LOCALE_DIR, f"{code}.json")
+    if os.path.basename(path) != f"{code}.json" or not os.path.isfile(path):
+        raise ValueError(f"Unknown locale '{code}', expected one of: {', '.join(available_locales())}")
+    with open(path, "r", encoding="utf-8") as fp:
+        data = json.load(fp)
+    fallback_code = data.get("fallback")
+    fallback = load_catalog(fallback_code) if fallback_code and fallback_code != code else None
+    return MessageCatalog(code, data, fallback)
+
+
+def available_locales() -> List[str]:
+    """Return the codes of every locale with a catalog file."""
+    if not os.path.isdir(LOCALE_DIR):
+        return []
+    return sorted(name[:-len(".json")] for name in os.listdir(LOCALE_DIR) if name.endswith(".json"))
+
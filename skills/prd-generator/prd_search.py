@@ -0,0 +1,636 @@
+"""
+PRD Search Index
+Section-aware full-text search over generated PRDs, backed by an on-disk
+inverted index with incremental updates and BM25 ranking
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter
+import argparse
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from functools import lru_cache
+
+from generate_prd import PRDGenerator, SECTION_REGISTRY
+from prd_locales import DEFAULT_LOCALE, available_locales, load_catalog
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    source_mtime REAL,
+    source_size INTEGER
+);
+CREATE TABLE IF NOT EXISTS contents (
+    content_id INTEGER PRIMARY KEY,
+    digest TEXT UNIQUE NOT NULL,
+    section TEXT NOT NULL,
+    subsection TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contents_by_subsection ON contents (subsection, section);
+CREATE TABLE IF NOT EXISTS units (
+    unit_id INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    subsection TEXT NOT NULL,
+    occurrence INTEGER NOT NULL,
+    heading TEXT NOT NULL,
+    content_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS units_by_document ON units (doc_id);
+CREATE INDEX IF NOT EXISTS units_by_content ON units (content_id, doc_id);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    section TEXT NOT NULL,
+    content_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, section, content_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_content ON postings (content_id);
+CREATE TABLE IF NOT EXISTS section_stats (
+    section TEXT PRIMARY KEY,
+    units INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+"""
+
+_TOKEN = re.compile(r"\w+")
+_HEADING = re.compile(r"^(#{1,3}) +(.+?) *#*$", re.MULTILINE)
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+# Files indexed per transaction by index_directory
+_COMMIT_EVERY = 200
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens (Markdown punctuation is ignored)."""
+    return _TOKEN.findall(text.lower())
+
+
+def section_name(heading: str) -> str:
+    """
+    Map a ``##`` heading to its section name.
+    
+    Headings rendered by PRDGenerator, in any locale, map to their registry
+    name ("AI/ML Specifications" and "Especificaciones de IA/ML" ->
+    "ai_ml_specs", including suffixed headings such as "Stakeholder Matrix
+    (RACI)"); other headings are slugified.
+    """
+    names = _section_names()
+    lowered = heading.strip().lower()
+    name = names.get(lowered) or names.get(lowered.split(" (", 1)[0])
+    return name or _slug(heading)
+
+
+@lru_cache(maxsize=None)
+def _section_names() -> Dict[str, str]:
+    """Section headings of the registry and of every locale catalog, mapped to their registry names."""
+    names = {entry["title"].lower(): entry["name"] for entry in SECTION_REGISTRY}
+    for code in available_locales():
+        catalog = load_catalog(code)
+        for entry in SECTION_REGISTRY:
+            headings = _template_headings(catalog, entry["name"])
+            # The section heading is the template's first line
+            if headings and headings[0][:2] == (0, 2):
+                names.setdefault(headings[0][2].lower(), entry["name"])
+    return names
+
+
+def subsection_name(heading: str) -> str:
+    """
+    Map a ``###`` heading to its subsection slug.
+    
+    Subsection headings rendered by PRDGenerator are slugified from the
+    default locale's wording, so "Restricciones técnicas" and "Technical
+    Constraints" are both "technical_constraints"; other headings are
+    slugified as they are.
+    """
+    return _subsection_names().get(heading.strip().lower()) or _slug(heading)
+
+
+@lru_cache(maxsize=None)
+def _subsection_names() -> Dict[str, str]:
+    """Subsection headings of every locale catalog, mapped to the slug of the default locale's heading."""
+    default = load_catalog(DEFAULT_LOCALE)
+    names: Dict[str, str] = {}
+    for entry in SECTION_REGISTRY:
+        canonical = [text for _, level, text in _template_headings(default, entry["name"]) if level == 3]
+        for code in available_locales():
+            localized = [text for _, level, text in _template_headings(load_catalog(code), entry["name"]) if level == 3]
+            # Catalogs translate a section's subsections in the same order
+            if len(localized) != len(canonical):
+                continue
+            for text, source in zip(localized, canonical):
+                names.setdefault(text.lower(), _slug(source))
+    return names
+
+
+def _template_headings(catalog: Any, name: str) -> List[Tuple[int, int, str]]:
+    """
+    Literal ``##``/``###`` headings of a section template as (line, level, text).
+    
+    Headings that contain a replacement field are skipped, as their rendered
+    text varies.
+    """
+    try:
+        message = catalog.message(name)
+    except KeyError:
+        return []
+    template = "".join(literal + ("{}" if field is not None else "") for literal, field, _ in message.pieces)
+    headings = []
+    for line_number, line in enumerate(template.split("\n")):
+        match = _HEADING.match(line)
+        if match and len(match.group(1)) > 1 and "{}" not in line:
+            headings.append((line_number, len(match.group(1)), match.group(2).strip()))
+    return headings
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "_", text.lower()).strip("_")
+
+
+def split_units(markdown: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Split a PRD into indexable units.
+    
+    A unit is the text under one ``###`` subsection, or the text of a ``##``
+    section before its first subsection. Text before the first ``##``
+    heading belongs to the "header" section.
+    
+    Returns:
+        (document title from the ``#`` heading, units), each unit a dictionary
+        with section, subsection (slug, "" for section text), occurrence
+        (of that subsection within its section), heading and text
+    """
+    title = ""
+    units: List[Dict[str, Any]] = []
+    section, subsection, heading = "header", "", "Header"
+    seen: Counter = Counter()
+    start = 0
+    
+    def close(end: int) -> None:
+        text = markdown[start:end]
+        if text.strip() or subsection:
+            key = (section, subsection)
+            units.append({
+                "section": section,
+                "subsection": subsection,
+                "occurrence": seen[key],
+                "heading": heading,
+                "text": text,
+            })
+            seen[key] += 1
+    
+    for match in _HEADING.finditer(markdown):
+        level, text = len(match.group(1)), match.group(2).strip()
+        if level == 1:
+            if not title:
+                title = text
+            continue
+        close(match.start())
+        if level == 2:
+            section, subsection, heading = section_name(text), "", text
+        else:
+            subsection, heading = subsection_name(text), text
+        start = match.end()
+    close(len(markdown))
+    return title, units
+
+
+class PRDSearchIndex:
+    """
+    Persistent inverted index of PRD sections.
+    
+    Each PRD is split into units (``###`` subsections, or ``##`` section
+    text) and every term is posted with its section name, so queries can be
+    scoped to a section such as Technical Requirements or to a subsection
+    such as Technical Constraints without touching other postings.
+    
+    Postings are stored per distinct unit text rather than per document.
+    Generated PRDs repeat most of their template text, so identical units
+    are posted once and reference-counted, which keeps the index small and
+    lets a re-indexed PRD rewrite only the units whose text changed.
+    Queries are ranked with BM25 inside SQLite, with document frequencies
+    and lengths counted per document occurrence.
+    
+    Example:
+        index = PRDSearchIndex("prd_index.sqlite3")
+        index.index_directory("prds/")
+        for hit in index.search("GDPR", section="Technical Constraints"):
+            print(hit["name"], hit["heading"], round(hit["score"], 2))
+    """
+    
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path: SQLite file holding the index (":memory:" for a temporary index)
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+    
+    def index_document(
+        self,
+        name: str,
+        markdown: str,
+        source_mtime: Optional[float] = None,
+        source_size: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Add or update one PRD.
+        
+        Args:
+            name: Unique document name (e.g. its file path)
+            markdown: PRD in Markdown format
+            source_mtime, source_size: File metadata used by index_directory
+                to skip unchanged files
+        
+        Returns:
+            Dictionary with added, updated, removed and unchanged unit counts
+        """
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                counts = self._index_document(name, markdown, source_mtime, source_size)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return counts
+    
+    def index_prd(self, name: str, input_data: Dict[str, Any], generator: Optional[PRDGenerator] = None) -> Dict[str, int]:
+        """Render input_data with PRDGenerator and index the result under name."""
+        return self.index_document(name, (generator or PRDGenerator()).generate_prd(input_data))
+    
+    def index_directory(self, directory: str, extension: str = ".md", prune: bool = True) -> Dict[str, int]:
+        """
+        Bring the index up to date with a directory of PRD files.
+        
+        Files are matched recursively by extension and named by absolute
+        path. Files whose modification time and size match the index are
+        skipped without being read.
+        
+        Args:
+            directory: Directory to scan
+            extension: File extension of PRDs
+            prune: Remove indexed documents under directory whose file is gone
+        
+        Returns:
+            Dictionary with indexed, skipped and removed file counts
+        """
+        root = os.path.abspath(directory)
+        counts = {"indexed": 0, "skipped": 0, "removed": 0}
+        with self._lock:
+            known = {
+                name: (mtime, size)
+                for name, mtime, size in self._db.execute(
+                    "SELECT name, source_mtime, source_size FROM documents WHERE name LIKE ? ESCAPE '\\'",
+                    (_like_prefix(root + os.sep),),
+                )
+            }
+            seen = set()
+            pending = 0
+            self._db.execute("BEGIN")
+            try:
+                for folder, _, files in os.walk(root):
+                    for filename in sorted(files):
+                        if not filename.endswith(extension):
+                            continue
+                        path = os.path.join(folder, filename)
+                        seen.add(path)
+                        stat = os.stat(path)
+                        if known.get(path) == (stat.st_mtime, stat.st_size):
+                            counts["skipped"] += 1
+                            continue
+                        with open(path, encoding="utf-8") as fp:
+                            self._index_document(path, fp.read(), stat.st_mtime, stat.st_size)
+                        counts["indexed"] += 1
+                        pending += 1
+                        if pending >= _COMMIT_EVERY:
+                            self._db.execute("COMMIT")
+                            self._db.execute("BEGIN")
+                            pending = 0
+                if prune:
+                    for name in known.keys() - seen:
+                        self._remove_document(name)
+                        counts["removed"] += 1
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return counts
+    
+    def remove_document(self, name: str) -> bool:
+        """Remove a document from the index; returns whether it was indexed."""
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                removed = self._remove_document(name)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return removed
+    
+    def search(
+        self,
+        query: str,
+        section: Optional[str] = None,
+        limit: int = 10,
+        match_all: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank PRD units against a query with BM25.
+        
+        Args:
+            query: Free text; every word is a search term
+            section: Optional scope, either a section ("Technical Requirements"
+                or "technical_requirements") or a subsection heading
+                ("Technical Constraints"), in any catalog locale
+            limit: Maximum hits returned
+            match_all: Only return units containing every term
+        
+        Returns:
+            Hits, best first, each with name, title, section, heading, score
+            and matched (number of query terms found in the unit)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit < 1:
+            return []
+        with self._lock:
+            sections, subsection = self._resolve_scope(section)
+            if sections is not None and not sections:
+                return []
+            section_filter = ""
+            params: List[Any] = []
+            if sections is not None:
+                section_filter = f" AND p.section IN ({', '.join('?' * len(sections))})"
+                params = list(sections)
+            
+            stats_sql = "SELECT COALESCE(SUM(units), 0), COALESCE(SUM(total_length), 0) FROM section_stats"
+            if sections is not None:
+                stats_sql += f" WHERE section IN ({', '.join('?' * len(sections))})"
+            units, total_length = self._db.execute(stats_sql, params).fetchone()
+            if not units:
+                return []
+            average_length = total_length / units or 1.0
+            
+            weighted = []
+            for term in terms:
+                frequency = self._db.execute(
+                    "SELECT COALESCE(SUM(c.refs), 0) FROM postings p"
+                    f" JOIN contents c ON c.content_id = p.content_id WHERE p.term = ?{section_filter}",
+                    [term] + params,
+                ).fetchone()[0]
+                if frequency:
+                    idf = math.log(1 + (units - frequency + 0.5) / (frequency + 0.5))
+                    weighted.append((term, idf))
+            if not weighted or (match_all and len(weighted) < len(terms)):
+                return []
+            
+            # Score distinct texts, then expand the best ones to the
+            # documents containing them until the limit is reached
+            values = ", ".join("(?, ?)" for _ in weighted)
+            sql = f"""
+                WITH q(term, idf) AS (VALUES {values})
+                SELECT p.content_id,
+                       SUM(q.idf * p.tf * ? / (p.tf + ? + ? * c.length)) AS score,
+                       COUNT(*) AS matched
+                FROM q
+                JOIN postings p ON p.term = q.term{section_filter}
+                JOIN contents c ON c.content_id = p.content_id{" AND c.subsection = ?" if subsection else ""}
+                GROUP BY p.content_id
+                {"HAVING COUNT(*) = ?" if match_all else ""}
+                ORDER BY score DESC, p.content_id
+            """
+            args: List[Any] = [value for pair in weighted for value in pair]
+            args += [_K1 + 1, _K1 * (1 - _B), _K1 * _B / average_length]
+            args += params
+            if subsection:
+                args.append(subsection)
+            if match_all:
+                args.append(len(terms))
+            
+            hits: List[Dict[str, Any]] = []
+            for content_id, score, matched in self._db.execute(sql, args).fetchall():
+                for name, title, section_key, heading in self._db.execute(
+                    "SELECT d.name, d.title, u.section, u.heading FROM units u"
+                    " JOIN documents d ON d.doc_id = u.doc_id WHERE u.content_id = ?"
+                    " ORDER BY d.name LIMIT ?",
+                    (content_id, limit - len(hits)),
+                ):
+                    hits.append({
+                        "name": name,
+                        "title": title,
+                        "section": section_key,
+                        "heading": heading,
+                        "score": score,
+                        "matched": matched,
+                    })
+                if len(hits) >= limit:
+                    break
+        return hits
+    
+    def stats(self) -> Dict[str, int]:
+        """Report documents, units, distinct unit texts, distinct terms and postings in the index."""
+        with self._lock:
+            return {
+                "documents": self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0],
+                "units": self._db.execute("SELECT COUNT(*) FROM units").fetchone()[0],
+                "distinct_units": self._db.execute("SELECT COUNT(*) FROM contents").fetchone()[0],
+                "terms": self._db.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0],
+                "postings": self._db.execute("SELECT COUNT(*) FROM postings").fetchone()[0],
+            }
+    
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def __enter__(self) -> "PRDSearchIndex":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _index_document(
+        self, name: str, markdown: str, source_mtime: Optional[float], source_size: Optional[int]
+    ) -> Dict[str, int]:
+        """Diff a document's units against the index and relink the changed ones (lock held, in a transaction)."""
+        title, units = split_units(markdown)
+        row = self._db.execute("SELECT doc_id FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            doc_id = self._db.execute(
+                "INSERT INTO documents (name, title, source_mtime, source_size) VALUES (?, ?, ?, ?)",
+                (name, title, source_mtime, source_size),
+            ).lastrowid
+            existing: Dict[tuple, tuple] = {}
+        else:
+            doc_id = row[0]
+            self._db.execute(
+                "UPDATE documents SET title = ?, source_mtime = ?, source_size = ? WHERE doc_id = ?",
+                (title, source_mtime, source_size, doc_id),
+            )
+            existing = {
+                (section, subsection, occurrence): (unit_id, content_id, digest)
+                for unit_id, section, subsection, occurrence, content_id, digest in self._db.execute(
+                    "SELECT u.unit_id, u.section, u.subsection, u.occurrence, u.content_id, c.digest"
+                    " FROM units u JOIN contents c ON c.content_id = u.content_id WHERE u.doc_id = ?",
+                    (doc_id,),
+                )
+            }
+        
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        for unit in units:
+            key = (unit["section"], unit["subsection"], unit["occurrence"])
+            digest = hashlib.blake2b(
+                "\0".join((unit["section"], unit["subsection"], unit["text"])).encode("utf-8"), digest_size=16
+            ).hexdigest()
+            previous = existing.pop(key, None)
+            if previous is not None and previous[2] == digest:
+                counts["unchanged"] += 1
+                continue
+            content_id = self._acquire_content(digest, unit)
+            if previous is not None:
+                self._release_content(previous[1])
+                self._db.execute(
+                    "UPDATE units SET heading = ?, content_id = ? WHERE unit_id = ?",
+                    (unit["heading"], content_id, previous[0]),
+                )
+                counts["updated"] += 1
+            else:
+                self._db.execute(
+                    "INSERT INTO units (doc_id, section, subsection, occurrence, heading, content_id)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc_id, unit["section"], unit["subsection"], unit["occurrence"], unit["heading"], content_id),
+                )
+                counts["added"] += 1
+        
+        for unit_id, content_id, _ in existing.values():
+            self._db.execute("DELETE FROM units WHERE unit_id = ?", (unit_id,))
+            self._release_content(content_id)
+            counts["removed"] += 1
+        return counts
+    
+    def _acquire_content(self, digest: str, unit: Dict[str, Any]) -> int:
+        """Reference a unit text, posting its terms if it is new (lock held, in a transaction)."""
+        row = self._db.execute("SELECT content_id, length FROM contents WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            content_id, length = row
+            self._db.execute("UPDATE contents SET refs = refs + 1 WHERE content_id = ?", (content_id,))
+        else:
+            tokens = tokenize(unit["text"])
+            length = len(tokens)
+            section = unit["section"]
+            content_id = self._db.execute(
+                "INSERT INTO contents (digest, section, subsection, length, refs) VALUES (?, ?, ?, ?, 1)",
+                (digest, section, unit["subsection"], length),
+            ).lastrowid
+            self._db.executemany(
+                "INSERT INTO postings (term, section, content_id, tf) VALUES (?, ?, ?, ?)",
+                [(term, section, content_id, tf) for term, tf in Counter(tokens).items()],
+            )
+        self._adjust_stats(unit["section"], 1, length)
+        return content_id
+    
+    def _release_content(self, content_id: int) -> None:
+        """Drop a reference to a unit text, deleting its postings with the last one (lock held, in a transaction)."""
+        section, length, refs = self._db.execute(
+            "SELECT section, length, refs FROM contents WHERE content_id = ?", (content_id,)
+        ).fetchone()
+        if refs > 1:
+            self._db.execute("UPDATE contents SET refs = refs - 1 WHERE content_id = ?", (content_id,))
+        else:
+            self._db.execute("DELETE FROM postings WHERE content_id = ?", (content_id,))
+            self._db.execute("DELETE FROM contents WHERE content_id = ?", (content_id,))
+        self._adjust_stats(section, -1, -length)
+    
+    def _remove_document(self, name: str) -> bool:
+        """Delete a document and release its units (lock held, in a transaction)."""
+        row = self._db.execute("SELECT doc_id FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return False
+        for (content_id,) in self._db.execute("SELECT content_id FROM units WHERE doc_id = ?", (row[0],)).fetchall():
+            self._release_content(content_id)
+        self._db.execute("DELETE FROM units WHERE doc_id = ?", (row[0],))
+        self._db.execute("DELETE FROM documents WHERE doc_id = ?", (row[0],))
+        return True
+    
+    def _adjust_stats(self, section: str, units: int, length: int) -> None:
+        self._db.execute(
+            "INSERT INTO section_stats (section, units, total_length) VALUES (?, ?, ?)"
+            " ON CONFLICT (section) DO UPDATE SET units = units + excluded.units,"
+            " total_length = total_length + excluded.total_length",
+            (section, units, length),
+        )
+    
+    def _resolve_scope(self, scope: Optional[str]) -> Tuple[Optional[List[str]], Optional[str]]:
+        """Turn a scope into (section names or None for all, subsection slug or None) (lock held)."""
+        if not scope:
+            return None, None
+        name = section_name(scope)
+        if self._db.execute("SELECT 1 FROM section_stats WHERE section = ? AND units > 0", (name,)).fetchone():
+            return [name], None
+        slug = subsection_name(scope)
+        sections = [
+            row[0] for row in self._db.execute("SELECT DISTINCT section FROM contents WHERE subsection = ?", (slug,))
+        ]
+        return sections, slug
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE pattern matching strings that start with prefix."""
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python prd_search.py", description="Index and search generated PRDs")
+    parser.add_argument("--db", default="prd_index.sqlite3", help="Index file (default: prd_index.sqlite3)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    index_parser = commands.add_parser("index", help="Index (or re-index) a directory of PRDs")
+    index_parser.add_argument("directory")
+    search_parser = commands.add_parser("search", help="Search the index")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--section", help="Section or subsection heading to search in")
+    search_parser.add_argument("--limit", type=int, default=10)
+    search_parser.add_argument("--all", action="store_true", help="Require every query term")
+    args = parser.parse_args(argv)
+    
+    with PRDSearchIndex(args.db) as index:
+        started = time.perf_counter()
+        if args.command == "index":
+            summary = index.index_directory(args.directory)
+            elapsed = time.perf_counter() - started
+            print(f"Indexed {summary['indexed']:,} files, skipped {summary['skipped']:,} unchanged, "
+                  f"removed {summary['removed']:,} in {elapsed:.1f}s")
+            return 0
+        hits = index.search(args.query, section=args.section, limit=args.limit, match_all=args.all)
+        elapsed = time.perf_counter() - started
+        for hit in hits:
+            print(f"{hit['score']:7.2f}  {hit['name']}  [{hit['heading']}]")
+        print(f"{len(hits)} hits in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""
+PRD Generation Service
+Asyncio HTTP service that renders PRDs on a bounded worker pool
+
+Usage:
+    python prd_server.py --host 127.0.0.1 --port 8080 --workers 4 --queue-size 64
+
+Endpoints:
+    POST /prd     Body: JSON shaped like sample_input.json
+                  Returns: JSON shaped like expected_output.json
+    GET  /health  Returns: queue depth, counters and latency percentiles
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+import traceback
+
+from generate_prd import PRDGenerator
+from input_schema import InputValidationError, validate_input
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+_worker_generator: Optional[PRDGenerator] = None
+
+
+def _init_worker(generator: PRDGenerator) -> None:
+    """Install the generator used by executor workers."""
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _render_payload(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one request in a worker."""
+    return _worker_generator.generate_prd_payload(input_data)
+
+
+class PRDServer:
+    """
+    Asyncio front end that offloads PRD rendering to a bounded executor.
+    
+    At most ``workers`` renders run at once and at most ``queue_size`` more
+    wait for a worker. Requests beyond that are rejected immediately with
+    503 and a Retry-After header instead of queueing without bound, which
+    keeps latency for admitted requests steady under load. A request whose
+    client resets the connection, or that exceeds ``request_timeout``, is
+    cancelled; if it has not started rendering yet it never reaches a worker.
+    A client that half-closes its side after sending the body still gets its
+    response, and bytes sent after the body are ignored. (A socket closed
+    normally looks the same as a half-close, so its render runs to the
+    timeout at most.)
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: int = 4,
+        queue_size: int = 64,
+        request_timeout: float = 30.0,
+        generator: Optional[PRDGenerator] = None,
+        use_processes: bool = False,
+    ):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            workers: Maximum concurrent renders
+            queue_size: Maximum admitted requests waiting for a worker
+            request_timeout: Seconds before an admitted request is cancelled
+            generator: Generator to render with (defaults to a new PRDGenerator)
+            use_processes: Render in worker processes instead of threads
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.queue_size = queue_size
+        self.request_timeout = request_timeout
+        self.generator = generator or PRDGenerator()
+        self.use_processes = use_processes
+        
+        self._executor: Optional[Executor] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._admitted = 0
+        self._latencies_ms: deque = deque(maxlen=2048)
+        self.stats = {"completed": 0, "rejected": 0, "cancelled": 0, "timed_out": 0, "failed": 0, "errors": 0}
+    
+    async def start(self) -> None:
+        """Bind the listening socket and start the executor."""
+        if self.use_processes:
+            # Spawned (not forked) workers so they never inherit open client
+            # sockets, which would keep connections alive after we close them
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.generator,),
+            )
+        else:
+            _init_worker(self.generator)
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prd-render")
+        self._slots = asyncio.Semaphore(self.workers)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def close(self) -> None:
+        """Stop accepting connections and shut the executor down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def health(self) -> Dict[str, Any]:
+        """Report load, counters and recent latency percentiles."""
+        latencies = sorted(self._latencies_ms)
+        
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+        
+        return {
+            "status": "ok",
+            "admitted": self._admitted,
+            "capacity": self.workers + self.queue_size,
+            **self.stats,
+            "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99)},
+        }
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP request and close the connection."""
+        try:
+            request = await _read_request(reader)
+            if request is None:
+                return
+            method, path, body = request
+            status, payload, headers = await self._dispatch(method, path, body, writer)
+            if status is not None:
+                await _write_response(writer, status, payload, headers)
+        except _HTTPError as error:
+            await _write_response(writer, error.status, {"error": error.message}, {})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def _dispatch(
+        self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter
+    ) -> Tuple[Optional[int], Any, Dict[str, str]]:
+        """Route a request to its handler."""
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET /health"}, {}
+            return 200, self.health(), {}
+        if path != "/prd":
+            return 404, {"error": f"Unknown path {path}"}, {}
+        if method != "POST":
+            return 405, {"error": "Use POST /prd"}, {}
+        
+        try:
+            input_data = json.loads(body or b"null")
+        except ValueError as error:
+            return 400, {"error": f"Invalid JSON: {error}"}, {}
+        if not isinstance(input_data, dict):
+            return 400, {"error": "Request body must be a JSON object"}, {}
+        # Reject bad inputs up front instead of spending a worker slot on them
+        errors = validate_input(input_data)
+        if errors:
+            self.stats["failed"] += 1
+            return 422, {"error": str(InputValidationError(errors)), "errors": errors}, {}
+        
+        # Backpressure: shed load instead of queueing without bound
+        if self._admitted >= self.workers + self.queue_size:
+            self.stats["rejected"] += 1
+            return 503, {"error": "Server busy, retry later"}, {"Retry-After": "1"}
+        
+        # Released by _render_when_slot_free once the request is done with the
+        # executor, which for a submitted job is when the job itself finishes
+        self._admitted += 1
+        return await self._render(input_data, writer, time.perf_counter())
+    
+    async def _render(
+        self, input_data: Dict[str, Any], writer: asyncio.StreamWriter, started: float
+    ) -> Tuple[Optional[int], Any, Dict[str, str]]:
+        """Render on the executor, cancelling on disconnect or timeout."""
+        loop = asyncio.get_running_loop()
+        render = asyncio.ensure_future(self._render_when_slot_free(loop, input_data))
+        disconnect = asyncio.ensure_future(_connection_lost(writer))
+        try:
+            done, _ = await asyncio.wait(
+                {render, disconnect}, timeout=self.request_timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            disconnect.cancel()
+        
+        if render not in done:
+            render.cancel()
+            if disconnect in done:
+                self.stats["cancelled"] += 1
+                return None, None, {}
+            self.stats["timed_out"] += 1
+            return 504, {"error": "Rendering timed out"}, {}
+        
+        try:
+            payload = render.result()
+        except ValueError as error:
+            # Input the schema accepts but rendering cannot use, such as an
+            # invalid rice_ranges distribution (InputValidationError included)
+            self.stats["failed"] += 1
+            return 422, {"error": str(error)}, {}
+        except Exception:
+            # A bug on our side: keep the details in the server log
+            self.stats["errors"] += 1
+            traceback.print_exc(file=sys.stderr)
+            return 500, {"error": "Internal error while rendering the PRD"}, {}
+        self.stats["completed"] += 1
+        self._latencies_ms.append((time.perf_counter() - started) * 1000)
+        return 200, payload, {}
+    
+    async def _render_when_slot_free(self, loop: asyncio.AbstractEventLoop, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wait for a worker slot, then render; cancelling while waiting never submits the job.
+        
+        A running executor job cannot be interrupted, so once the job is
+        submitted its slot and admission are released by the job's done
+        callback rather than here. A request that times out or disconnects
+        keeps counting against capacity until its render actually stops, and
+        repeated timeouts cannot pile work up behind the executor.
+        """
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            self._admitted -= 1
+            raise
+        try:
+            job = loop.run_in_executor(self._executor, _render_payload, input_data)
+        except BaseException:
+            self._release_slot()
+            raise
+        job.add_done_callback(self._release_slot)
+        # Shielded so cancelling this request does not mark the job done early
+        return await asyncio.shield(job)
+    
+    def _release_slot(self, job: Optional[asyncio.Future] = None) -> None:
+        """Free a worker slot and its admission when a render job finishes."""
+        self._slots.release()
+        self._admitted -= 1
+        if job is not None and not job.cancelled():
+            # Retrieve the error of a job whose request already gave up on it
+            job.exception()
+
+
+class _HTTPError(Exception):
+    """Malformed request that should be answered with an error status."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes]]:
+    """Read an HTTP/1.1 request line, headers and body."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise _HTTPError(400, "Malformed request line")
+    
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise _HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise _HTTPError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], body
+
+
+async def _connection_lost(writer: asyncio.StreamWriter) -> None:
+    """
+    Return once the connection is gone (reset or closed under us).
+    
+    The request has been read in full, so reading on would mistake a
+    half-close (EOF) or pipelined bytes for a disconnect. The transport
+    keeps reading in the background and closes on a reset, which is what
+    this waits for.
+    """
+    try:
+        # Shielded: the close waiter is shared with _handle_connection, and
+        # cancelling this watch must not cancel it
+        await asyncio.shield(writer.wait_closed())
+    except ConnectionError:
+        pass
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, headers: Dict[str, str]) -> None:
+    """Write a JSON HTTP response."""
+    body = json.dumps(payload).encode("utf-8")
+    head = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}"]
+    head += [f"{name}: {value}" for name, value in headers.items()]
+    head += [
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve PRD generation over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent renders")
+    parser.add_argument("--queue-size", type=int, default=64, help="Requests allowed to wait for a worker")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--processes", action="store_true", help="Render in worker processes")
+    args = parser.parse_args()
+    
+    server = PRDServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        request_timeout=args.timeout,
+        use_processes=args.processes,
+    )
+    
+    async def run() -> None:
+        await server.start()
+        print(f"Serving PRD generation on http://{server.host}:{server.port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Research Extracts
+Condenses large research files (interview transcripts, competitive analyses)
+into a bounded set of key findings in one memory-mapped pass
+"""
+
+from typing import Dict, List, Any, Optional
+from functools import lru_cache
+import heapq
+import mmap
+import os
+import re
+
+# Input fields that may be given as file references
+RESEARCH_FIELDS = ("user_research_summary", "competitive_landscape")
+
+# Findings kept in an extract unless the reference asks for another number
+DEFAULT_MAX_SENTENCES = 5
+
+# Distinct terms tracked while scanning; rarer terms are forgotten
+TERM_CAPACITY = 20_000
+
+# Candidate sentences kept per finding while scanning
+CANDIDATES_PER_FINDING = 8
+
+# Recurring themes listed with an extract
+THEME_COUNT = 6
+
+MIN_WORDS = 6
+
+MAX_FINDING_CHARS = 280
+
+# Weight of one key-finding cue relative to the term-frequency score (0-1)
+CUE_WEIGHT = 0.5
+
+MAX_CUES = 3
+
+# Findings sharing at least this fraction of their terms count as repeats
+REDUNDANCY = 0.5
+
+# A sentence ends at ., ! or ? followed by whitespace, or at a line break,
+# so decimals ("3.5") and dotted abbreviations stay inside their sentence
+_SENTENCE = re.compile(rb"(?:[^\r\n.!?]|[.!?]+(?=[^\s.!?]))+[.!?]*")
+
+# Transcript speaker labels ("P12:", "Interviewer:", "[00:14:02] Maria:")
+_SPEAKER = re.compile(rb"\s*(?:\[[\d:.]+\]\s*)?[A-Z][\w.'-]{0,23}:\s+")
+
+# Terms are lowercase words of three or more letters
+_WORD = re.compile(r"[a-z][a-z'-]+[a-z]")
+
+# Words that mark a sentence as reporting a finding rather than small talk;
+# a percentage counts as one more cue
+_CUE_WORDS = frozenset("""
+    finding findings insight insights pain painful frustrated frustrating frustration struggle
+    struggled struggles struggling confused confusing confusion wish wished wishes need needed
+    needs want wanted wants problem problems blocker blockers churn churned churning workaround
+    workarounds cancel canceled cancelled cancelling switch switched switching most majority every
+""".split())
+
+_STOPWORDS = frozenset("""
+    about above after again against all also and any are aren't because been before being below
+    between both but can can't cannot could couldn't did didn't does doesn't doing don't down during
+    each few for from further had hadn't has hasn't have haven't having her here hers herself him
+    himself his how i'd i'll i'm i've into isn't it's its itself just let's like me more mostly much
+    must mustn't myself nor not now off once only other ought our ours ourselves out over own really
+    same shan't she she'd she'll she's should shouldn't some such than that that's the their theirs
+    them themselves then there there's these they they'd they'll they're they've this those through
+    too under until very was wasn't we'd we'll we're we've were weren't what what's when when's where
+    where's which while who who's whom why why's will with won't would wouldn't yeah yes you you'd
+    you'll you're you've your yours yourself yourselves okay gonna kind sort thing things think
+    know going get got well right one two even still lot lots maybe
+""".split())
+
+
+class ResearchExtract:
+    """
+    Bounded summary of one research file.
+    
+    Attributes:
+        path: File the extract was taken from (as referenced in the input)
+        size: File size in bytes
+        sentences: Sentences scanned
+        findings: Highest-ranked sentences, in file order
+        themes: Most frequent terms across the whole file
+    """
+    
+    __slots__ = ("path", "size", "sentences", "findings", "themes")
+    
+    def __init__(self, path: str, size: int, sentences: int, findings: List[str], themes: List[str]):
+        self.path = path
+        self.size = size
+        self.sentences = sentences
+        self.findings = findings
+        self.themes = themes
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "size": self.size,
+            "sentences": self.sentences,
+            "findings": list(self.findings),
+            "themes": list(self.themes),
+        }
+    
+    def __repr__(self) -> str:
+        return f"ResearchExtract({self.path!r}, {len(self.findings)} findings of {self.sentences} sentences)"
+
+
+class _TermCounter:
+    """
+    Approximate term frequencies in bounded memory (Misra-Gries summary).
+    
+    At most ``capacity`` terms are tracked. When a new term arrives and the
+    table is full, every count drops by one and exhausted terms are removed,
+    so frequent terms survive with counts low by at most n / capacity.
+    The total work stays linear in the number of terms seen.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.highest = 0
+    
+    def add(self, term: str):
+        counts = self.counts
+        count = counts.get(term)
+        if count is not None:
+            count += 1
+        elif len(counts) < self.capacity:
+            count = 1
+        else:
+            for tracked in list(counts):
+                if counts[tracked] == 1:
+                    del counts[tracked]
+                else:
+                    counts[tracked] -= 1
+            self.highest = max(self.highest - 1, 0)
+            return
+        counts[term] = count
+        if count > self.highest:
+            self.highest = count
+    
+    def update(self, terms: List[str]):
+        counts = self.counts
+        for term in terms:
+            count = counts.get(term)
+            if count is None:
+                self.add(term)
+            else:
+                counts[term] = count = count + 1
+                if count > self.highest:
+                    self.highest = count
+    
+    def weight(self, terms: frozenset) -> float:
+        """Mean frequency of the terms, relative to the most frequent term (0-1)."""
+        if not terms or not self.highest:
+            return 0.0
+        counts = self.counts
+        return sum(counts.get(term, 0) for term in terms) / (len(terms) * self.highest)
+    
+    def most_common(self, count: int) -> List[str]:
+        return [term for term, _ in heapq.nlargest(count, self.counts.items(), key=lambda item: item[1])]
+
+
+def is_reference(value: Any) -> bool:
+    """True when a research field is given as a file reference ({"path": ...})."""
+    return isinstance(value, dict) and "path" in value
+
+
+def reference_error(value: Any) -> Optional[str]:
+    """Why a research field reference cannot be read, or None (also for inline text)."""
+    if not is_reference(value) or not isinstance(value["path"], str):
+        return None
+    path = value["path"]
+    if not os.path.isfile(path):
+        return f"file not found: {path}"
+    if not os.access(path, os.R_OK):
+        return f"file is not readable: {path}"
+    return None
+
+
+def reference_stamp(value: Any) -> Any:
+    """
+    Identify the current contents of a referenced file for cache keys.
+    
+    References gain the file's size and modification time, so cached PRDs
+    are re-rendered when the file changes; other values are returned as is.
+    """
+    if not is_reference(value):
+        return value
+    try:
+        stat = os.stat(value["path"])
+    except OSError:
+        return value
+    return dict(value, _stat=[stat.st_size, stat.st_mtime_ns])
+
+
+def condense_reference(value: Dict[str, Any]) -> ResearchExtract:
+    """
+    Condense the file behind a research field reference.
+    
+    Args:
+        value: Reference with "path" and optionally "max_sentences"
+    
+    Returns:
+        The file's ResearchExtract (cached until the file changes)
+    """
+    path = value["path"]
+    stat = os.stat(path)
+    max_sentences = int(value.get("max_sentences", DEFAULT_MAX_SENTENCES))
+    return _condense_cached(path, stat.st_size, stat.st_mtime_ns, max_sentences)
+
+
+@lru_cache(maxsize=64)
+def _condense_cached(path: str, size: int, mtime_ns: int, max_sentences: int) -> ResearchExtract:
+    """Condense a file once per (path, size, mtime)."""
+    return condense_file(path, max_sentences)
+
+
+def condense_file(path: str, max_sentences: int = DEFAULT_MAX_SENTENCES,
+                  term_capacity: int = TERM_CAPACITY) -> ResearchExtract:
+    """
+    Extract the key findings of a research file in one linear scan.
+    
+    The file is memory-mapped and split into sentences by a regular
+    expression running over the mapping, so only the current sentence is
+    ever copied out of it. During the scan each sentence is scored by its
+    key-finding cues ("pain", "struggled", "workaround", percentages...) plus the
+    frequency of its terms so far, and the best few per finding are kept as
+    candidates. The final ranking re-scores those candidates against the
+    whole-file term frequencies. Memory use depends on ``max_sentences`` and
+    ``term_capacity``, not on the file size.
+    
+    Args:
+        path: UTF-8 text file (undecodable bytes are replaced)
+        max_sentences: Findings to keep
+        term_capacity: Distinct terms tracked for frequency ranking
+    
+    Returns:
+        ResearchExtract with the findings in file order
+    
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return ResearchExtract(path, 0, 0, [], [])
+    
+    terms = _TermCounter(term_capacity)
+    pool_size = max(max_sentences, 1) * CANDIDATES_PER_FINDING
+    # Min-heap of (provisional score, -position, position, text, terms, cues);
+    # pooled holds the term sets in it so repeated sentences are kept once
+    candidates: List[tuple] = []
+    pooled = set()
+    sentences = 0
+    
+    with open(path, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        if hasattr(mapping, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapping.madvise(mmap.MADV_SEQUENTIAL)
+        for match in _SENTENCE.finditer(mapping):
+            raw = match.group()
+            label = _SPEAKER.match(raw)
+            if label is not None:
+                raw = raw[label.end():]
+            tokens = raw.split()
+            if len(tokens) < MIN_WORDS or raw.endswith(b"?"):
+                # Fragments and (interviewer) questions are not findings
+                continue
+            sentences += 1
+            words = [word for word in _WORD.findall(raw.decode("utf-8", "replace").lower())
+                     if word not in _STOPWORDS]
+            distinct = frozenset(words)
+            if distinct in pooled:
+                terms.update(words)
+                continue
+            cues = min(len(distinct & _CUE_WORDS) + (b"%" in raw), MAX_CUES)
+            score = terms.weight(distinct) + CUE_WEIGHT * cues
+            terms.update(words)
+            if len(candidates) >= pool_size and score <= candidates[0][0]:
+                continue
+            entry = (score, -sentences, sentences, b" ".join(tokens).decode("utf-8", "replace"), distinct, cues)
+            pooled.add(distinct)
+            if len(candidates) < pool_size:
+                heapq.heappush(candidates, entry)
+            else:
+                pooled.discard(heapq.heapreplace(candidates, entry)[4])
+    
+    findings: List[tuple] = []
+    for entry in sorted(candidates, key=lambda entry: (terms.weight(entry[4]) + CUE_WEIGHT * entry[5], -entry[2]),
+                        reverse=True):
+        if len(findings) == max_sentences:
+            break
+        if not any(_overlap(entry[4], chosen[4]) >= REDUNDANCY for chosen in findings):
+            findings.append(entry)
+    findings.sort(key=lambda entry: entry[2])
+    return ResearchExtract(path, size, sentences, [_clip(entry[3]) for entry in findings],
+                           terms.most_common(THEME_COUNT))
+
+
+def format_size(size: int) -> str:
+    """Human-readable file size (e.g. "312.4 MB")."""
+    if size < 1000:
+        return f"{size} B"
+    value = float(size)
+    for unit in ("KB", "MB", "GB"):
+        value /= 1000
+        if value < 1000 or unit == "GB":
+            break
+    return f"{value:.1f} {unit}"
+
+
+def source_link(path: str) -> str:
+    """Markdown link target for a file path."""
+    return path.replace("\\", "/").replace(" ", "%20").replace("(", "%28").replace(")", "%29")
+
+
+def _overlap(first: frozenset, second: frozenset) -> float:
+    """Jaccard similarity of two term sets."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def _clip(text: str) -> str:
+    if len(text) <= MAX_FINDING_CHARS:
+        return text
+    return text[:MAX_FINDING_CHARS].rsplit(" ", 1)[0] + "..."
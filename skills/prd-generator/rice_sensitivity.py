@@ -0,0 +1,488 @@
+"""
+RICE Sensitivity Analysis
+Monte Carlo sampling of RICE scores from ranged estimates, with score
+percentiles per feature and rank stability across a backlog
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import bisect
+import math
+import random
+
+try:  # NumPy is optional; sampling is vectorized when it is available
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+RICE_PARAMETERS = ("reach", "impact", "confidence", "effort")
+
+DEFAULT_SAMPLES = 100_000
+# Without NumPy every draw is a Python call, so default to fewer samples
+FALLBACK_SAMPLES = 10_000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# z-score of the 95th percentile, used to turn a 90% interval into a lognormal
+_Z_90 = 1.6448536269514722
+
+# Score matrix rows sampled at once: keeps each batch around 32 MB of float64
+_BATCH_ELEMENTS = 4_000_000
+
+
+def parse_distribution(value: Any, name: str = "value") -> Tuple:
+    """
+    Normalize an estimate into a distribution tuple.
+    
+    Accepted forms:
+        - A number: point estimate
+        - [low, high]: uniform range
+        - [low, mode, high]: triangular range
+        - {"distribution": "uniform", "low": ..., "high": ...}
+        - {"distribution": "triangular", "low": ..., "mode": ..., "high": ...}
+        - {"distribution": "normal", "mean": ..., "sd": ...} (clipped at 0)
+        - {"distribution": "lognormal", "low": ..., "high": ...} (90% interval)
+    
+    Args:
+        value: Estimate in one of the forms above
+        name: Parameter name used in error messages
+    
+    Returns:
+        ("point", value), ("uniform", low, high), ("triangular", low, mode, high),
+        ("normal", mean, sd) or ("lognormal", mu, sigma)
+    
+    Raises:
+        ValueError: If the estimate is malformed
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return ("point", float(value))
+    
+    if isinstance(value, (list, tuple)):
+        if len(value) == 2:
+            value = {"distribution": "uniform", "low": value[0], "high": value[1]}
+        elif len(value) == 3:
+            value = {"distribution": "triangular", "low": value[0], "mode": value[1], "high": value[2]}
+        else:
+            raise ValueError(f"{name}: a range needs [low, high] or [low, mode, high]")
+    
+    if not isinstance(value, dict):
+        raise ValueError(f"{name}: expected a number, a range or a distribution object")
+    
+    kind = value.get("distribution", "triangular" if "mode" in value else "uniform")
+    try:
+        if kind == "uniform":
+            low, high = float(value["low"]), float(value["high"])
+            if low > high:
+                raise ValueError(f"{name}: low must not exceed high")
+            return ("point", low) if low == high else ("uniform", low, high)
+        if kind == "triangular":
+            low, mode, high = float(value["low"]), float(value["mode"]), float(value["high"])
+            if not low <= mode <= high:
+                raise ValueError(f"{name}: triangular range needs low <= mode <= high")
+            return ("point", low) if low == high else ("triangular", low, mode, high)
+        if kind == "normal":
+            mean, sd = float(value["mean"]), float(value["sd"])
+            if sd < 0:
+                raise ValueError(f"{name}: sd must not be negative")
+            return ("point", max(mean, 0.0)) if sd == 0 else ("normal", mean, sd)
+        if kind == "lognormal":
+            low, high = float(value["low"]), float(value["high"])
+            if not 0 < low <= high:
+                raise ValueError(f"{name}: lognormal range needs 0 < low <= high")
+            mu = (math.log(low) + math.log(high)) / 2
+            sigma = (math.log(high) - math.log(low)) / (2 * _Z_90)
+            return ("point", low) if sigma == 0 else ("lognormal", mu, sigma)
+    except KeyError as missing:
+        raise ValueError(f"{name}: {kind} distribution needs {missing.args[0]!r}") from None
+    except (TypeError, ValueError) as exc:
+        if str(exc).startswith(name):
+            raise
+        raise ValueError(f"{name}: distribution parameters must be numbers") from None
+    raise ValueError(f"{name}: unknown distribution {kind!r}")
+
+
+def point_value(distribution: Tuple) -> float:
+    """Central value of a distribution, used for the point-estimate score."""
+    kind = distribution[0]
+    if kind == "point":
+        return distribution[1]
+    if kind == "uniform":
+        return (distribution[1] + distribution[2]) / 2
+    if kind == "triangular":
+        return distribution[2]
+    if kind == "normal":
+        return max(distribution[1], 0.0)
+    return math.exp(distribution[1])  # lognormal median
+
+
+def simulate_rice(
+    features: List[Dict[str, Any]],
+    samples: Optional[int] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    top_k: int = 10,
+    rank_samples: int = 1000,
+    seed: Optional[int] = 0,
+    apply_confidence: bool = True,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo RICE sensitivity analysis for a backlog.
+    
+    Each feature's reach, impact, confidence and effort may be a point
+    estimate or a distribution (see parse_distribution). Every feature gets
+    ``samples`` independent draws, sampled in vectorized batches with NumPy;
+    the first ``rank_samples`` draws of all features form joint scenarios in
+    which the whole backlog is re-ranked to measure rank stability.
+    
+    Args:
+        features: Feature dictionaries with "name" and the four RICE parameters
+        samples: Draws per feature (default 100,000; 10,000 without NumPy)
+        percentiles: Score percentiles to report (0-100)
+        top_k: Size of the "top k" used for rank stability
+        rank_samples: Joint scenarios used for rank statistics
+        seed: Random seed (None for a fresh seed each call)
+        apply_confidence: Multiply by confidence as in plain RICE; turn off
+            when reach, impact and effort ranges already express uncertainty
+    
+    Returns:
+        Dictionary with:
+            - samples, rank_samples, seed
+            - features: per feature (input order) name, point_score, mean, std,
+              percentiles {"p5": ...}, point_rank, rank_percentiles
+              {"p5", "p50", "p95"} and top_k_probability
+            - ranking: top_k, spearman_mean and spearman_p5 (rank correlation
+              of sampled rankings with the point ranking) and top_k_overlap
+              (mean share of the point top k that stays in the sampled top k)
+    
+    Raises:
+        ValueError: If a feature has a malformed estimate
+    """
+    if samples is None:
+        samples = DEFAULT_SAMPLES if np is not None else FALLBACK_SAMPLES
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    rank_samples = max(1, min(rank_samples, samples))
+    
+    distributions = []
+    for index, feature in enumerate(features):
+        label = feature.get("name", f"feature {index}")
+        distributions.append([
+            parse_distribution(feature.get(parameter, 1.0 if parameter == "confidence" else 0.0), f"{label}.{parameter}")
+            for parameter in RICE_PARAMETERS
+        ])
+    
+    point_scores = [_rice(*(point_value(d) for d in dists), apply_confidence) for dists in distributions]
+    if np is not None:
+        stats, ranks = _simulate_numpy(distributions, samples, percentiles, rank_samples, seed, apply_confidence)
+    else:
+        stats, ranks = _simulate_python(distributions, samples, percentiles, rank_samples, seed, apply_confidence)
+    
+    count = len(features)
+    point_order = sorted(range(count), key=lambda index: (-point_scores[index], index))
+    point_rank = [0] * count
+    for rank, index in enumerate(point_order):
+        point_rank[index] = rank
+    ranking = _rank_stability(ranks, point_rank, top_k)
+    
+    results = []
+    for index, feature in enumerate(features):
+        rank_stats = ranking["per_feature"][index]
+        results.append({
+            "name": feature.get("name"),
+            "point_score": point_scores[index],
+            "mean": stats[index]["mean"],
+            "std": stats[index]["std"],
+            "percentiles": stats[index]["percentiles"],
+            "point_rank": point_rank[index] + 1,
+            "rank_percentiles": rank_stats["rank_percentiles"],
+            "top_k_probability": rank_stats["top_k_probability"],
+        })
+    
+    return {
+        "samples": samples,
+        "rank_samples": rank_samples,
+        "seed": seed,
+        "features": results,
+        "ranking": ranking["summary"],
+    }
+
+
+def rice_interval(
+    reach: Any,
+    impact: Any,
+    confidence: Any,
+    effort: Any,
+    samples: Optional[int] = None,
+    percentiles: Sequence[float] = (5, 50, 95),
+    seed: Optional[int] = 0,
+) -> Dict[str, float]:
+    """
+    Score percentiles for a single feature with ranged estimates.
+    
+    Args:
+        reach, impact, confidence, effort: Point estimates or distributions
+        samples: Draws (default 100,000; 10,000 without NumPy)
+        percentiles: Percentiles to report (0-100)
+        seed: Random seed (fixed by default so documents are reproducible)
+    
+    Returns:
+        Mapping such as {"p5": ..., "p50": ..., "p95": ...} plus "samples"
+    """
+    result = simulate_rice(
+        [{"reach": reach, "impact": impact, "confidence": confidence, "effort": effort}],
+        samples=samples,
+        percentiles=percentiles,
+        rank_samples=1,
+        seed=seed,
+    )
+    band = dict(result["features"][0]["percentiles"])
+    band["samples"] = result["samples"]
+    return band
+
+
+def _rice(reach: float, impact: float, confidence: float, effort: float, apply_confidence: bool) -> float:
+    """RICE for one draw; zero effort scores 0 as in calculate_rice_score."""
+    if effort <= 0:
+        return 0.0
+    return reach * impact * (confidence if apply_confidence else 1.0) / effort
+
+
+def _percentile_key(percentile: float) -> str:
+    """Format a percentile as a result key ("p5", "p97.5")."""
+    return f"p{percentile:g}"
+
+
+def _simulate_numpy(
+    distributions: List[List[Tuple]],
+    samples: int,
+    percentiles: Sequence[float],
+    rank_samples: int,
+    seed: Optional[int],
+    apply_confidence: bool,
+) -> Tuple[List[Dict[str, Any]], Any]:
+    """Sample scores in row batches; returns per-feature stats and the joint rank-sample matrix."""
+    rng = np.random.default_rng(seed)
+    count = len(distributions)
+    batch_rows = max(1, _BATCH_ELEMENTS // samples)
+    joint = np.empty((count, rank_samples), dtype=np.float64)
+    stats: List[Dict[str, Any]] = []
+    kth = sorted({index for p in percentiles for index in _percentile_bounds(samples, p)[:2]})
+    
+    for start in range(0, count, batch_rows):
+        rows = distributions[start:start + batch_rows]
+        scores = np.ones((len(rows), samples), dtype=np.float64)
+        effort = np.empty_like(scores)
+        draw = np.empty(samples, dtype=np.float64)
+        for row, dists in enumerate(rows):
+            reach, impact, confidence, effort_dist = dists
+            for dist in (reach, impact, confidence) if apply_confidence else (reach, impact):
+                if dist[0] == "point":
+                    scores[row] *= dist[1]
+                else:
+                    _draw_numpy(rng, dist, draw)
+                    scores[row] *= draw
+            if effort_dist[0] == "point":
+                effort[row] = effort_dist[1]
+            else:
+                _draw_numpy(rng, effort_dist, effort[row])
+        # Zero (or clipped negative) effort scores 0, as in calculate_rice_score
+        positive = effort > 0
+        np.divide(scores, effort, out=scores, where=positive)
+        scores[~positive] = 0.0
+        
+        joint[start:start + len(rows)] = scores[:, :rank_samples]
+        means = scores.mean(axis=1)
+        stds = np.sqrt(np.maximum(np.einsum("ij,ij->i", scores, scores) / samples - means * means, 0.0))
+        # Only the ranks either side of each percentile are read, so the rows
+        # are partitioned around them instead of fully sorted
+        _select_ranks(scores, kth, 0, samples)
+        values = [_interpolated_percentile(scores.T, p) for p in percentiles]
+        for row in range(len(rows)):
+            stats.append({
+                "mean": float(means[row]),
+                "std": float(stds[row]),
+                "percentiles": {_percentile_key(p): float(values[i][row]) for i, p in enumerate(percentiles)},
+            })
+    
+    # Rank features within each joint scenario (0 = best); stable sort keeps
+    # ties in input order, matching the point ranking
+    order = np.argsort(-joint, axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(count)[:, None], axis=0)
+    return stats, ranks
+
+
+def _select_ranks(scores: Any, kth: List[int], start: int, stop: int) -> None:
+    """
+    Partition scores[:, start:stop] in place so every rank in kth holds its sorted value.
+    
+    ndarray.partition with several kth values is slower than one full sort,
+    so this bisects: one single-rank partition at the middle rank, then each
+    side is handled separately on its own shorter slice.
+    """
+    if not kth:
+        return
+    middle = len(kth) // 2
+    rank = kth[middle]
+    scores[:, start:stop].partition(rank - start, axis=1)
+    _select_ranks(scores, kth[:middle], start, rank)
+    _select_ranks(scores, kth[middle + 1:], rank + 1, stop)
+
+
+def _draw_numpy(rng: Any, dist: Tuple, out: Any) -> None:
+    """Fill out with draws from a parsed distribution."""
+    kind = dist[0]
+    size = out.shape[0]
+    if kind == "uniform":
+        out[:] = rng.uniform(dist[1], dist[2], size)
+    elif kind == "triangular":
+        out[:] = rng.triangular(dist[1], dist[2], dist[3], size)
+    elif kind == "normal":
+        rng.standard_normal(size, out=out)
+        out *= dist[2]
+        out += dist[1]
+        np.maximum(out, 0.0, out=out)
+    else:  # lognormal
+        rng.standard_normal(size, out=out)
+        out *= dist[2]
+        out += dist[1]
+        np.exp(out, out=out)
+
+
+def _simulate_python(
+    distributions: List[List[Tuple]],
+    samples: int,
+    percentiles: Sequence[float],
+    rank_samples: int,
+    seed: Optional[int],
+    apply_confidence: bool,
+) -> Tuple[List[Dict[str, Any]], List[List[int]]]:
+    """Standard-library version of _simulate_numpy."""
+    rng = random.Random(seed)
+    count = len(distributions)
+    joint: List[List[float]] = []
+    stats: List[Dict[str, Any]] = []
+    
+    for dists in distributions:
+        samplers = [_python_sampler(rng, dist) for dist in dists]
+        draw_reach, draw_impact, draw_confidence, draw_effort = samplers
+        scores = [
+            _rice(draw_reach(), draw_impact(), draw_confidence(), draw_effort(), apply_confidence)
+            for _ in range(samples)
+        ]
+        joint.append(scores[:rank_samples])
+        mean = math.fsum(scores) / samples
+        std = math.sqrt(max(math.fsum(score * score for score in scores) / samples - mean * mean, 0.0))
+        scores.sort()
+        stats.append({
+            "mean": mean,
+            "std": std,
+            "percentiles": {_percentile_key(p): _interpolated_percentile(scores, p) for p in percentiles},
+        })
+    
+    ranks = [[0] * rank_samples for _ in range(count)]
+    for column in range(rank_samples):
+        order = sorted(range(count), key=lambda index: -joint[index][column])
+        for rank, index in enumerate(order):
+            ranks[index][column] = rank
+    return stats, ranks
+
+
+def _python_sampler(rng: random.Random, dist: Tuple):
+    """Return a zero-argument callable drawing from a parsed distribution."""
+    kind = dist[0]
+    if kind == "point":
+        value = dist[1]
+        return lambda: value
+    if kind == "uniform":
+        return lambda: rng.uniform(dist[1], dist[2])
+    if kind == "triangular":
+        # random.triangular takes (low, high, mode)
+        return lambda: rng.triangular(dist[1], dist[3], dist[2])
+    if kind == "normal":
+        return lambda: max(rng.gauss(dist[1], dist[2]), 0.0)
+    return lambda: rng.lognormvariate(dist[1], dist[2])
+
+
+def _interpolated_percentile(ordered: Any, percentile: float) -> Any:
+    """
+    Linear-interpolated percentile of sorted values (NumPy's default method).
+    
+    ``ordered`` may also be a 2-D array sorted along its first axis, giving
+    one percentile per column. Only the two ranks from _percentile_bounds
+    need to be in sorted position, so a partitioned array works too.
+    """
+    lower, upper, fraction = _percentile_bounds(len(ordered), percentile)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def _percentile_bounds(size: int, percentile: float) -> Tuple[int, int, float]:
+    """Ranks either side of a percentile in ``size`` sorted values, and the weight of the upper one."""
+    position = (size - 1) * percentile / 100
+    lower = math.floor(position)
+    return lower, min(lower + 1, size - 1), position - lower
+
+
+def _rank_stability(ranks: Any, point_rank: List[int], top_k: int) -> Dict[str, Any]:
+    """Summarize sampled ranks against the point-estimate ranking."""
+    count = len(point_rank)
+    top_k = max(1, min(top_k, count)) if count else 0
+    if count == 0:
+        return {"per_feature": [], "summary": {"top_k": 0, "spearman_mean": None, "spearman_p5": None, "top_k_overlap": None}}
+    
+    if np is not None:
+        rank_matrix = np.asarray(ranks)
+        rank_pcts = np.percentile(rank_matrix, (5, 50, 95), axis=1) + 1
+        top_probability = (rank_matrix < top_k).mean(axis=1)
+        point = np.asarray(point_rank)[:, None]
+        if count > 1:
+            squared = ((rank_matrix - point) ** 2).sum(axis=0, dtype=np.float64)
+            spearman = 1 - 6 * squared / (count * (count * count - 1))
+            spearman_mean, spearman_p5 = float(spearman.mean()), float(np.percentile(spearman, 5))
+        else:
+            spearman_mean = spearman_p5 = 1.0
+        in_point_top = np.asarray(point_rank) < top_k
+        overlap = float((rank_matrix[in_point_top] < top_k).sum(axis=0).mean() / top_k)
+        per_feature = [
+            {
+                "rank_percentiles": {
+                    "p5": float(rank_pcts[0, index]),
+                    "p50": float(rank_pcts[1, index]),
+                    "p95": float(rank_pcts[2, index]),
+                },
+                "top_k_probability": float(top_probability[index]),
+            }
+            for index in range(count)
+        ]
+    else:
+        columns = len(ranks[0])
+        per_feature = []
+        for index in range(count):
+            ordered = sorted(ranks[index])
+            per_feature.append({
+                "rank_percentiles": {
+                    f"p{p}": _interpolated_percentile(ordered, p) + 1 for p in (5, 50, 95)
+                },
+                "top_k_probability": bisect.bisect_left(ordered, top_k) / columns,
+            })
+        spearman = []
+        overlap_total = 0
+        point_top = [index for index in range(count) if point_rank[index] < top_k]
+        for column in range(columns):
+            if count > 1:
+                squared = sum((ranks[index][column] - point_rank[index]) ** 2 for index in range(count))
+                spearman.append(1 - 6 * squared / (count * (count * count - 1)))
+            else:
+                spearman.append(1.0)
+            overlap_total += sum(1 for index in point_top if ranks[index][column] < top_k)
+        spearman.sort()
+        spearman_mean = math.fsum(spearman) / columns
+        spearman_p5 = _interpolated_percentile(spearman, 5)
+        overlap = overlap_total / (columns * top_k)
+    
+    return {
+        "per_feature": per_feature,
+        "summary": {
+            "top_k": top_k,
+            "spearman_mean": spearman_mean,
+            "spearman_p5": spearman_p5,
+            "top_k_overlap": overlap,
+        },
+    }
@@ -0,0 +1,127 @@
+"""
+PRD Section Metrics
+Aggregates section hook events from PRDGenerator into latency histograms
+"""
+
+from typing import Any, Dict, List, Optional
+from bisect import bisect_left
+import threading
+
+# Histogram bucket upper bounds in microseconds (1-2-5 steps up to 10 seconds)
+LATENCY_BUCKETS_US: List[float] = [
+    scale * step
+    for scale in (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+    for step in (1, 2, 5)
+] + [10_000_000, float("inf")]
+
+
+class SectionMetrics:
+    """
+    Section hook that keeps per-section latency histograms and size totals.
+    
+    Register an instance with ``PRDGenerator.add_section_hook``. Recording an
+    event is a bisect and a few additions, so it can stay enabled in
+    production; call ``summary()`` to read percentiles and totals.
+    
+    Example:
+        metrics = SectionMetrics()
+        generator.add_section_hook(metrics)
+        generator.generate_prd(input_data)
+        print(metrics.summary()["success_metrics"]["p95_us"])
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sections: Dict[str, Dict[str, Any]] = {}
+    
+    def __call__(self, event: Dict[str, Any]) -> None:
+        """Record one section hook event."""
+        micros = event["seconds"] * 1e6
+        bucket = bisect_left(LATENCY_BUCKETS_US, micros)
+        with self._lock:
+            stats = self._sections.get(event["section"])
+            if stats is None:
+                stats = self._sections[event["section"]] = {
+                    "title": event["title"],
+                    "count": 0,
+                    "total_us": 0.0,
+                    "max_us": 0.0,
+                    "output_chars": 0,
+                    "allocated_bytes": 0,
+                    "max_peak_bytes": None,
+                    "histogram": [0] * len(LATENCY_BUCKETS_US),
+                }
+            stats["count"] += 1
+            stats["total_us"] += micros
+            stats["output_chars"] += event["output_chars"]
+            if micros > stats["max_us"]:
+                stats["max_us"] = micros
+            stats["histogram"][bucket] += 1
+            if event.get("allocated_bytes") is not None:
+                stats["allocated_bytes"] += event["allocated_bytes"]
+                stats["max_peak_bytes"] = max(stats["max_peak_bytes"] or 0, event["peak_bytes"])
+    
+    def histogram(self, section: str) -> List[Dict[str, Any]]:
+        """
+        Return the non-empty latency buckets for a section.
+        
+        Args:
+            section: Section name from the registry (e.g. "success_metrics")
+        
+        Returns:
+            List of {"le_us": bucket upper bound, "count": events} entries
+        """
+        with self._lock:
+            stats = self._sections.get(section)
+            counts = list(stats["histogram"]) if stats else []
+        return [
+            {"le_us": bound, "count": count}
+            for bound, count in zip(LATENCY_BUCKETS_US, counts) if count
+        ]
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize every section seen so far.
+        
+        Percentiles are estimated as the upper bound of the bucket that
+        contains them, so they are accurate to the bucket resolution.
+        
+        Returns:
+            Mapping of section name to count, mean_us, p50_us, p95_us, p99_us,
+            max_us, mean_output_chars and (with allocation tracing) allocation totals
+        """
+        with self._lock:
+            snapshot = {name: dict(stats, histogram=list(stats["histogram"])) for name, stats in self._sections.items()}
+        
+        summary = {}
+        for name, stats in snapshot.items():
+            count = stats["count"]
+            summary[name] = {
+                "title": stats["title"],
+                "count": count,
+                "mean_us": stats["total_us"] / count,
+                "p50_us": _bucket_percentile(stats["histogram"], count, 0.50, stats["max_us"]),
+                "p95_us": _bucket_percentile(stats["histogram"], count, 0.95, stats["max_us"]),
+                "p99_us": _bucket_percentile(stats["histogram"], count, 0.99, stats["max_us"]),
+                "max_us": stats["max_us"],
+                "mean_output_chars": stats["output_chars"] / count,
+                "allocated_bytes": stats["allocated_bytes"] if stats["max_peak_bytes"] is not None else None,
+                "max_peak_bytes": stats["max_peak_bytes"],
+            }
+        return summary
+    
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._sections.clear()
+
+
+def _bucket_percentile(histogram: List[int], count: int, fraction: float, max_us: float) -> Optional[float]:
+    """Upper bound of the bucket holding the given percentile (capped at the observed max)."""
+    target = max(1, int(fraction * count + 0.5))
+    seen = 0
+    for bound, bucket_count in zip(LATENCY_BUCKETS_US, histogram):
+        seen += bucket_count
+        if seen >= target:
+            return min(bound, max_us)
+    return max_us
@@ -0,0 +1,605 @@
+"""
+Skill Pipeline
+Runs skill-composition workflows (e.g. feature-prioritizer -> prd-generator) as
+a DAG of stages, executing independent stages concurrently and caching every
+stage output by the content of its inputs
+"""
+
+from typing import Dict, List, Any, Optional, Callable, Iterable, Sequence, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+
+from generate_prd import PRDGenerator, _output_filename
+from prd_locales import DEFAULT_LOCALE
+from research_extract import RESEARCH_FIELDS, is_reference, reference_stamp
+
+SKILLS_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# In-memory stage cache size (entries, least recently used evicted first)
+DEFAULT_CACHE_ENTRIES = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_cache (
+    key TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    value BLOB NOT NULL
+);
+"""
+
+
+class StageError(RuntimeError):
+    """A stage raised while the pipeline was running; the original error is chained."""
+    
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+
+
+def load_skill_module(skill: str, module: str) -> Any:
+    """
+    Import a module from another skill directory.
+    
+    Skill directories have hyphenated names and are not packages, and their
+    modules import their siblings by bare name, so the directory is added to
+    ``sys.path`` and the module imported under its own name.
+    
+    Args:
+        skill: Skill directory name (e.g. "feature-prioritizer")
+        module: Module name without ".py" (e.g. "calculate_scores")
+    
+    Raises:
+        ImportError: If the module does not exist, or a different module of
+            the same name is already imported
+    """
+    directory = os.path.join(SKILLS_DIR, skill)
+    path = os.path.join(directory, f"{module}.py")
+    if not os.path.isfile(path):
+        raise ImportError(f"No module '{module}' in skill '{skill}'")
+    loaded = sys.modules.get(module)
+    if loaded is not None:
+        if os.path.realpath(getattr(loaded, "__file__", None) or "") != os.path.realpath(path):
+            raise ImportError(f"Cannot load '{module}' from {skill}: another '{module}' is already imported from {loaded.__file__}")
+        return loaded
+    if directory not in sys.path:
+        sys.path.append(directory)
+    return importlib.import_module(module)
+
+
+def content_digest(value: Any) -> str:
+    """
+    Hash a stage input or output by content.
+    
+    Values are serialized as canonical JSON (sorted keys), so equal data hashes
+    equally whatever its key order. Arrays are hashed by their bytes; other
+    objects JSON cannot represent are hashed through pickle. Research file
+    references in PRD inputs (or lists of them) also hash the file's size and
+    modification time, so editing the file invalidates what was cached.
+    """
+    encoded = json.dumps(_stamp_references(value), sort_keys=True, separators=(",", ":"), default=_digest_fallback)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _stamp_references(value: Any) -> Any:
+    """Add file stamps to research references of a PRD input or a list of them."""
+    if isinstance(value, list):
+        # Every element is checked: a reference can follow other kinds of values
+        return [_stamp_references(item) if isinstance(item, dict) else item for item in value]
+    if isinstance(value, dict) and any(is_reference(value.get(field)) for field in RESEARCH_FIELDS):
+        return {key: reference_stamp(item) if key in RESEARCH_FIELDS else item for key, item in value.items()}
+    return value
+
+
+def _digest_fallback(value: Any) -> str:
+    if hasattr(value, "tobytes"):
+        # NumPy arrays and array.array; repr would truncate large arrays
+        raw = value.tobytes()
+        header = f"{type(value).__name__}|{getattr(value, 'dtype', getattr(value, 'typecode', ''))}|{getattr(value, 'shape', len(value))}"
+    elif isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    else:
+        try:
+            raw = pickle.dumps(value, protocol=5)
+        except Exception as exc:
+            raise TypeError(f"Cannot hash {type(value).__name__} for caching; use cache=False on the stage") from exc
+        header = type(value).__name__
+    return header + "|" + hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _combine(*parts: str) -> str:
+    """Hash several digests (and names) into one key."""
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class StageCache:
+    """
+    Stage outputs keyed by the content of their inputs.
+    
+    Entries hold the output object itself, so a cache hit hands the stage's
+    consumers the same object without copying or serializing it. With a
+    ``path``, entries are also pickled to a SQLite file so later processes
+    (a rerun of the same workflow) can reuse them.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        """
+        Args:
+            path: Optional SQLite file for persistent entries
+            max_entries: In-memory entries kept before evicting the least recently used
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+    
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (output, output digest) for a key, or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT digest, value FROM stage_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            entry = (pickle.loads(row[1]), row[0])
+            self._remember(key, entry)
+            return entry
+    
+    def put(self, key: str, value: Any, digest: str) -> None:
+        """Store a stage output and its digest."""
+        with self._lock:
+            self._remember(key, (value, digest))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO stage_cache (key, digest, value) VALUES (?, ?, ?)",
+                    (key, digest, pickle.dumps(value, protocol=5)),
+                )
+    
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM stage_cache")
+    
+    def close(self) -> None:
+        """Close the SQLite file, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def __enter__(self) -> "StageCache":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class Stage:
+    """
+    One step of a pipeline.
+    
+    The function is called with the outputs of ``after`` as positional
+    arguments, in order. A map stage (``map_over`` set to one of ``after``)
+    is called once per element of that dependency's output, with the element
+    in its place, and returns the list of results; each element is cached on
+    its own, so only changed elements are recomputed.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        after: Sequence[str] = (),
+        version: Union[str, Callable[[], str]] = "1",
+        cache: bool = True,
+        map_over: Optional[str] = None,
+    ):
+        """
+        Args:
+            name: Unique stage name
+            func: Stage function
+            after: Names of the inputs and stages this stage consumes
+            version: Bumped when the function's behavior changes; a callable is
+                evaluated at every run (e.g. to include the render date)
+            cache: Whether outputs are cached (and hashed) at all
+            map_over: Name in ``after`` whose output is iterated element-wise
+        """
+        if map_over is not None and map_over not in after:
+            raise ValueError(f"Stage '{name}' maps over '{map_over}', which is not one of its inputs")
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.version = version
+        self.cache = cache
+        self.map_over = map_over
+    
+    def current_version(self) -> str:
+        return self.version() if callable(self.version) else str(self.version)
+
+
+class Pipeline:
+    """
+    A DAG of skill stages.
+    
+    Stages run on a thread pool as soon as their inputs are ready, so
+    independent stages overlap and outputs pass between stages as the same
+    Python objects. Stage functions must not mutate their inputs.
+    
+    Every cached stage is keyed by its name, version and the content digests
+    of its inputs. Keys are built from the digests of upstream outputs rather
+    than from upstream keys, so a stage whose inputs changed but whose output
+    did not stops the recomputation from spreading downstream.
+    
+    Example:
+        pipeline = Pipeline()
+        pipeline.input("backlog")
+        pipeline.stage("ranked", rank, after=["backlog"])
+        pipeline.stage("prds", render, after=["ranked"], map_over="ranked")
+        result = pipeline.run({"backlog": features})
+        result["outputs"]["prds"], result["stages"]["prds"]["items_cached"]
+    """
+    
+    def __init__(self, cache: Optional[StageCache] = None, workers: Optional[int] = None):
+        """
+        Args:
+            cache: Stage cache (defaults to a new in-memory cache, kept across runs)
+            workers: Thread pool size (defaults to the executor's default)
+        """
+        self.cache = cache if cache is not None else StageCache()
+        self.workers = workers
+        self.inputs: List[str] = []
+        self.stages: Dict[str, Stage] = {}
+    
+    def input(self, name: str) -> None:
+        """Declare a value supplied to run() by name."""
+        self._check_new(name)
+        self.inputs.append(name)
+    
+    def stage(self, name: str, func: Callable[..., Any], after: Sequence[str] = (), **options: Any) -> Stage:
+        """
+        Add a stage (options as in Stage) and return it.
+        
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown
+        """
+        self._check_new(name)
+        unknown = [dependency for dependency in after if dependency not in self.stages and dependency not in self.inputs]
+        if unknown:
+            # Dependencies must be declared first, which also rules out cycles
+            raise ValueError(f"Stage '{name}' depends on undeclared {', '.join(repr(dep) for dep in unknown)}")
+        stage = Stage(name, func, after, **options)
+        self.stages[name] = stage
+        return stage
+    
+    def _check_new(self, name: str) -> None:
+        if name in self.stages or name in self.inputs:
+            raise ValueError(f"'{name}' is already defined in this pipeline")
+    
+    def run(self, inputs: Dict[str, Any], targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Run the pipeline.
+        
+        Args:
+            inputs: Value of every declared input
+            targets: Stages whose outputs are wanted (default: all); only
+                they and their dependencies run
+        
+        Returns:
+            Dictionary with:
+                - outputs: Output of every stage that ran or was cached, by name
+                - stages: Per-stage status ("ran", "cached" or, for map stages
+                  with some cached elements, "partial"), seconds, and for map
+                  stages items, items_ran and items_cached
+                - seconds: Wall time of the run
+        
+        Raises:
+            ValueError: If an input is missing or a target is unknown
+            StageError: If a stage raises (pending stages are cancelled)
+        """
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing pipeline inputs: {', '.join(missing)}")
+        wanted = self._required(targets)
+        started = time.perf_counter()
+        
+        values: Dict[str, Any] = {name: inputs[name] for name in self.inputs}
+        digests: Dict[str, str] = {}
+        stats: Dict[str, Dict[str, Any]] = {}
+        remaining = {name: set(self.stages[name].after) & wanted for name in self.stages if name in wanted}
+        for name in self.inputs:
+            if any(name in self.stages[stage].after and self.stages[stage].cache for stage in remaining):
+                digests[name] = content_digest(inputs[name])
+        
+        # future -> (stage name, element index or None, cache key)
+        running: Dict[Future, tuple] = {}
+        partial: Dict[str, Dict[str, Any]] = {}
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            def start_ready() -> None:
+                # Cache hits finish synchronously and can make further stages ready
+                ready = [name for name, deps in remaining.items() if not deps]
+                while ready:
+                    for name in ready:
+                        del remaining[name]
+                        self._start(name, values, digests, stats, partial, running, executor, finish)
+                    ready = [name for name, deps in remaining.items() if not deps]
+            
+            def finish(name: str, output: Any, digest: Optional[str]) -> None:
+                values[name] = output
+                if digest is not None:
+                    digests[name] = digest
+                for deps in remaining.values():
+                    deps.discard(name)
+            
+            start_ready()
+            try:
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name, index, key = running.pop(future)
+                        try:
+                            output, digest = future.result()
+                        except Exception as exc:
+                            raise StageError(name, exc) from exc
+                        if key is not None:
+                            self.cache.put(key, output, digest)
+                        if index is None:
+                            stats[name]["seconds"] = time.perf_counter() - stats[name].pop("_started")
+                            finish(name, output, digest)
+                        else:
+                            state = partial[name]
+                            state["results"][index] = output
+                            state["digests"][index] = digest
+                            state["pending"] -= 1
+                            if not state["pending"]:
+                                self._finish_map(name, partial.pop(name), stats, finish)
+                    start_ready()
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+        
+        return {
+            "outputs": {name: values[name] for name in self.stages if name in values},
+            "stages": stats,
+            "seconds": time.perf_counter() - started,
+        }
+    
+    def _required(self, targets: Optional[Iterable[str]]) -> set:
+        """Stage names needed to produce the targets."""
+        if targets is None:
+            return set(self.stages)
+        wanted, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name in wanted or name in self.inputs:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"Unknown target stage '{name}'")
+            wanted.add(name)
+            stack.extend(self.stages[name].after)
+        return wanted
+    
+    def _start(self, name, values, digests, stats, partial, running, executor, finish) -> None:
+        """Serve a ready stage from the cache or submit it (element-wise for map stages)."""
+        stage = self.stages[name]
+        arguments = [values[dependency] for dependency in stage.after]
+        # Outputs of uncached stages have no digest, so their consumers cannot be cached either
+        cached = stage.cache and all(dep in digests for dep in stage.after if dep != stage.map_over)
+        version = stage.current_version() if cached else ""
+        
+        if stage.map_over is None:
+            key = _combine(name, version, *(digests[dep] for dep in stage.after)) if cached else None
+            entry = self.cache.get(key) if key is not None else None
+            if entry is not None:
+                stats[name] = {"status": "cached", "seconds": 0.0}
+                finish(name, entry[0], entry[1])
+                return
+            stats[name] = {"status": "ran", "_started": time.perf_counter()}
+            running[executor.submit(_call, stage.func, arguments, stage.cache)] = (name, None, key)
+            return
+        
+        position = stage.after.index(stage.map_over)
+        elements = list(arguments[position])
+        shared = [digests[dep] for dep in stage.after if dep != stage.map_over] if cached else []
+        state = {
+            "results": [None] * len(elements),
+            "digests": [None] * len(elements),
+            "pending": 0,
+            "started": time.perf_counter(),
+            "cached": 0,
+        }
+        for index, element in enumerate(elements):
+            key = _combine(name, version, content_digest(element), *shared) if cached else None
+            entry = self.cache.get(key) if key is not None else None
+            if entry is not None:
+                state["results"][index], state["digests"][index] = entry
+                state["cached"] += 1
+                continue
+            element_arguments = list(arguments)
+            element_arguments[position] = element
+            state["pending"] += 1
+            running[executor.submit(_call, stage.func, element_arguments, stage.cache)] = (name, index, key)
+        partial[name] = state
+        if not state["pending"]:
+            self._finish_map(name, partial.pop(name), stats, finish)
+    
+    @staticmethod
+    def _finish_map(name, state, stats, finish) -> None:
+        """Assemble a map stage's output once every element is done."""
+        items = len(state["results"])
+        stats[name] = {
+            "status": "cached" if state["cached"] == items else "partial" if state["cached"] else "ran",
+            "seconds": time.perf_counter() - state["started"],
+            "items": items,
+            "items_ran": items - state["cached"],
+            "items_cached": state["cached"],
+        }
+        digest = _combine(*state["digests"]) if None not in state["digests"] else None
+        finish(name, state["results"], digest)
+
+
+def _call(func: Callable[..., Any], arguments: List[Any], hashed: bool) -> tuple:
+    """Run a stage function in a worker thread, hashing its output there too."""
+    output = func(*arguments)
+    return output, content_digest(output) if hashed else None
+
+
+# ----------------------------------------------------------------------
+# feature-prioritizer -> prd-generator workflow
+# ----------------------------------------------------------------------
+
+def feature_to_prd_input(feature: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Turn a prioritizer feature into a PRD generator input.
+    
+    ``context`` supplies fields shared by every PRD (target_users,
+    business_goals, technical_constraints, ...); the feature's own name,
+    description and RICE estimates take precedence.
+    """
+    prd_input = dict(context or {})
+    prd_input["feature_name"] = feature["name"]
+    if feature.get("description"):
+        prd_input["problem_statement"] = feature["description"]
+    for source, target in (("reach", "reach_estimate"), ("impact", "impact_estimate"),
+                           ("confidence", "confidence_level"), ("effort", "effort_estimate")):
+        if feature.get(source) is not None:
+            prd_input[target] = feature[source]
+    return prd_input
+
+
+def prioritize_and_generate(
+    top_n: int = 10,
+    generator: Optional[PRDGenerator] = None,
+    cache: Optional[StageCache] = None,
+    workers: Optional[int] = None,
+) -> Pipeline:
+    """
+    Build the feature-prioritizer -> prd-generator workflow.
+    
+    Inputs:
+        - backlog: Features in the prioritizer format
+        - context: Fields shared by every PRD (may be empty)
+    
+    Stages:
+        - ranking: Top ``top_n`` features by RICE score
+        - build_order: Dependency build order of the whole backlog (runs
+          concurrently with ranking)
+        - prd_inputs: The selected features in build order, as PRD inputs
+        - prds: One PRD per selected feature, cached per feature
+    
+    Editing one feature re-runs ranking and build_order, but only the PRDs
+    whose inputs actually changed are rendered again.
+    """
+    calculate_scores = load_skill_module("feature-prioritizer", "calculate_scores")
+    dependency_graph = load_skill_module("feature-prioritizer", "dependency_graph")
+    generator = generator or PRDGenerator()
+    
+    def ranking(backlog: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        scores = calculate_scores.score_batch(
+            [feature.get("reach", 0) for feature in backlog],
+            [feature.get("impact", 0) for feature in backlog],
+            [feature.get("confidence", 0) for feature in backlog],
+            [feature.get("effort", 0) for feature in backlog],
+        )["rice"]
+        return [
+            dict(backlog[index], rank=rank, rice_score=float(scores[index]))
+            for rank, index in enumerate(calculate_scores.top_k(scores, top_n), start=1)
+        ]
+    
+    def build_order(backlog: List[Dict[str, Any]]) -> List[str]:
+        graph = dependency_graph.DependencyGraph(backlog)
+        return [graph.names[node] for node in graph.topological_order()]
+    
+    def prd_inputs(ranked: List[Dict[str, Any]], order: List[str], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Features that cannot be ordered (cycles) go last, in rank order
+        position = {name: index for index, name in enumerate(order)}
+        ordered = sorted(ranked, key=lambda feature: (position.get(feature["name"], len(position)), feature["rank"]))
+        return [feature_to_prd_input(feature, context) for feature in ordered]
+    
+    pipeline = Pipeline(cache=cache, workers=workers)
+    pipeline.input("backlog")
+    pipeline.input("context")
+    pipeline.stage("ranking", ranking, after=["backlog"], version=f"top{top_n}")
+    pipeline.stage("build_order", build_order, after=["backlog"])
+    pipeline.stage("prd_inputs", prd_inputs, after=["ranking", "build_order", "context"])
+    pipeline.stage(
+        "prds", generator.generate_prd, after=["prd_inputs"], map_over="prd_inputs",
+        # Rendered PRDs also depend on the template version, locale and render date
+        version=lambda: f"{generator.prd_version}|{generator.locale}|{generator._format_today('%Y-%m-%d')}",
+    )
+    return pipeline
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python skill_pipeline.py",
+        description="Prioritize a backlog and write a PRD for each top feature",
+    )
+    parser.add_argument("input", help="Prioritizer input JSON ({\"features\": [...]}) or JSON Lines of features")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for the PRDs")
+    parser.add_argument("--top", type=int, default=10, help="Number of features to write PRDs for")
+    parser.add_argument("--context", help="JSON file of PRD fields shared by every feature")
+    parser.add_argument("--cache", help="SQLite file that keeps stage outputs between runs")
+    parser.add_argument("--locale", default=DEFAULT_LOCALE, help=f"Locale of the PRDs (default: {DEFAULT_LOCALE})")
+    args = parser.parse_args(argv)
+    
+    try:
+        with open(args.input, "r", encoding="utf-8") as fp:
+            if args.input.endswith((".jsonl", ".ndjson")):
+                backlog = [json.loads(line) for line in fp if line.strip()]
+            else:
+                data = json.load(fp)
+                backlog = data["features"] if isinstance(data, dict) else data
+        context: Dict[str, Any] = {}
+        if args.context:
+            with open(args.context, "r", encoding="utf-8") as fp:
+                context = json.load(fp)
+        
+        generator = PRDGenerator(locale=args.locale)
+        with StageCache(args.cache) as cache:
+            pipeline = prioritize_and_generate(args.top, generator=generator, cache=cache)
+            result = pipeline.run({"backlog": backlog, "context": context})
+        
+        os.makedirs(args.output_dir, exist_ok=True)
+        for index, (prd_input, document) in enumerate(zip(result["outputs"]["prd_inputs"], result["outputs"]["prds"]), start=1):
+            with open(os.path.join(args.output_dir, _output_filename(index, prd_input["feature_name"])), "w", encoding="utf-8") as fp:
+                fp.write(document)
+    except (OSError, ValueError, KeyError, StageError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    
+    prds = result["stages"]["prds"]
+    print(f"Wrote {prds['items']:,} PRDs to {args.output_dir} "
+          f"({prds['items_ran']:,} rendered, {prds['items_cached']:,} from cache) in {result['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+find_duplicates must group the same way with and without NumPy
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feature_dedup  # noqa: E402
+from feature_dedup import DedupIndex, find_duplicates  # noqa: E402
+
+THRESHOLD = 0.6
+
+BASE = ("users want to export their quarterly revenue reports as spreadsheets with custom "
+        "column ordering and saved filter presets for finance teams").split()
+
+
+def _variant(replaced):
+    words = list(BASE)
+    for position in replaced:
+        words[position] = f"x{position}"
+    return {"feature_name": " ".join(words)}
+
+
+# a~b and b~c, but a and c are too far apart to match directly
+CHAIN = [_variant([]), _variant([4, 14]), _variant([4, 9, 14, 19])]
+
+
+def _matches(first, second):
+    index = DedupIndex(threshold=THRESHOLD)
+    index.add(first)
+    return bool(index.query(second))
+
+
+def test_chain_is_one_group_without_numpy(monkeypatch):
+    monkeypatch.setattr(feature_dedup, "np", None)
+    a, b, c = CHAIN
+    assert _matches(a, b) and _matches(b, c) and not _matches(a, c)
+
+    report = find_duplicates(CHAIN, threshold=THRESHOLD)
+    assert report["groups"] == [[0, 1, 2]]
+    assert report["duplicate_of"] == [None, 0, 0]
+
+
+def test_paths_agree(monkeypatch):
+    if feature_dedup.np is None:
+        pytest.skip("NumPy is not installed")
+    backlog = CHAIN + [{"feature_name": "dark mode for the mobile app"}] + CHAIN + [{}]
+    with_numpy = find_duplicates(backlog, threshold=THRESHOLD)
+    monkeypatch.setattr(feature_dedup, "np", None)
+    assert find_duplicates(backlog, threshold=THRESHOLD) == with_numpy
+    assert with_numpy["groups"] == [[0, 1, 2, 4, 5, 6]]
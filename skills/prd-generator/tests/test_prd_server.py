@@ -0,0 +1,219 @@
+"""
+PRDServer status paths over localhost: rendering, validation, backpressure,
+timeouts and disconnects, and the release of worker slots afterwards
+"""
+
+import asyncio
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_prd import PRDGenerator  # noqa: E402
+from prd_server import PRDServer  # noqa: E402
+
+with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_input.json")) as fp:
+    SAMPLE = json.load(fp)
+
+
+class BlockingGenerator(PRDGenerator):
+    """Renders only once released, so tests control when a job finishes."""
+
+    def __init__(self, error=None):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error = error
+
+    def generate_prd_payload(self, input_data):
+        self.started.set()
+        self.release.wait(10)
+        if self.error is not None:
+            raise self.error
+        return {"feature": input_data["feature_name"]}
+
+
+def _request(body, path="/prd", method="POST"):
+    data = json.dumps(body).encode()
+    return f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+
+
+async def _exchange(port, raw, half_close=False, extra=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw + extra)
+    await writer.drain()
+    if half_close:
+        writer.write_eof()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, json.loads(body)
+
+
+def _reset_after_sending(port, raw):
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.sendall(raw)
+    return sock
+
+
+def _reset(sock):
+    # Linger 0 makes close() send a reset instead of a FIN
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+    sock.close()
+
+
+async def _until(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def _serve(test, **options):
+    """Run test(server) against a started server on a free port."""
+    async def run():
+        server = PRDServer(port=0, **options)
+        await server.start()
+        try:
+            await test(server)
+        finally:
+            generator = options.get("generator")
+            if isinstance(generator, BlockingGenerator):
+                generator.release.set()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def _idle(server):
+    return server.health()["admitted"] == 0 and server._slots._value == server.workers
+
+
+def test_renders_and_reports_health():
+    async def test(server):
+        status, _, payload = await _exchange(server.port, _request(SAMPLE))
+        assert status == 200
+        assert "prd_document" in payload
+        status, _, health = await _exchange(server.port, b"GET /health HTTP/1.1\r\n\r\n")
+        assert status == 200
+        assert health["completed"] == 1 and health["admitted"] == 0
+
+    _serve(test, workers=2)
+
+
+def test_invalid_requests():
+    async def test(server):
+        status, _, payload = await _exchange(server.port, _request({"feature_name": ""}))
+        assert status == 422 and payload["errors"]
+        status, _, _ = await _exchange(server.port, b"POST /prd HTTP/1.1\r\nContent-Length: 3\r\n\r\n{{{")
+        assert status == 400
+        status, _, _ = await _exchange(server.port, _request(SAMPLE, path="/other"))
+        assert status == 404
+        status, _, _ = await _exchange(server.port, _request(SAMPLE, method="PUT"))
+        assert status == 405
+        assert server.health()["failed"] == 1
+
+    _serve(test)
+
+
+def test_render_errors_split_client_and_server_faults():
+    for error, expected in ((ValueError("effort: low must not exceed high"), 422), (KeyError("table"), 500)):
+        generator = BlockingGenerator(error)
+        generator.release.set()
+
+        async def test(server):
+            status, _, payload = await _exchange(server.port, _request(SAMPLE))
+            assert status == expected
+            if expected == 500:
+                assert payload == {"error": "Internal error while rendering the PRD"}
+                assert server.stats["errors"] == 1 and server.stats["failed"] == 0
+            else:
+                assert "low must not exceed high" in payload["error"]
+                assert server.stats["failed"] == 1 and server.stats["errors"] == 0
+            assert _idle(server)
+
+        _serve(test, generator=generator)
+
+
+def test_busy_server_rejects_with_503():
+    generator = BlockingGenerator()
+
+    async def test(server):
+        running = asyncio.ensure_future(_exchange(server.port, _request(SAMPLE)))
+        await _until(generator.started.is_set)
+        status, headers, _ = await _exchange(server.port, _request(SAMPLE))
+        assert status == 503 and headers["Retry-After"] == "1"
+        generator.release.set()
+        assert (await running)[0] == 200
+        assert server.stats["rejected"] == 1
+        await _until(lambda: _idle(server))
+
+    _serve(test, workers=1, queue_size=0, generator=generator)
+
+
+def test_timeout_holds_slot_until_job_finishes():
+    generator = BlockingGenerator()
+
+    async def test(server):
+        status, _, _ = await _exchange(server.port, _request(SAMPLE))
+        assert status == 504 and server.stats["timed_out"] == 1
+        # The job is still running, so it still counts against capacity
+        assert server.health()["admitted"] == 1
+        status, _, _ = await _exchange(server.port, _request(SAMPLE))
+        assert status == 503
+        generator.release.set()
+        await _until(lambda: _idle(server))
+
+    _serve(test, workers=1, queue_size=0, request_timeout=0.1, generator=generator)
+
+
+def test_reset_cancels_and_releases_slot():
+    generator = BlockingGenerator()
+
+    async def test(server):
+        sock = await asyncio.to_thread(_reset_after_sending, server.port, _request(SAMPLE))
+        await _until(generator.started.is_set)
+        _reset(sock)
+        await _until(lambda: server.stats["cancelled"] == 1)
+        assert server.health()["admitted"] == 1
+        generator.release.set()
+        await _until(lambda: _idle(server))
+        assert server.stats["completed"] == 0
+
+    _serve(test, workers=1, generator=generator)
+
+
+def test_queued_request_reset_never_reaches_a_worker():
+    generator = BlockingGenerator()
+
+    async def test(server):
+        running = asyncio.ensure_future(_exchange(server.port, _request(SAMPLE)))
+        await _until(generator.started.is_set)
+        sock = await asyncio.to_thread(_reset_after_sending, server.port, _request(dict(SAMPLE, feature_name="queued")))
+        await _until(lambda: server.health()["admitted"] == 2)
+        _reset(sock)
+        await _until(lambda: server.health()["admitted"] == 1)
+        generator.release.set()
+        assert (await running)[2] == {"feature": SAMPLE["feature_name"]}
+        await _until(lambda: _idle(server))
+        assert server.stats["completed"] == 1 and server.stats["cancelled"] == 1
+
+    _serve(test, workers=1, queue_size=1, generator=generator)
+
+
+def test_half_close_and_pipelined_bytes_still_get_a_response():
+    async def test(server):
+        status, _, _ = await _exchange(server.port, _request(SAMPLE), half_close=True)
+        assert status == 200
+        status, _, _ = await _exchange(server.port, _request(SAMPLE), extra=b"G")
+        assert status == 200
+        assert server.stats["cancelled"] == 0 and server.stats["completed"] == 2
+
+    _serve(test)
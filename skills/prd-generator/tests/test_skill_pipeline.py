@@ -0,0 +1,144 @@
+"""
+Pipeline reruns, failures, target pruning and the persistent stage cache,
+on small pipelines and on the prioritizer -> PRD workflow
+"""
+
+import datetime
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_prd import PRDGenerator  # noqa: E402
+from skill_pipeline import Pipeline, StageCache, StageError, content_digest, prioritize_and_generate  # noqa: E402
+
+BACKLOG = [
+    {"name": f"Feature {index}", "description": f"Users struggle with task {index}", "reach": 1_000 * (index + 1),
+     "impact": 1 + index % 3, "confidence": 0.8, "effort": 1 + index % 4}
+    for index in range(6)
+]
+CONTEXT = {"target_users": ["Support agents"], "business_goals": ["Cut handle time"]}
+
+
+def _generator():
+    return PRDGenerator(clock=lambda: datetime.datetime(2026, 3, 5))
+
+
+def _statuses(result):
+    return {name: stats["status"] for name, stats in result["stages"].items()}
+
+
+def test_rerun_after_one_feature_edit_renders_one_prd():
+    workflow = prioritize_and_generate(top_n=4, generator=_generator())
+    first = workflow.run({"backlog": BACKLOG, "context": CONTEXT})
+    assert first["stages"]["prds"]["items_ran"] == 4
+
+    top = first["outputs"]["ranking"][1]["name"]
+    edited = [dict(feature, description="Changed") if feature["name"] == top else feature for feature in BACKLOG]
+    second = workflow.run({"backlog": edited, "context": CONTEXT})
+    prds = second["stages"]["prds"]
+    assert (prds["status"], prds["items"], prds["items_ran"], prds["items_cached"]) == ("partial", 4, 1, 3)
+    assert second["outputs"]["prds"] != first["outputs"]["prds"]
+
+    # The same edit again is served entirely from the cache
+    assert set(_statuses(workflow.run({"backlog": edited, "context": CONTEXT})).values()) == {"cached"}
+
+
+def test_stage_error_cancels_pending_stages():
+    ran = []
+
+    def render(element):
+        if element == 0:
+            raise KeyError("broken")
+        ran.append(element)
+        time.sleep(0.2)
+        return element
+
+    pipeline = Pipeline(workers=1)
+    pipeline.input("items")
+    pipeline.stage("render", render, after=["items"], map_over="items", cache=False)
+    pipeline.stage("summary", len, after=["render"])
+    with pytest.raises(StageError) as raised:
+        pipeline.run({"items": list(range(20))})
+    assert raised.value.stage == "render"
+    assert isinstance(raised.value.__cause__, KeyError)
+    # The single worker may have picked up one more element before the others were cancelled
+    assert len(ran) <= 1
+
+
+def test_stage_error_does_not_start_dependents():
+    release = threading.Event()
+    ran = []
+
+    def hold(value):
+        release.wait(5)
+        return value
+
+    def fail(value):
+        # Free the other stage once the error is on its way
+        threading.Timer(0.2, release.set).start()
+        raise ValueError("bad input")
+
+    pipeline = Pipeline(workers=2)
+    pipeline.input("x")
+    pipeline.stage("hold", hold, after=["x"])
+    pipeline.stage("fail", fail, after=["x"])
+    pipeline.stage("downstream", ran.append, after=["hold"])
+    with pytest.raises(StageError, match="Stage 'fail' failed: bad input"):
+        pipeline.run({"x": 1})
+    assert ran == []
+
+
+def test_targets_prune_stages():
+    calls = []
+
+    def step(name):
+        def run(*arguments):
+            calls.append(name)
+            return name
+        return run
+
+    pipeline = Pipeline()
+    pipeline.input("x")
+    pipeline.stage("a", step("a"), after=["x"])
+    pipeline.stage("b", step("b"), after=["a"])
+    pipeline.stage("c", step("c"), after=["x"])
+    pipeline.stage("d", step("d"), after=["b", "c"])
+
+    result = pipeline.run({"x": 1}, targets=["b"])
+    assert sorted(calls) == ["a", "b"]
+    assert set(result["outputs"]) == set(result["stages"]) == {"a", "b"}
+
+    with pytest.raises(ValueError, match="Unknown target stage 'missing'"):
+        pipeline.run({"x": 1}, targets=["missing"])
+
+
+def test_sqlite_cache_round_trips(tmp_path):
+    path = str(tmp_path / "stages.db")
+    with StageCache(path) as cache:
+        first = prioritize_and_generate(top_n=3, generator=_generator(), cache=cache).run(
+            {"backlog": BACKLOG, "context": CONTEXT}
+        )
+    assert set(_statuses(first).values()) == {"ran"}
+
+    # A new cache on the same file stands in for a later process
+    with StageCache(path) as cache:
+        second = prioritize_and_generate(top_n=3, generator=_generator(), cache=cache).run(
+            {"backlog": BACKLOG, "context": CONTEXT}
+        )
+    assert set(_statuses(second).values()) == {"cached"}
+    assert second["stages"]["prds"]["items_cached"] == 3
+    assert second["outputs"] == first["outputs"]
+
+
+def test_references_after_other_values_are_stamped(tmp_path):
+    research = tmp_path / "interviews.txt"
+    research.write_text("Agents repeat the same answers.")
+    value = ["inline", {"feature_name": "A", "user_research_summary": {"path": str(research)}}]
+    before = content_digest(value)
+    research.write_text("Agents repeat the same answers, and more.")
+    assert content_digest(value) != before